@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Request
-from app.Shared.Infra.reverse_proxy import proxy_handler_staff
+from app.Shared.Infra.reverse_proxy import proxy_handler, proxy_handler_staff
 
 router = APIRouter()
 
@@ -15,6 +15,6 @@ async def get_statistics(request: Request):
 
 @router.get("/export")
 async def export_history(request: Request):
-    """Export attendance history to Excel"""
-    return await proxy_handler_staff.forward(request, "api/attendance-records/export")
+    """Export attendance history to Excel (streamed by api-scan; same name/status/month filters)"""
+    return await proxy_handler.forward(request, "scan/attendance-records/export")
     
\ No newline at end of file
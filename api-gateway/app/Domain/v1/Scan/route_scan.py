@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, WebSocket
 from app.Shared.Infra.reverse_proxy import proxy_handler
+from app.Shared.Core.session_store import SESSION_COOKIE_NAME, get_session_user_id, refresh_session
+from app.Shared.Core.config import settings
 
 router = APIRouter()
 
@@ -12,3 +14,26 @@ async def scan_root_proxy(request: Request):
 async def scan_path_proxy(request: Request, path: str):
     """Proxy all other scan requests to the api-scan service"""
     return await proxy_handler.forward(request, f"scan/{path}")
+
+# WebSocket proxy (e.g. live dashboard)
+@router.websocket("/{path:path}")
+async def scan_websocket_proxy(websocket: WebSocket, path: str):
+    """
+    Proxy WebSocket upgrades to the api-scan service.
+    AuthMiddleware only sees HTTP requests, so the g_sid session is validated here.
+    """
+    # SECURITY: Browsers send cookies on cross-site WebSocket handshakes - check Origin
+    origin = websocket.headers.get("origin")
+    if origin and origin not in settings.cors_origin_list:
+        await websocket.close(code=1008)
+        return
+
+    session_id = websocket.cookies.get(SESSION_COOKIE_NAME)
+    user_id = get_session_user_id(session_id) if session_id else None
+    if not user_id:
+        await websocket.close(code=1008)
+        return
+
+    refresh_session(session_id)
+    websocket.state.user_id = user_id
+    await proxy_handler.forward_websocket(websocket, f"scan/{path}", user_id)
@@ -15,7 +15,39 @@ class Settings(BaseSettings):
 
     # 7 Days in seconds
     SESSION_EXPIRY: int = 604800
+
+    # Streaming proxy (WebSocket / SSE)
+    STREAM_IDLE_TIMEOUT: int = 60  # Close when no frame in either direction for this long
+    STREAM_MAX_CONNECTIONS_PER_USER: int = 5
+
+    # Priority load shedding (Shared/Middleware/load_shedding.py), per worker
+    SHED_ENABLED: bool = True
+    SHED_MAX_IN_FLIGHT: int = 256
+    SHED_RESERVE_CHECKIN: int = 64 # slots only check-in / check-out may use
+    SHED_RESERVE_AUTH: int = 32 # slots check-in and auth may use
+    SHED_RESERVE_READS: int = 32 # slots everything but exports may use
+    SHED_LATENCY_THRESHOLDS_MS: str = "1000,2500,5000" # each one crossed sheds exports, then reads, then auth
+    SHED_LATENCY_ALPHA: float = 0.2 # weight of the newest sample in the moving average
+    SHED_PROBE_INTERVAL: float = 1.0 # seconds without a latency sample before one shed request probes
+    SHED_RETRY_AFTER: int = 2 # seconds
+
+    # Idempotency-Key on write requests (Shared/Core/idempotency.py)
+    IDEMPOTENCY_REDIS_DB: int = 2 # 0: sessions, 1: rate limits
+    IDEMPOTENCY_TTL: int = 86400 # stored responses replayed for 1 day
+    IDEMPOTENCY_LOCK_TTL: int = 130 # in-flight claim; above the 120s upstream timeout
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 30.0 # a duplicate waits this long for the first response
     
+    @property
+    def cors_origin_list(self) -> list:
+        if self.CORS_ORIGINS:
+            return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+        # Development fallback
+        return [
+            "http://localhost:5173",
+            "http://192.168.18.119:5173",
+            "https://192.168.18.119:5173",
+        ]
+
     @property
     def public_staff_verify_url(self) -> str:
         return f"{self.API_STAFF_URL}/api/internal/verify-credentials"
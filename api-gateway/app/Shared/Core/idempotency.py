@@ -0,0 +1,156 @@
+import asyncio
+import base64
+import hashlib
+import json
+from typing import Awaitable, Callable, Optional
+from urllib.parse import parse_qsl, urlencode
+
+import redis.asyncio as redis
+import structlog
+from fastapi import Response
+
+from app.Shared.Core.config import settings
+
+logger = structlog.get_logger()
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Response headers worth replaying (the rest describe the original connection)
+_REPLAY_HEADERS = ("content-type", "retry-after", "location")
+
+class IdempotencyStore:
+    """
+    Idempotency-Key for write requests, scoped by user, in Redis.
+
+    The first request claims the key (SET NX) and is forwarded; its response is stored for
+    IDEMPOTENCY_TTL. A duplicate sent while the first is in flight waits for that response;
+    a later duplicate gets the stored response replayed without reaching the upstream.
+    5xx responses and upstream errors release the key, so a retry runs for real.
+    Reusing a key for a different method / path / query / body is answered 422.
+    """
+    def __init__(self):
+        self._redis: Optional[redis.Redis] = None
+
+    def _client(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.IDEMPOTENCY_REDIS_DB)
+        return self._redis
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    @staticmethod
+    def _redis_key(user_id: str, idempotency_key: str) -> str:
+        digest = hashlib.sha256(idempotency_key.encode()).hexdigest()
+        return f"idempotency:{user_id}:{digest}"
+
+    @staticmethod
+    def _fingerprint(method: str, path: str, query: str, body: bytes) -> str:
+        # Sorted so a client re-serialising the same parameters in another order still matches
+        query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+        return hashlib.sha256(method.encode() + b" " + path.encode() + b"?" + query.encode() + b"\n" + body).hexdigest()
+
+    @staticmethod
+    def _error(status_code: int, message: str) -> Response:
+        return Response(content=json.dumps({"error": message}), status_code=status_code, media_type="application/json")
+
+    @staticmethod
+    def _replay(record: dict) -> Response:
+        response = Response(
+            content=base64.b64decode(record["body"]),
+            status_code=record["status"],
+            headers=record["headers"]
+        )
+        response.headers[REPLAYED_HEADER] = "true"
+        return response
+
+    async def run(
+        self,
+        user_id: str,
+        idempotency_key: str,
+        method: str,
+        path: str,
+        query: str,
+        body: bytes,
+        send: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            return self._error(400, "Idempotency-Key is too long")
+
+        key = self._redis_key(str(user_id), idempotency_key)
+        fingerprint = self._fingerprint(method, path, query, body)
+        client = self._client()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        delay = 0.02
+
+        while True:
+            try:
+                claimed = await client.set(
+                    key,
+                    json.dumps({"state": "in_flight", "fingerprint": fingerprint}),
+                    nx=True,
+                    ex=settings.IDEMPOTENCY_LOCK_TTL
+                )
+                raw = None if claimed else await client.get(key)
+            except redis.RedisError as e:
+                # Redis down: forward without deduplication rather than failing the write
+                logger.warning("idempotency_unavailable", error=str(e))
+                return await send()
+            if claimed:
+                return await self._forward_and_store(client, key, fingerprint, send)
+
+            if raw is None:
+                continue # first attempt released the key in the meantime: claim it
+            record = json.loads(raw)
+            if record["fingerprint"] != fingerprint:
+                return self._error(422, "Idempotency-Key was already used for a different request")
+            if record["state"] == "done":
+                return self._replay(record)
+
+            # First attempt still in flight: wait for its response
+            if loop.time() >= deadline:
+                return self._error(409, "A request with this Idempotency-Key is still in progress")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    @staticmethod
+    async def _release(client: redis.Redis, key: str) -> None:
+        try:
+            await client.delete(key)
+        except redis.RedisError as e:
+            # The claim still expires after IDEMPOTENCY_LOCK_TTL
+            logger.warning("idempotency_release_failed", error=str(e))
+
+    async def _forward_and_store(self, client: redis.Redis, key: str, fingerprint: str, send) -> Response:
+        try:
+            response = await send()
+        except BaseException:
+            await self._release(client, key)
+            raise
+
+        if response.status_code >= 500:
+            await self._release(client, key)
+            return response
+
+        headers = {name: response.headers[name] for name in _REPLAY_HEADERS if name in response.headers}
+        record = {
+            "state": "done",
+            "fingerprint": fingerprint,
+            "status": response.status_code,
+            "headers": headers,
+            "body": base64.b64encode(response.body).decode(),
+        }
+        try:
+            await client.set(key, json.dumps(record), ex=settings.IDEMPOTENCY_TTL)
+        except redis.RedisError as e:
+            # The response itself is fine; only replays are lost
+            logger.warning("idempotency_store_failed", error=str(e))
+            await self._release(client, key)
+        return response
+
+idempotency_store = IdempotencyStore()
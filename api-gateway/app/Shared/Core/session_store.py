@@ -46,6 +46,13 @@ def get_session_data(session_id: str):
         # Old format: just user_id as string
         return {"user_id": data, "user": None}
 
+def get_session_user_id(session_id: str):
+    """Returns the user_id of a valid session, or None"""
+    session_data = get_session_data(session_id)
+    if not session_data:
+        return None
+    return session_data if isinstance(session_data, str) else session_data.get("user_id")
+
 def refresh_session(session_id: str):
     """
     SLIDING LOGIC: 
@@ -0,0 +1,39 @@
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from app.Shared.Core.config import settings
+
+class StreamConnectionLimiter:
+    """
+    Caps concurrent long-lived streams (WebSocket / SSE) per user in this worker.
+    A stream holds its slot until it closes, so one user cannot exhaust the upstream.
+    """
+    def __init__(self, max_per_user: int):
+        self.max_per_user = max_per_user
+        self._counts = defaultdict(int)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, user_id: str) -> bool:
+        async with self._lock:
+            if self._counts[user_id] >= self.max_per_user:
+                return False
+            self._counts[user_id] += 1
+            return True
+
+    async def release(self, user_id: str):
+        async with self._lock:
+            self._counts[user_id] -= 1
+            if self._counts[user_id] <= 0:
+                del self._counts[user_id]
+
+    @asynccontextmanager
+    async def slot(self, user_id: str):
+        """Yields True when a slot was granted (and frees it on exit), False otherwise"""
+        granted = await self.acquire(user_id)
+        try:
+            yield granted
+        finally:
+            if granted:
+                await self.release(user_id)
+
+stream_limiter = StreamConnectionLimiter(settings.STREAM_MAX_CONNECTIONS_PER_USER)
\ No newline at end of file
@@ -1,10 +1,18 @@
+import asyncio
+import time
 import httpx
-from fastapi import Request, Response
+import websockets
+from fastapi import Request, Response, WebSocket
 from fastapi.responses import StreamingResponse
 from app.Shared.Core.config import settings
+from app.Shared.Core.stream_limiter import stream_limiter
+from app.Shared.Core.idempotency import IDEMPOTENCY_HEADER, idempotency_store
 
 class ReverseProxy:
     def __init__(self, base_url: str):
+        # Same upstream over ws:// / wss:// for WebSocket proxying
+        self.ws_base_url = base_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+
         # Increase timeout to 120s for large image uploads to Cloudinary
         # Add connection limits to prevent resource exhaustion
         self.client = httpx.AsyncClient(
@@ -143,6 +151,10 @@ class ReverseProxy:
         if "accept" not in headers or not headers.get("accept"):
             headers["Accept"] = "application/json"
 
+        # PATH 0: Server-Sent Events (long-lived, relayed chunk by chunk without buffering)
+        if request.method == "GET" and "text/event-stream" in headers.get("accept", "").lower():
+            return await self._forward_event_stream(request, target_url, headers)
+
         try:
             # PATH 1: Multipart/Form-Data (Streaming for large image uploads)
             if is_multipart:
@@ -210,74 +222,79 @@ class ReverseProxy:
 
             # PATH 2: GET requests (Excel downloads, images, etc.) - Use streaming for performance
             elif request.method == "GET":
-                # First, peek at headers to determine response type
-                async with self.client.stream(
+                # One upstream request: peek at headers, then either stream or buffer the same response
+                # (re-requesting would run a streamed export twice)
+                upstream_request = self.client.build_request(
                     method=request.method,
                     url=target_url,
                     params=dict(request.query_params),
-                    headers=headers,
-                    follow_redirects=True
-                ) as response:
-                    # Get headers first (available immediately)
-                    resp_headers = dict(response.headers)
-                    resp_headers.pop("server", None)
-                    resp_headers.pop("x-powered-by", None)
+                    headers=headers
+                )
+                response = await self.client.send(upstream_request, stream=True, follow_redirects=True)
+
+                # Get headers first (available immediately)
+                resp_headers = dict(response.headers)
+                resp_headers.pop("server", None)
+                resp_headers.pop("x-powered-by", None)
+                
+                response_content_type = response.headers.get("content-type", "").lower()
+                is_json_response = "application/json" in response_content_type
+                is_excel_file = (
+                    "application/vnd.openxmlformats-officedocument" in response_content_type or
+                    "application/vnd.ms-excel" in response_content_type or
+                    response.headers.get("content-disposition", "").startswith("attachment")
+                )
+                is_image_response = "image/" in response_content_type
+                is_binary_file = (
+                    is_excel_file or
+                    "application/pdf" in response_content_type or
+                    "application/octet-stream" in response_content_type or
+                    is_image_response
+                )
+                # NDJSON list streams: rows must reach the client as the backend emits them
+                is_ndjson_response = "application/x-ndjson" in response_content_type
+                
+                if (is_binary_file and not is_json_response) or is_ndjson_response:
+                    # Relay chunks as the backend produces them; framing is re-done by this server
+                    for header in ("content-length", "transfer-encoding", "connection"):
+                        resp_headers.pop(header, None)
+
+                    async def binary_stream():
+                        try:
+                            total_size = 0
+                            async for chunk in response.aiter_raw():
+                                total_size += len(chunk)
+                                if total_size > self.max_response_size:
+                                    raise ValueError("Response too large")
+                                yield chunk
+                        finally:
+                            await response.aclose()
                     
-                    response_content_type = response.headers.get("content-type", "").lower()
-                    is_json_response = "application/json" in response_content_type
-                    is_excel_file = (
-                        "application/vnd.openxmlformats-officedocument" in response_content_type or
-                        "application/vnd.ms-excel" in response_content_type or
-                        response.headers.get("content-disposition", "").startswith("attachment")
-                    )
-                    is_image_response = "image/" in response_content_type
-                    is_binary_file = (
-                        is_excel_file or
-                        "application/pdf" in response_content_type or
-                        "application/octet-stream" in response_content_type or
-                        is_image_response
+                    return StreamingResponse(
+                        binary_stream(),
+                        status_code=response.status_code,
+                        headers=resp_headers,
+                        media_type=response_content_type
                     )
-                    
-                    if is_binary_file and not is_json_response:
-                        # For binary files, create a generator that opens its own connection
-                        # This keeps the connection alive while streaming
-                        async def binary_stream():
-                            async with self.client.stream(
-                                method=request.method,
-                                url=target_url,
-                                params=dict(request.query_params),
-                                headers=headers,
-                                follow_redirects=True
-                            ) as stream_response:
-                                total_size = 0
-                                async for chunk in stream_response.aiter_bytes():
-                                    total_size += len(chunk)
-                                    if total_size > self.max_response_size:
-                                        raise ValueError("Response too large")
-                                    yield chunk
-                        
-                        return StreamingResponse(
-                            binary_stream(),
-                            status_code=response.status_code,
-                            headers=resp_headers,
-                            media_type=response_content_type
-                        )
-                    else:
-                        # Buffer JSON responses (small, safe to load)
+                else:
+                    # Buffer JSON responses (small, safe to load)
+                    try:
                         content = await response.aread()
-                        if len(content) > self.max_response_size:
-                            return Response(
-                                content='{"error": "Response too large"}',
-                                status_code=413,
-                                media_type="application/json"
-                            )
-                        
+                    finally:
+                        await response.aclose()
+                    if len(content) > self.max_response_size:
                         return Response(
-                            content=content,
-                            status_code=response.status_code,
-                            headers=resp_headers,
-                            media_type=response_content_type
+                            content='{"error": "Response too large"}',
+                            status_code=413,
+                            media_type="application/json"
                         )
+                    
+                    return Response(
+                        content=content,
+                        status_code=response.status_code,
+                        headers=resp_headers,
+                        media_type=response_content_type
+                    )
 
             # PATH 3: POST/PUT/PATCH requests (JSON, small uploads) - Use standard request
             else:
@@ -305,34 +322,17 @@ class ReverseProxy:
                         media_type="application/json"
                     )
 
-                response = await self.client.request(
-                    method=request.method,
-                    url=target_url,
-                    params=query_params,
-                    content=body,
-                    headers=headers,
-                    follow_redirects=True
-                )
-                
-                # Security: Check response size
-                if len(response.content) > self.max_response_size:
-                    return Response(
-                        content='{"error": "Response too large"}',
-                        status_code=413,
-                        media_type="application/json"
+                async def send_write() -> Response:
+                    return await self._send_write(request.method, target_url, query_params, body, headers)
+
+                # Retried writes (flaky mobile networks): one upstream run per user + Idempotency-Key
+                idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+                user_id = getattr(request.state, "user_id", None)
+                if idempotency_key and user_id:
+                    return await idempotency_store.run(
+                        user_id, idempotency_key, request.method, str(request.url.path), request.url.query, body, send_write
                     )
-                
-                # Security: Clean response headers
-                resp_headers = dict(response.headers)
-                resp_headers.pop("server", None)  # Don't expose backend server info
-                resp_headers.pop("x-powered-by", None)  # Don't expose backend tech stack
-                
-                return Response(
-                    content=response.content,
-                    status_code=response.status_code,
-                    headers=resp_headers,
-                    media_type=response.headers.get("content-type")
-                )
+                return await send_write()
 
         except ValueError as e:
             # Security: Don't expose internal error details
@@ -363,6 +363,183 @@ class ReverseProxy:
                 media_type="application/json"
             )
 
+    async def _send_write(self, method: str, target_url: str, query_params: dict, body: bytes, headers: dict) -> Response:
+        """Buffered request / response for JSON writes (PATH 3)"""
+        response = await self.client.request(
+            method=method,
+            url=target_url,
+            params=query_params,
+            content=body,
+            headers=headers,
+            follow_redirects=True
+        )
+        
+        # Security: Check response size
+        if len(response.content) > self.max_response_size:
+            return Response(
+                content='{"error": "Response too large"}',
+                status_code=413,
+                media_type="application/json"
+            )
+        
+        # Security: Clean response headers
+        resp_headers = dict(response.headers)
+        resp_headers.pop("server", None)  # Don't expose backend server info
+        resp_headers.pop("x-powered-by", None)  # Don't expose backend tech stack
+        
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            headers=resp_headers,
+            media_type=response.headers.get("content-type")
+        )
+
+    async def _forward_event_stream(self, request: Request, target_url: str, headers: dict):
+        """Relay an SSE response as it arrives; bounded by the idle timeout and per-user cap"""
+        user_id = str(getattr(request.state, "user_id", "anonymous"))
+        if not await stream_limiter.acquire(user_id):
+            return Response(
+                content='{"error": "Too many open streams"}',
+                status_code=429,
+                media_type="application/json"
+            )
+
+        try:
+            upstream_request = self.client.build_request(
+                method="GET",
+                url=target_url,
+                params=dict(request.query_params),
+                headers=headers,
+                timeout=httpx.Timeout(10.0, read=settings.STREAM_IDLE_TIMEOUT)
+            )
+            response = await self.client.send(upstream_request, stream=True)
+        except httpx.TimeoutException:
+            await stream_limiter.release(user_id)
+            return Response(
+                content='{"error": "Request timeout"}',
+                status_code=504,
+                media_type="application/json"
+            )
+        except httpx.RequestError:
+            await stream_limiter.release(user_id)
+            return Response(
+                content='{"error": "Service unavailable"}',
+                status_code=503,
+                media_type="application/json"
+            )
+
+        resp_headers = dict(response.headers)
+        for header in ("server", "x-powered-by", "content-length", "transfer-encoding", "connection"):
+            resp_headers.pop(header, None)
+
+        async def event_stream():
+            try:
+                async for chunk in response.aiter_raw():
+                    yield chunk
+            except (httpx.ReadTimeout, httpx.RemoteProtocolError):
+                # Idle upstream or upstream closed: end the stream, client reconnects
+                pass
+            finally:
+                await response.aclose()
+                await stream_limiter.release(user_id)
+
+        return StreamingResponse(
+            event_stream(),
+            status_code=response.status_code,
+            headers=resp_headers,
+            media_type=response.headers.get("content-type")
+        )
+
+    async def forward_websocket(self, websocket: WebSocket, path: str, user_id: str):
+        """
+        Proxy a WebSocket to the upstream and relay frames both ways without buffering.
+        Closes when either side closes or nothing moved for STREAM_IDLE_TIMEOUT seconds.
+        """
+        if not self._validate_path(path):
+            await websocket.close(code=1008)
+            return
+
+        query = websocket.url.query
+        target_url = f"{self.ws_base_url}/{path}" + (f"?{query}" if query else "")
+
+        # Same forwarding headers as HTTP, minus the handshake headers websockets sets itself
+        headers = self._clean_headers(dict(websocket.headers), websocket)
+        for header in (
+            "upgrade", "sec-websocket-key", "sec-websocket-version",
+            "sec-websocket-extensions", "sec-websocket-protocol",
+        ):
+            headers.pop(header, None)
+        headers["X-User-ID"] = str(user_id)
+        subprotocols = websocket.scope.get("subprotocols") or None
+
+        async with stream_limiter.slot(str(user_id)) as granted:
+            if not granted:
+                # 1013: try again later
+                await websocket.close(code=1013)
+                return
+
+            try:
+                upstream = await websockets.connect(
+                    target_url,
+                    extra_headers=headers,
+                    subprotocols=subprotocols,
+                    open_timeout=10,
+                    max_size=self.max_request_size
+                )
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+                # 1011: upstream unavailable
+                await websocket.close(code=1011)
+                return
+
+            last_activity = time.monotonic()
+
+            async def client_to_upstream():
+                nonlocal last_activity
+                while True:
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        return
+                    last_activity = time.monotonic()
+                    if message.get("text") is not None:
+                        await upstream.send(message["text"])
+                    elif message.get("bytes") is not None:
+                        await upstream.send(message["bytes"])
+
+            async def upstream_to_client():
+                nonlocal last_activity
+                async for data in upstream:
+                    last_activity = time.monotonic()
+                    if isinstance(data, str):
+                        await websocket.send_text(data)
+                    else:
+                        await websocket.send_bytes(data)
+
+            async def idle_watchdog():
+                while True:
+                    remaining = settings.STREAM_IDLE_TIMEOUT - (time.monotonic() - last_activity)
+                    if remaining <= 0:
+                        return
+                    await asyncio.sleep(remaining)
+
+            try:
+                await websocket.accept(subprotocol=upstream.subprotocol)
+                tasks = [
+                    asyncio.create_task(client_to_upstream()),
+                    asyncio.create_task(upstream_to_client()),
+                    asyncio.create_task(idle_watchdog()),
+                ]
+                # Whichever side finishes first (close, error, idle) tears down the pair
+                _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                await upstream.close()
+                try:
+                    await websocket.close()
+                except RuntimeError:
+                    pass  # Client already gone
+
     async def close(self):
         await self.client.aclose()
 
@@ -22,7 +22,8 @@ class AuthMiddleware(BaseHTTPMiddleware):
             "/", 
             "/docs", 
             "/openapi.json",
-            "/health" # បន្ថែមផ្លូវ health check
+            "/health", # បន្ថែមផ្លូវ health check
+            "/metrics" # Prometheus scrape (not routed by nginx, internal network only)
         ]
         if path in public_paths:
             return await call_next(request)
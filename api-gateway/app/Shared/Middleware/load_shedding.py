@@ -0,0 +1,188 @@
+import time
+from typing import Dict, Optional, Tuple
+
+import orjson
+from prometheus_client import Counter, Gauge
+
+from app.Shared.Core.config import settings
+
+# Route classes, highest priority first
+CHECKIN = "checkin"
+AUTH = "auth"
+READS = "reads"
+EXPORTS = "exports"
+PRIORITY_ORDER = (CHECKIN, AUTH, READS, EXPORTS)
+
+# (path prefix, class); first match wins, anything else is READS
+ROUTE_CLASSES: Tuple[Tuple[str, str], ...] = (
+    ("/api/scan/check-in", CHECKIN),
+    ("/api/scan/check-out", CHECKIN),
+    ("/api/scan/validate-qr", CHECKIN),
+    ("/api/scan/get-public-ip", CHECKIN),
+    ("/api/scan/today-attendance", CHECKIN),
+    ("/api/auth/", AUTH),
+    ("/api/scan/dashboard", EXPORTS),
+    ("/api/scan/analytics", EXPORTS),
+    ("/api/scan/attendance-records", EXPORTS),
+    ("/api/attendance-records/export", EXPORTS),
+    ("/api/attendance-records/statistics", EXPORTS),
+    ("/api/generate-code/export", EXPORTS),
+    ("/api/generate-code/bulk", EXPORTS),
+)
+
+EXEMPT_PATHS = ("/", "/health", "/metrics")
+
+GATEWAY_IN_FLIGHT = Gauge("gateway_in_flight_requests", "Requests being proxied", ["route_class"])
+GATEWAY_SHED = Counter("gateway_shed_total", "Requests answered 503 by load shedding", ["route_class", "reason"])
+GATEWAY_SHED_LEVEL = Gauge("gateway_shed_level", "Lowest classes shed on latency (0 = none)")
+GATEWAY_UPSTREAM_LATENCY = Gauge(
+    "gateway_upstream_latency_ewma_seconds", "Moving average of time to the upstream's response headers"
+)
+
+def classify(path: str) -> str:
+    for prefix, route_class in ROUTE_CLASSES:
+        if path.startswith(prefix):
+            return route_class
+    return READS
+
+def _parse_thresholds(value: str) -> Tuple[float, ...]:
+    return tuple(float(part) / 1000 for part in value.split(",") if part.strip())
+
+class LoadGovernor:
+    """
+    Per-worker concurrency governor.
+
+    Capacity: every class below CHECKIN leaves the reserves of the classes above it untouched,
+    so a class may only start a request while in-flight < max_in_flight - reserved_above.
+    Latency: each latency threshold crossed by the upstream moving average sheds one more class,
+    lowest first (EXPORTS, then READS, then AUTH). CHECKIN is never shed on latency.
+    The average only moves on admitted requests: when no sample came in for probe_interval
+    (everything arriving is shed), one shed request is let through as a probe so a recovered
+    upstream is noticed.
+    """
+    def __init__(
+        self,
+        max_in_flight: int,
+        reserves: Dict[str, int],
+        latency_thresholds: Tuple[float, ...],
+        alpha: float,
+        probe_interval: float
+    ):
+        self.max_in_flight = max_in_flight
+        self.latency_thresholds = latency_thresholds
+        self.alpha = alpha
+        self.probe_interval = probe_interval
+        self.latency_ewma = 0.0
+        self.last_sample_at = time.monotonic()
+        self.in_flight: Dict[str, int] = {route_class: 0 for route_class in PRIORITY_ORDER}
+        # Slots a class may not touch: the reserves of every class above it
+        self.limits: Dict[str, int] = {}
+        reserved_above = 0
+        for route_class in PRIORITY_ORDER:
+            self.limits[route_class] = max(0, max_in_flight - reserved_above)
+            reserved_above += reserves.get(route_class, 0)
+
+    def shed_level(self) -> int:
+        """Number of lowest classes currently shed on latency"""
+        level = sum(1 for threshold in self.latency_thresholds if self.latency_ewma >= threshold)
+        return min(level, len(PRIORITY_ORDER) - 1)
+
+    def admit(self, route_class: str) -> Optional[str]:
+        """None when admitted (caller must release), else the shedding reason"""
+        rank = PRIORITY_ORDER.index(route_class)
+        if rank >= len(PRIORITY_ORDER) - self.shed_level() and not self._take_probe():
+            return "latency"
+        if sum(self.in_flight.values()) >= self.limits[route_class]:
+            return "in_flight"
+        self.in_flight[route_class] += 1
+        GATEWAY_IN_FLIGHT.labels(route_class).set(self.in_flight[route_class])
+        return None
+
+    def _take_probe(self) -> bool:
+        now = time.monotonic()
+        if now - self.last_sample_at < self.probe_interval:
+            return False
+        # Counts as a sample for spacing: the next probe waits for this one's interval
+        self.last_sample_at = now
+        return True
+
+    def release(self, route_class: str) -> None:
+        self.in_flight[route_class] -= 1
+        GATEWAY_IN_FLIGHT.labels(route_class).set(self.in_flight[route_class])
+
+    def observe_latency(self, seconds: float) -> None:
+        self.last_sample_at = time.monotonic()
+        self.latency_ewma += self.alpha * (seconds - self.latency_ewma)
+        GATEWAY_UPSTREAM_LATENCY.set(self.latency_ewma)
+        GATEWAY_SHED_LEVEL.set(self.shed_level())
+
+def load_governor() -> LoadGovernor:
+    return LoadGovernor(
+        max_in_flight=settings.SHED_MAX_IN_FLIGHT,
+        reserves={
+            CHECKIN: settings.SHED_RESERVE_CHECKIN,
+            AUTH: settings.SHED_RESERVE_AUTH,
+            READS: settings.SHED_RESERVE_READS,
+        },
+        latency_thresholds=_parse_thresholds(settings.SHED_LATENCY_THRESHOLDS_MS),
+        alpha=settings.SHED_LATENCY_ALPHA,
+        probe_interval=settings.SHED_PROBE_INTERVAL
+    )
+
+class LoadSheddingMiddleware:
+    """
+    Pure ASGI so the slot covers the whole proxied body.
+    WebSocket and SSE streams are left to the per-user stream limiter.
+    """
+    def __init__(self, app):
+        self.app = app
+        self.governor = load_governor()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.SHED_ENABLED or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] == "OPTIONS" or self._is_event_stream(scope):
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify(scope["path"])
+        reason = self.governor.admit(route_class)
+        if reason:
+            GATEWAY_SHED.labels(route_class, reason).inc()
+            await self._shed(send)
+            return
+
+        started = time.monotonic()
+
+        async def send_timed(message):
+            # Upstream latency = time to response headers (bodies of exports are long by design)
+            if message["type"] == "http.response.start":
+                self.governor.observe_latency(time.monotonic() - started)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            self.governor.release(route_class)
+
+    @staticmethod
+    def _is_event_stream(scope) -> bool:
+        for name, value in scope.get("headers", []):
+            if name == b"accept":
+                return b"text/event-stream" in value.lower()
+        return False
+
+    @staticmethod
+    async def _shed(send) -> None:
+        body = orjson.dumps({"error": "Service is busy, retry shortly"})
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.SHED_RETRY_AFTER).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
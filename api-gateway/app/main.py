@@ -7,9 +7,12 @@ from contextlib import asynccontextmanager
 
 # Import configuration and shared utilities
 from app.Shared.Middleware.auth_middleware import AuthMiddleware
+from app.Shared.Middleware.load_shedding import LoadSheddingMiddleware
+from prometheus_fastapi_instrumentator import Instrumentator
 from app.Shared.Infra.reverse_proxy import proxy_handler, proxy_handler_staff
 from app.Shared.Core.limiter import limiter
 from app.Shared.Core.config import settings
+from app.Shared.Core.idempotency import idempotency_store
 
 # Import routers
 from app.Domain.v1.Auth.route_auth import router as auth_router
@@ -31,6 +34,7 @@ async def lifespan(app: FastAPI):
     # Shutdown: close the HTTP Clients for protect Memory Leak
     await proxy_handler.close()
     await proxy_handler_staff.close()
+    await idempotency_store.close()
     logger.info("gateway_shutdown", status="stopped")
 
 # Create Limiter that use the redis connection that import from the session_store
@@ -44,26 +48,25 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Priority load shedding (innermost: its 503s still get CORS headers)
+app.add_middleware(LoadSheddingMiddleware)
+
 # CORS Middlewares
-if settings.CORS_ORIGINS:
-    allow_origins = [origin.strip() for origin in settings.CORS_ORIGINS.split(",")]
-else:
-    # Development fallback
-    allow_origins = [
-        "http://localhost:5173",
-        "http://192.168.18.119:5173",
-        "https://192.168.18.119:5173",
-    ]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=allow_origins,
+    allow_origins=settings.cors_origin_list,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination cursor of list endpoints, replayed idempotent writes
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 # Auth middleware
 app.add_middleware(AuthMiddleware)
 
+# Prometheus scrape at /metrics (shedding counters, in-flight per class, upstream latency)
+Instrumentator().instrument(app).expose(app, include_in_schema=False)
+
 #  Include the routers correctly
 app.include_router(
     auth_router,
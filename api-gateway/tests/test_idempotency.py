@@ -0,0 +1,116 @@
+"""
+    Idempotency-Key on write requests (Shared/Core/idempotency.py) against a fake Redis: stored
+    responses are replayed, a concurrent duplicate waits for the first response, 5xx releases
+    the key and a reused key with another request is refused.
+"""
+import asyncio
+import json
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from fastapi import Response
+
+from app.Shared.Core.config import settings
+from app.Shared.Core.idempotency import REPLAYED_HEADER, IdempotencyStore
+
+USER_ID = "42"
+KEY = "3f1c7a52-checkin"
+BODY = b'{"token": "abc"}'
+
+@pytest.fixture
+def store():
+    store = IdempotencyStore()
+    store._redis = FakeAsyncRedis()
+    return store
+
+class Upstream:
+    """send() for IdempotencyStore.run: counts calls, optionally waits for a release"""
+    def __init__(self, status_code: int = 201, release: asyncio.Event = None):
+        self.calls = 0
+        self.status_code = status_code
+        self.release = release
+
+    async def __call__(self) -> Response:
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        body = json.dumps({"attendance_id": self.calls})
+        return Response(content=body, status_code=self.status_code, media_type="application/json")
+
+def _run(store, send, method="POST", path="/api/v1/attendances/check-in", query="", body=BODY):
+    return store.run(USER_ID, KEY, method, path, query, body, send)
+
+def test_duplicate_is_replayed(store):
+    async def scenario():
+        upstream = Upstream()
+        first = await _run(store, upstream, query="office=1&source=app")
+        # Same parameters in another order
+        second = await _run(store, upstream, query="source=app&office=1")
+        return upstream, first, second
+
+    upstream, first, second = asyncio.run(scenario())
+    assert upstream.calls == 1
+    assert second.status_code == 201 and second.body == first.body
+    assert second.headers[REPLAYED_HEADER] == "true"
+    assert second.headers["content-type"] == "application/json"
+    assert REPLAYED_HEADER not in first.headers
+
+def test_concurrent_duplicate_waits_for_first_response(store):
+    async def scenario():
+        upstream = Upstream(release=asyncio.Event())
+        first = asyncio.create_task(_run(store, upstream))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(_run(store, upstream))
+        await asyncio.sleep(0.1)
+        assert not second.done()
+        upstream.release.set()
+        return upstream, await first, await second
+
+    upstream, first, second = asyncio.run(scenario())
+    assert upstream.calls == 1
+    assert second.body == first.body
+    assert second.headers[REPLAYED_HEADER] == "true"
+
+def test_concurrent_duplicate_gives_up_after_wait_timeout(store, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_TIMEOUT", 0.1)
+
+    async def scenario():
+        upstream = Upstream(release=asyncio.Event())
+        first = asyncio.create_task(_run(store, upstream))
+        await asyncio.sleep(0.05)
+        second = await _run(store, upstream)
+        upstream.release.set()
+        await first
+        return upstream, second
+
+    upstream, second = asyncio.run(scenario())
+    assert upstream.calls == 1
+    assert second.status_code == 409
+
+def test_server_error_releases_key(store):
+    async def scenario():
+        failing = await _run(store, Upstream(status_code=503))
+        upstream = Upstream()
+        retried = await _run(store, upstream)
+        return failing, upstream, retried
+
+    failing, upstream, retried = asyncio.run(scenario())
+    assert failing.status_code == 503
+    assert upstream.calls == 1
+    assert retried.status_code == 201
+    assert REPLAYED_HEADER not in retried.headers
+
+@pytest.mark.parametrize("changed", [
+    {"body": b'{"token": "other"}'},
+    {"path": "/api/v1/attendances/check-out"},
+    {"query": "office=2"},
+])
+def test_key_reused_for_another_request_is_refused(store, changed):
+    async def scenario():
+        upstream = Upstream()
+        await _run(store, upstream, query="office=1")
+        return upstream, await _run(store, upstream, **{"query": "office=1", **changed})
+
+    upstream, reused = asyncio.run(scenario())
+    assert upstream.calls == 1
+    assert reused.status_code == 422
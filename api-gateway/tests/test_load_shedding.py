@@ -0,0 +1,61 @@
+"""
+    Latency shedding (Shared/Middleware/load_shedding.py) recovers when every request arriving
+    belongs to a shed class: one probe per interval refreshes the moving average.
+"""
+import pytest
+
+from app.Shared.Middleware import load_shedding
+from app.Shared.Middleware.load_shedding import CHECKIN, EXPORTS, READS, LoadGovernor
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(load_shedding.time, "monotonic", clock)
+    return clock
+
+def _governor() -> LoadGovernor:
+    return LoadGovernor(
+        max_in_flight=10, reserves={CHECKIN: 2}, latency_thresholds=(1.0, 2.5), alpha=0.5, probe_interval=1.0
+    )
+
+def test_shed_class_recovers_through_probes(clock):
+    governor = _governor()
+    governor.observe_latency(6.0)
+    assert governor.shed_level() == 2
+    assert governor.admit(READS) == "latency"
+
+    # Within the interval of the last sample everything shed stays shed
+    clock.now += 0.5
+    assert governor.admit(EXPORTS) == "latency"
+
+    # Then one request probes; the others keep being shed until the next interval
+    clock.now += 0.5
+    assert governor.admit(EXPORTS) is None
+    assert governor.admit(READS) == "latency"
+    governor.observe_latency(0.1)
+    governor.release(EXPORTS)
+
+    for _ in range(4):
+        clock.now += 1.0
+        assert governor.admit(READS) is None
+        governor.observe_latency(0.1)
+        governor.release(READS)
+    assert governor.shed_level() == 0
+    assert governor.admit(EXPORTS) is None
+
+def test_checkin_samples_keep_probes_off(clock):
+    governor = _governor()
+    governor.observe_latency(6.0)
+    for _ in range(3):
+        clock.now += 0.9
+        assert governor.admit(CHECKIN) is None
+        governor.observe_latency(6.0)
+        governor.release(CHECKIN)
+        assert governor.admit(EXPORTS) == "latency"
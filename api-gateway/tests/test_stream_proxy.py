@@ -0,0 +1,126 @@
+"""
+    WebSocket / SSE pass-through against a local echo upstream.
+
+    Both the upstream and the gateway run under uvicorn on loopback ports so frames and events
+    cross real sockets; the SSE test only releases the upstream's second event after the first
+    one reached the client, so a buffering proxy would hang instead of pass.
+"""
+import asyncio
+import socket
+import threading
+import time
+
+import httpx
+import pytest
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket
+from fastapi.responses import StreamingResponse
+from websockets.exceptions import InvalidStatus
+from websockets.sync.client import connect
+
+from app.Shared.Infra.reverse_proxy import ReverseProxy
+
+USER_ID = "42"
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _serve(app: FastAPI) -> tuple:
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("test server did not start")
+        time.sleep(0.01)
+    return server, thread, port
+
+def _upstream_app(release_second_event: threading.Event) -> FastAPI:
+    upstream = FastAPI()
+
+    @upstream.websocket("/ws/echo")
+    async def echo(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.send_text(f"user:{websocket.headers.get('x-user-id')}")
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("text") is not None:
+                await websocket.send_text(message["text"])
+            else:
+                await websocket.send_bytes(message["bytes"])
+
+    @upstream.get("/events")
+    async def events(request: Request):
+        async def stream():
+            yield f"data: first {request.headers.get('x-user-id')}\n\n"
+            while not release_second_event.is_set():
+                await asyncio.sleep(0.01)
+            yield "data: second\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return upstream
+
+def _gateway_app(proxy: ReverseProxy) -> FastAPI:
+    gateway = FastAPI()
+
+    @gateway.websocket("/ws/{path:path}")
+    async def ws_proxy(websocket: WebSocket, path: str):
+        await proxy.forward_websocket(websocket, f"ws/{path}", USER_ID)
+
+    @gateway.get("/{path:path}")
+    async def http_proxy(request: Request, path: str):
+        request.state.user_id = USER_ID
+        return await proxy.forward(request, path)
+
+    return gateway
+
+@pytest.fixture(scope="module")
+def servers():
+    release_second_event = threading.Event()
+    upstream, upstream_thread, upstream_port = _serve(_upstream_app(release_second_event))
+    proxy = ReverseProxy(f"http://127.0.0.1:{upstream_port}")
+    gateway, gateway_thread, gateway_port = _serve(_gateway_app(proxy))
+
+    yield {"gateway_port": gateway_port, "release_second_event": release_second_event}
+
+    for server, thread in ((gateway, gateway_thread), (upstream, upstream_thread)):
+        server.should_exit = True
+        thread.join(timeout=10)
+
+def test_websocket_frames_round_trip(servers):
+    with connect(f"ws://127.0.0.1:{servers['gateway_port']}/ws/echo", open_timeout=10) as ws:
+        # The upstream saw the authenticated user the gateway forwarded
+        assert ws.recv(timeout=10) == f"user:{USER_ID}"
+
+        ws.send("hello")
+        assert ws.recv(timeout=10) == "hello"
+
+        ws.send(b"\x00\x01binary")
+        assert ws.recv(timeout=10) == b"\x00\x01binary"
+
+def test_websocket_is_refused_when_upstream_refuses(servers):
+    # The gateway closes before accepting, which the client sees as a rejected handshake
+    with pytest.raises(InvalidStatus) as refused:
+        connect(f"ws://127.0.0.1:{servers['gateway_port']}/ws/missing", open_timeout=10)
+    assert refused.value.response.status_code == 403
+
+def test_event_stream_is_relayed_without_buffering(servers):
+    url = f"http://127.0.0.1:{servers['gateway_port']}/events"
+    with httpx.Client(timeout=10) as client:
+        with client.stream("GET", url, headers={"Accept": "text/event-stream"}) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+
+            lines = response.iter_lines()
+            assert next(lines) == f"data: first {USER_ID}"
+            # Only now may the upstream produce the rest of the stream
+            servers["release_second_event"].set()
+            remaining = [line for line in lines if line]
+            assert remaining == ["data: second"]
@@ -0,0 +1,138 @@
+import warnings
+from datetime import date
+from typing import Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.Shared.Core.config import settings
+from app.Domain.v1.Attendance_Records.Services.columnar_archive import STATUS_NAMES
+from app.Domain.v1.Analytics.Services.attendance_cube import (
+    ABSENT,
+    LATE,
+    PRESENT,
+    AttendanceCube,
+    build_cube,
+    lateness_percentiles,
+    office_comparison,
+    status_counts,
+    streaks
+)
+from app.Domain.v1.Analytics.Schemas.analytics_schema import (
+    HeatmapRow,
+    HeatmapDayTotals,
+    HeatmapResponse,
+    UserAnalytics,
+    UserAnalyticsResponse,
+    OfficeAnalytics,
+    OfficeComparisonResponse
+)
+
+PERCENTILES = (50, 90, 95)
+
+def _optional_float(value) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 2)
+
+class AnalyticsService:
+    """Business Logic for user x day analytics (all aggregation is vectorized over the cube)"""
+    @staticmethod
+    def _load_cube(db: Session, date_from: date, date_to: date, office_id: Optional[int]) -> AttendanceCube:
+        if date_from > date_to:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must be before date_to")
+        if (date_to - date_from).days + 1 > settings.ANALYTICS_MAX_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Range is limited to {settings.ANALYTICS_MAX_DAYS} days"
+            )
+        cube = build_cube(db, date_from, date_to)
+        return cube.select_office(office_id) if office_id is not None else cube
+
+    @staticmethod
+    def _page(cube: AttendanceCube, limit: int, offset: int) -> Tuple[AttendanceCube, int]:
+        return cube.select_users(cube.user_ids[offset:offset + limit]), len(cube.user_ids)
+
+    @staticmethod
+    def get_heatmap(
+        db: Session, date_from: date, date_to: date, office_id: Optional[int], limit: int, offset: int
+    ) -> HeatmapResponse:
+        """ Status grid for one page of users; day totals cover every user in the range """
+        cube = AnalyticsService._load_cube(db, date_from, date_to, office_id)
+        days = cube.day_list()
+        day_totals = zip(
+            days,
+            np.count_nonzero(cube.status == PRESENT, axis=0).tolist(),
+            np.count_nonzero(cube.status == LATE, axis=0).tolist(),
+            np.count_nonzero(cube.status == ABSENT, axis=0).tolist()
+        )
+        page, total_users = AnalyticsService._page(cube, limit, offset)
+
+        return HeatmapResponse.model_construct(
+            date_from=date_from,
+            date_to=date_to,
+            office_id=office_id,
+            total_users=total_users,
+            legend={0: "none", **STATUS_NAMES},
+            days=days,
+            rows=[
+                HeatmapRow.model_construct(user_id=user_id, cells=cells)
+                for user_id, cells in zip(page.user_ids.tolist(), page.status.tolist())
+            ],
+            day_totals=[
+                HeatmapDayTotals.model_construct(date=day, present=present, late=late, absent=absent)
+                for day, present, late, absent in day_totals
+            ]
+        )
+
+    @staticmethod
+    def get_user_analytics(
+        db: Session, date_from: date, date_to: date, office_id: Optional[int], limit: int, offset: int
+    ) -> UserAnalyticsResponse:
+        """ Counts, lateness percentiles and on-time streaks per user """
+        cube = AnalyticsService._load_cube(db, date_from, date_to, office_id)
+        page, total_users = AnalyticsService._page(cube, limit, offset)
+
+        counts = status_counts(page)
+        longest, current = streaks(page)
+        percentiles = lateness_percentiles(page, PERCENTILES)
+        late_minutes = np.where(page.status == LATE, page.minutes_late, 0).sum(axis=1, dtype=np.int64)
+        with warnings.catch_warnings():
+            # Users without any work_hours yet
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            avg_hours = np.nanmean(page.work_hours, axis=1)
+
+        users = []
+        for i, user_id in enumerate(page.user_ids.tolist()):
+            present, late = int(counts["present"][i]), int(counts["late"][i])
+            attended = present + late
+            users.append(UserAnalytics.model_construct(
+                user_id=user_id,
+                present=present,
+                late=late,
+                absent=int(counts["absent"][i]),
+                late_rate=round(late / attended * 100, 2) if attended else 0.0,
+                avg_minutes_late=round(int(late_minutes[i]) / late, 2) if late else 0.0,
+                minutes_late_percentiles={
+                    f"p{p}": _optional_float(percentiles[i, j]) for j, p in enumerate(PERCENTILES)
+                },
+                avg_work_hours=_optional_float(avg_hours[i]),
+                longest_on_time_streak=int(longest[i]),
+                current_on_time_streak=int(current[i])
+            ))
+
+        return UserAnalyticsResponse.model_construct(
+            date_from=date_from,
+            date_to=date_to,
+            office_id=office_id,
+            total_users=total_users,
+            users=users
+        )
+
+    @staticmethod
+    def get_office_comparison(db: Session, date_from: date, date_to: date) -> OfficeComparisonResponse:
+        cube = AnalyticsService._load_cube(db, date_from, date_to, None)
+        return OfficeComparisonResponse.model_construct(
+            date_from=date_from,
+            date_to=date_to,
+            offices=[OfficeAnalytics.model_construct(**office) for office in office_comparison(cube)]
+        )
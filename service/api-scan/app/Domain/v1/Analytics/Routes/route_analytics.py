@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+from app.Shared.Infra.database import get_read_db
+from app.Shared.Core.responses import model_response
+from app.Domain.v1.Analytics.Schemas.analytics_schema import (
+    HeatmapResponse,
+    UserAnalyticsResponse,
+    OfficeComparisonResponse
+)
+from app.Domain.v1.Analytics.Controllers.analytics_controller import AnalyticsService
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+def get_range(
+    date_from: Optional[date] = Query(None, description="First day (YYYY-MM-DD), default 30 days before date_to"),
+    date_to: Optional[date] = Query(None, description="Last day (YYYY-MM-DD), default today")
+) -> Tuple[date, date]:
+    date_to = date_to or date.today()
+    return date_from or date_to - timedelta(days=29), date_to
+
+@router.get("/heatmap", response_model=HeatmapResponse, status_code=status.HTTP_200_OK)
+def get_heatmap(
+    date_range: Tuple[date, date] = Depends(get_range),
+    office_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db)
+):
+    """
+    User x day heatmap of attendance status
+
+    Query params:
+    - date_from / date_to: Range (max ANALYTICS_MAX_DAYS days)
+    - office_id: Optional, users with at least one record at this office
+    - limit / offset: Page of users (ordered by user_id)
+
+    Returns:
+    - days + one row of status codes per user (see legend)
+    - day_totals over every user in the range
+    """
+    date_from, date_to = date_range
+    return model_response(AnalyticsService.get_heatmap(db, date_from, date_to, office_id, limit, offset))
+
+@router.get("/users", response_model=UserAnalyticsResponse, status_code=status.HTTP_200_OK)
+def get_user_analytics(
+    date_range: Tuple[date, date] = Depends(get_range),
+    office_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Per-user lateness profile
+
+    Returns per user: status counts, late rate, minutes-late percentiles (p50/p90/p95),
+    average work hours, longest and current on-time streak (days without a record don't break it)
+    """
+    date_from, date_to = date_range
+    return model_response(AnalyticsService.get_user_analytics(db, date_from, date_to, office_id, limit, offset))
+
+@router.get("/offices", response_model=OfficeComparisonResponse, status_code=status.HTTP_200_OK)
+def get_office_comparison(
+    date_range: Tuple[date, date] = Depends(get_range),
+    db: Session = Depends(get_read_db)
+):
+    """ Side-by-side totals, late rate and average lateness per office """
+    date_from, date_to = date_range
+    return model_response(AnalyticsService.get_office_comparison(db, date_from, date_to))
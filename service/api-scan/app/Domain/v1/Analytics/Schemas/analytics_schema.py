@@ -0,0 +1,64 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from datetime import date
+
+class AnalyticsRange(BaseModel):
+    """ Range and filters the cube was sliced with """
+    date_from: date
+    date_to: date
+    office_id: Optional[int] = None
+    total_users: int = Field(..., description="Users in the range before limit / offset")
+
+# Heatmap Schema
+class HeatmapRow(BaseModel):
+    """ One user's status per day, aligned on HeatmapResponse.days """
+    user_id: int
+    cells: List[int]
+
+class HeatmapDayTotals(BaseModel):
+    date: date
+    present: int
+    late: int
+    absent: int
+
+class HeatmapResponse(AnalyticsRange):
+    """ User x day grid of status codes """
+    legend: Dict[int, str] = Field(..., description="Cell value -> status (0 = no record)")
+    days: List[date]
+    rows: List[HeatmapRow]
+    day_totals: List[HeatmapDayTotals]
+
+# Per-user Schema
+class UserAnalytics(BaseModel):
+    """ Attendance profile of one user over the range """
+    user_id: int
+    present: int
+    late: int
+    absent: int
+    late_rate: float = Field(..., description="late / (present + late), percent")
+    avg_minutes_late: float = Field(..., description="Average over late days")
+    minutes_late_percentiles: Dict[str, Optional[float]] = Field(
+        ..., description="p50 / p90 / p95 over late days, null when never late"
+    )
+    avg_work_hours: Optional[float] = None
+    longest_on_time_streak: int
+    current_on_time_streak: int
+
+class UserAnalyticsResponse(AnalyticsRange):
+    users: List[UserAnalytics]
+
+# Office comparison Schema
+class OfficeAnalytics(BaseModel):
+    office_id: int
+    users: int
+    records: int
+    present: int
+    late: int
+    late_rate: float
+    avg_minutes_late: float
+    avg_work_hours: float
+
+class OfficeComparisonResponse(BaseModel):
+    date_from: date
+    date_to: date
+    offices: List[OfficeAnalytics]
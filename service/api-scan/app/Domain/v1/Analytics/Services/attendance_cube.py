@@ -0,0 +1,280 @@
+"""
+    Dense user x day attendance cube (NumPy) for heatmaps and per-user analytics.
+
+    One cube per month is built from the columnar archive when the month is archived, from
+    Postgres otherwise, and cached in-process: archived months until the archive is rebuilt,
+    other closed months until their rollup watermark moves (every attendance write bumps the
+    updated_at of its daily_attendance_summary row), the open month for ANALYTICS_OPEN_MONTH_TTL
+    seconds. Ranges are month cubes aligned on the union of their user ids and concatenated
+    along the day axis.
+"""
+import threading
+import time
+import warnings
+from dataclasses import dataclass
+from datetime import date, timedelta
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Domain.v1.Dashboard.Models.daily_summary_model import DailyAttendanceSummary
+from app.Domain.v1.Attendance_Records.Services.columnar_archive import (
+    STATUS_CODES,
+    day_number,
+    is_closed_month,
+    load_month,
+    month_bounds,
+    month_key,
+    months_between,
+    read_meta
+)
+from app.Shared.Core.config import settings
+
+# status cell values (0 = no record that day)
+NO_RECORD = 0
+PRESENT = STATUS_CODES["present"]
+LATE = STATUS_CODES["late"]
+ABSENT = STATUS_CODES["absent"]
+
+@dataclass(frozen=True)
+class AttendanceCube:
+    """Cells are [user row, day column]; user_ids is sorted so rows are found with searchsorted"""
+    user_ids: np.ndarray # int32 (U,)
+    first_day: date
+    status: np.ndarray # uint8 (U, D)
+    minutes_late: np.ndarray # int16 (U, D)
+    work_hours: np.ndarray # float32 (U, D), NaN = none
+    office_id: np.ndarray # int32 (U, D), -1 = none
+
+    @property
+    def days(self) -> int:
+        return self.status.shape[1]
+
+    def day_list(self) -> List[date]:
+        return [self.first_day + timedelta(days=offset) for offset in range(self.days)]
+
+    def select_days(self, date_from: date, date_to: date) -> "AttendanceCube":
+        start = max(0, (date_from - self.first_day).days)
+        stop = min(self.days, (date_to - self.first_day).days + 1)
+        return AttendanceCube(
+            user_ids=self.user_ids,
+            first_day=self.first_day + timedelta(days=start),
+            status=self.status[:, start:stop],
+            minutes_late=self.minutes_late[:, start:stop],
+            work_hours=self.work_hours[:, start:stop],
+            office_id=self.office_id[:, start:stop]
+        )
+
+    def select_users(self, user_ids: Sequence[int]) -> "AttendanceCube":
+        wanted = np.intersect1d(self.user_ids, np.asarray(user_ids, dtype=np.int32))
+        rows = np.searchsorted(self.user_ids, wanted)
+        return AttendanceCube(
+            user_ids=wanted,
+            first_day=self.first_day,
+            status=self.status[rows],
+            minutes_late=self.minutes_late[rows],
+            work_hours=self.work_hours[rows],
+            office_id=self.office_id[rows]
+        )
+
+    def select_office(self, office_id: int) -> "AttendanceCube":
+        """Users with at least one record at this office in the range"""
+        return self.select_users(self.user_ids[(self.office_id == office_id).any(axis=1)])
+
+def _empty_cube(users: int, days: int) -> Tuple[np.ndarray, ...]:
+    return (
+        np.zeros((users, days), dtype=np.uint8),
+        np.zeros((users, days), dtype=np.int16),
+        np.full((users, days), np.nan, dtype=np.float32),
+        np.full((users, days), -1, dtype=np.int32),
+    )
+
+def _cube_from_columns(
+    first_day: date, days: int, user_ids, day, status, minutes_late, work_hours, office_id
+) -> AttendanceCube:
+    """Scatter flat rows into the dense grid (one vectorized fancy-index assignment per array)"""
+    users = np.unique(user_ids).astype(np.int32)
+    rows = np.searchsorted(users, user_ids)
+    cols = np.asarray(day, dtype=np.int64) - day_number(first_day)
+    cube_status, cube_late, cube_hours, cube_office = _empty_cube(len(users), days)
+    cube_status[rows, cols] = status
+    cube_late[rows, cols] = minutes_late
+    cube_hours[rows, cols] = work_hours
+    cube_office[rows, cols] = office_id
+    return AttendanceCube(users, first_day, cube_status, cube_late, cube_hours, cube_office)
+
+def _build_month_from_archive(month: date, columns) -> AttendanceCube:
+    first, last = month_bounds(month)
+    return _cube_from_columns(
+        first, (last - first).days + 1,
+        np.asarray(columns["user_id"]), columns["day"], columns["status"],
+        columns["minutes_late"], columns["work_hours"], columns["office_id"]
+    )
+
+def _build_month_from_database(db: Session, month: date) -> AttendanceCube:
+    first, last = month_bounds(month)
+    rows = db.query(
+        Attendance.user_id, Attendance.log_date, Attendance.status, Attendance.minutes_late,
+        Attendance.work_hours, Attendance.office_id
+    ).filter(
+        Attendance.log_date >= first,
+        Attendance.log_date <= last
+    ).all()
+    return _cube_from_columns(
+        first, (last - first).days + 1,
+        np.fromiter((row.user_id for row in rows), dtype=np.int32, count=len(rows)),
+        np.fromiter((day_number(row.log_date) for row in rows), dtype=np.int32, count=len(rows)),
+        np.fromiter((STATUS_CODES.get(row.status, NO_RECORD) for row in rows), dtype=np.uint8, count=len(rows)),
+        np.fromiter((row.minutes_late or 0 for row in rows), dtype=np.int16, count=len(rows)),
+        np.fromiter(
+            (float(row.work_hours) if row.work_hours is not None else np.nan for row in rows),
+            dtype=np.float32, count=len(rows)
+        ),
+        np.fromiter(
+            (row.office_id if row.office_id is not None else -1 for row in rows),
+            dtype=np.int32, count=len(rows)
+        )
+    )
+
+# ==================== Per-month cache ====================
+
+# month key -> (version, expires_at, cube), least recently used first; version is the archive
+# build, the rollup watermark of a closed month, or "db" for the open month
+_cube_cache: "OrderedDict[str, Tuple[str, float, AttendanceCube]]" = OrderedDict()
+_cube_cache_lock = threading.Lock()
+
+def _database_version(db: Session, month: date) -> str:
+    """Latest rollup write of the month (at most 31 x offices summary rows, primary key range)"""
+    first, last = month_bounds(month)
+    watermark = db.query(func.max(DailyAttendanceSummary.updated_at)).filter(
+        DailyAttendanceSummary.summary_date >= first,
+        DailyAttendanceSummary.summary_date <= last
+    ).scalar()
+    return f"db:{watermark.isoformat() if watermark else '-'}"
+
+def get_month_cube(db: Session, month: date) -> AttendanceCube:
+    key = month_key(month)
+    meta = read_meta(month)
+    closed = is_closed_month(month)
+    if meta:
+        version = meta["built_at"]
+    else:
+        version = _database_version(db, month) if closed else "db"
+    now = time.monotonic()
+
+    with _cube_cache_lock:
+        cached = _cube_cache.get(key)
+        if cached and cached[0] == version and cached[1] > now:
+            _cube_cache.move_to_end(key)
+            return cached[2]
+
+    columns = load_month(month) if meta else None
+    cube = _build_month_from_archive(month, columns) if columns is not None else _build_month_from_database(db, month)
+    ttl = float("inf") if closed else settings.ANALYTICS_OPEN_MONTH_TTL
+
+    with _cube_cache_lock:
+        _cube_cache[key] = (version, now + ttl, cube)
+        _cube_cache.move_to_end(key)
+        while len(_cube_cache) > settings.ANALYTICS_CUBE_CACHE_MONTHS:
+            _cube_cache.popitem(last=False)
+    return cube
+
+def build_cube(db: Session, date_from: date, date_to: date) -> AttendanceCube:
+    """Range cube: month cubes re-indexed on the union of their users, concatenated by day"""
+    months = [get_month_cube(db, month) for month in months_between(date_from, date_to)]
+    users = np.unique(np.concatenate([cube.user_ids for cube in months])) if months else np.empty(0, np.int32)
+    days = sum(cube.days for cube in months)
+    first_day = months[0].first_day if months else date_from
+    status, minutes_late, work_hours, office_id = _empty_cube(len(users), days)
+
+    offset = 0
+    for cube in months:
+        rows = np.searchsorted(users, cube.user_ids)
+        window = slice(offset, offset + cube.days)
+        status[rows, window] = cube.status
+        minutes_late[rows, window] = cube.minutes_late
+        work_hours[rows, window] = cube.work_hours
+        office_id[rows, window] = cube.office_id
+        offset += cube.days
+
+    cube = AttendanceCube(users.astype(np.int32), first_day, status, minutes_late, work_hours, office_id)
+    return cube.select_days(date_from, date_to)
+
+# ==================== Vectorized analytics ====================
+
+def streaks(cube: AttendanceCube) -> Tuple[np.ndarray, np.ndarray]:
+    """
+        On-time streaks per user: (longest, current).
+        Late / absent days break a streak; days without a record (weekends, holidays) are neutral.
+    """
+    on_time = cube.status == PRESENT
+    breaks = (cube.status == LATE) | (cube.status == ABSENT)
+    count = np.cumsum(on_time, axis=1, dtype=np.int32)
+    # Count at the last break, carried forward; run length = count since that break
+    last_break = np.maximum.accumulate(np.where(breaks, count, 0), axis=1)
+    run = count - last_break
+    if run.shape[1] == 0:
+        empty = np.zeros(run.shape[0], dtype=np.int32)
+        return empty, empty
+    return run.max(axis=1), run[:, -1]
+
+def lateness_percentiles(cube: AttendanceCube, percentiles: Sequence[float]) -> np.ndarray:
+    """(U, len(percentiles)) minutes late over each user's late days; NaN for users never late"""
+    minutes = np.where(cube.status == LATE, cube.minutes_late.astype(np.float32), np.nan)
+    with warnings.catch_warnings():
+        # All-NaN rows (never late) are expected
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        result = np.nanpercentile(minutes, percentiles, axis=1)
+    return np.atleast_2d(result).T
+
+def status_counts(cube: AttendanceCube) -> Dict[str, np.ndarray]:
+    return {
+        "present": np.count_nonzero(cube.status == PRESENT, axis=1),
+        "late": np.count_nonzero(cube.status == LATE, axis=1),
+        "absent": np.count_nonzero(cube.status == ABSENT, axis=1),
+    }
+
+def office_comparison(cube: AttendanceCube) -> List[Dict]:
+    """Per office totals over every cell recorded at that office (bincount over office ids)"""
+    recorded = cube.office_id >= 0
+    offices = cube.office_id[recorded]
+    if offices.size == 0:
+        return []
+    status = cube.status[recorded]
+    minutes = cube.minutes_late[recorded].astype(np.int64)
+    hours = np.nan_to_num(cube.work_hours[recorded]).astype(np.float64)
+
+    office_ids, index = np.unique(offices, return_inverse=True)
+    size = len(office_ids)
+    total = np.bincount(index, minlength=size)
+    present = np.bincount(index, weights=status == PRESENT, minlength=size)
+    late = np.bincount(index, weights=status == LATE, minlength=size)
+    late_minutes = np.bincount(index, weights=np.where(status == LATE, minutes, 0), minlength=size)
+    work_hours = np.bincount(index, weights=hours, minlength=size)
+    users = np.array([
+        np.count_nonzero((cube.office_id == office).any(axis=1)) for office in office_ids
+    ])
+
+    attended = present + late
+    with np.errstate(divide="ignore", invalid="ignore"):
+        late_rate = np.where(attended > 0, late / attended * 100, 0.0)
+        avg_late = np.where(late > 0, late_minutes / late, 0.0)
+        avg_hours = np.where(total > 0, work_hours / total, 0.0)
+
+    return [
+        {
+            "office_id": int(office_ids[i]),
+            "users": int(users[i]),
+            "records": int(total[i]),
+            "present": int(present[i]),
+            "late": int(late[i]),
+            "late_rate": round(float(late_rate[i]), 2),
+            "avg_minutes_late": round(float(avg_late[i]), 2),
+            "avg_work_hours": round(float(avg_hours[i]), 2),
+        }
+        for i in range(size)
+    ]
@@ -0,0 +1,42 @@
+"""
+    Export closed attendance months into the columnar archive (ATTENDANCE_ARCHIVE_DIR).
+
+    Usage:
+        python -m app.Domain.v1.Attendance_Records.Commands.archive_months
+        python -m app.Domain.v1.Attendance_Records.Commands.archive_months --month 2025-03 --force
+"""
+import argparse
+from datetime import datetime
+
+from app.Shared.Infra.database import SessionLocal
+from app.Domain.v1.Attendance_Records.Services.columnar_archive import (
+    archive_closed_months,
+    export_month,
+    is_closed_month
+)
+# Import models so SQLAlchemy registers them in metadata for foreign key resolution
+from app.Domain.v1.Users.Models.user_model import User
+from app.Domain.v1.Attendances.Models.attendance_reason_model import AttendanceReason
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive closed attendance months as column files")
+    parser.add_argument("--month", help="Only this month (YYYY-MM)")
+    parser.add_argument("--force", action="store_true", help="Rebuild months that are already archived")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.month:
+            month = datetime.strptime(args.month, '%Y-%m').date()
+            if not is_closed_month(month):
+                parser.error(f"{args.month} is not closed yet")
+            meta = export_month(db, month)
+            print(f"{meta['month']}: {meta['rows']} rows")
+        else:
+            archived = archive_closed_months(db, force=args.force)
+            print(f"archived: {', '.join(archived) or '-'}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, tuple_, select, literal_column, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timezone
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Domain.v1.Attendances.Models.attendance_reason_model import AttendanceReason
+from app.Domain.v1.Attendance_Records.Schemas.attendance_record_schema import (
+    AttendanceRecordFilters,
+    AttendanceRecordItem,
+    AttendanceRecordReason,
+    AttendanceRecordPagination,
+    AttendanceRecordListResponse,
+    AttendanceStatisticsResponse
+)
+from app.Domain.v1.Attendance_Records.Services.record_query import build_record_query, newest_first
+from app.Domain.v1.Attendance_Records.Services.record_export import stream_csv, stream_xlsx_export
+from app.Domain.v1.Attendance_Records.Services.record_statistics import compute_statistics
+from app.Shared.Core.pagination import encode_key, decode_key
+from app.Shared.Infra.streaming_xlsx import XLSX_MEDIA_TYPE
+from app.Shared.Infra.ndjson import ndjson_response
+
+class AttendanceRecordService:
+    """ Attendance history read from the attendances table (list + streamed exports) """
+
+    @staticmethod
+    def month_range(month: str) -> Tuple[date, date]:
+        """ YYYY-MM -> first and last day (Laravel-compatible `month` filter) """
+        try:
+            first_day = datetime.strptime(month, "%Y-%m").date()
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="month must be YYYY-MM")
+        if first_day.month == 12:
+            next_month = date(first_day.year + 1, 1, 1)
+        else:
+            next_month = date(first_day.year, first_day.month + 1, 1)
+        return first_day, date.fromordinal(next_month.toordinal() - 1)
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[date, int]:
+        log_date, row_id = decode_key(cursor, 2)
+        try:
+            return date.fromisoformat(log_date), int(row_id)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    @staticmethod
+    def _load_reasons(db: Session, attendance_ids: List[int]) -> Dict[int, List[AttendanceRecordReason]]:
+        """ Reasons for a whole page in one query """
+        reasons: Dict[int, List[AttendanceRecordReason]] = {}
+        if not attendance_ids:
+            return reasons
+        rows = db.query(
+            AttendanceReason.id, AttendanceReason.attendance_id, AttendanceReason.reason_type, AttendanceReason.reason
+        ).filter(
+            AttendanceReason.attendance_id.in_(attendance_ids)
+        ).order_by(AttendanceReason.id).all()
+        for row in rows:
+            reasons.setdefault(row.attendance_id, []).append(
+                AttendanceRecordReason(id=row.id, reason_type=row.reason_type, reason=row.reason)
+            )
+        return reasons
+
+    @staticmethod
+    def _load_stop_counts(db: Session, user_ids: List[int]) -> Dict[int, int]:
+        """ Checked-out attendances per user (Laravel `stop_count`), one GROUP BY per page """
+        if not user_ids:
+            return {}
+        rows = db.query(
+            Attendance.user_id, func.count(Attendance.id)
+        ).filter(
+            Attendance.user_id.in_(user_ids),
+            Attendance.check_out.isnot(None)
+        ).group_by(Attendance.user_id).all()
+        return {user_id: count for user_id, count in rows}
+
+    @staticmethod
+    def get_records(
+        db: Session, filters: AttendanceRecordFilters, per_page: int, cursor: Optional[str] = None
+    ) -> AttendanceRecordListResponse:
+        """ Keyset page on (log_date, id) newest first: constant cost however deep the page """
+        query = build_record_query(db, filters)
+        if cursor:
+            last_date, last_id = AttendanceRecordService._decode_cursor(cursor)
+            # Redundant log_date bound: row comparisons do not prune partitions, plain ones do
+            query = query.filter(
+                Attendance.log_date <= last_date,
+                tuple_(Attendance.log_date, Attendance.id) < (last_date, last_id)
+            )
+
+        rows = newest_first(query).limit(per_page + 1).all()
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = encode_key([rows[-1].log_date.isoformat(), rows[-1].id])
+
+        reasons = AttendanceRecordService._load_reasons(db, [row.id for row in rows])
+        stop_counts = AttendanceRecordService._load_stop_counts(db, list({row.user_id for row in rows}))
+
+        return AttendanceRecordListResponse(
+            data=[
+                AttendanceRecordItem(
+                    id=row.id,
+                    user_id=row.user_id,
+                    staff_name=row.staff_name or "N/A",
+                    office_id=row.office_id,
+                    office_name=row.office_name or "N/A",
+                    log_date=row.log_date,
+                    check_in=row.check_in,
+                    check_out=row.check_out,
+                    status=row.status,
+                    minutes_late=row.minutes_late or 0,
+                    work_hours=float(row.work_hours) if row.work_hours is not None else None,
+                    stop_count=stop_counts.get(row.user_id, 0),
+                    reasons=reasons.get(row.id, []),
+                    created_at=row.created_at
+                )
+                for row in rows
+            ],
+            pagination=AttendanceRecordPagination(per_page=per_page, next_cursor=next_cursor)
+        )
+
+    @staticmethod
+    def get_statistics(
+        db: Session, date_from: date, date_to: date, office_id: Optional[int] = None, user_id: Optional[int] = None
+    ) -> AttendanceStatisticsResponse:
+        """ Totals + per-month breakdown; archived months never touch Postgres """
+        if date_from > date_to:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must be before date_to")
+        return compute_statistics(db, date_from, date_to, office_id, user_id)
+
+    @staticmethod
+    def export_records(filters: AttendanceRecordFilters, export_format: str) -> StreamingResponse:
+        """ Streamed CSV / XLSX: first bytes leave before the query finishes """
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        if export_format == "csv":
+            body, media_type = stream_csv(filters), "text/csv; charset=utf-8"
+        else:
+            body, media_type = stream_xlsx_export(filters), XLSX_MEDIA_TYPE
+
+        return StreamingResponse(
+            body,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="attendance_history_{stamp}.{export_format}"'}
+        )
+
+    @staticmethod
+    def _ndjson_record(row) -> dict:
+        """Same shape as AttendanceRecordItem"""
+        return {
+            "id": row.id,
+            "user_id": row.user_id,
+            "staff_name": row.staff_name or "N/A",
+            "office_id": row.office_id,
+            "office_name": row.office_name or "N/A",
+            "log_date": row.log_date,
+            "check_in": row.check_in,
+            "check_out": row.check_out,
+            "status": row.status,
+            "minutes_late": row.minutes_late or 0,
+            "work_hours": float(row.work_hours) if row.work_hours is not None else None,
+            "stop_count": row.stop_count or 0,
+            "reasons": row.reasons,
+            "created_at": row.created_at
+        }
+
+    @staticmethod
+    def stream_records(filters: AttendanceRecordFilters) -> StreamingResponse:
+        """
+            Whole filtered history as NDJSON, newest first.
+            Reasons and stop_count come from the same statement (json_agg per row, a LATERAL count
+            per user) so the cursor never pauses for side queries.
+        """
+        def build_query(db: Session):
+            reasons = select(
+                func.coalesce(
+                    func.json_agg(aggregate_order_by(
+                        func.json_build_object(
+                            "id", AttendanceReason.id,
+                            "reason_type", AttendanceReason.reason_type,
+                            "reason", AttendanceReason.reason
+                        ),
+                        AttendanceReason.id
+                    )),
+                    literal_column("'[]'::json")
+                )
+            ).where(
+                AttendanceReason.attendance_id == Attendance.id
+            ).correlate(Attendance).scalar_subquery()
+
+            # Counted per row's user (LATERAL, memoized per user_id by the planner), never for the
+            # whole table up front: the first line leaves as soon as the first row is read
+            checked_out = aliased(Attendance, name="checked_out")
+            stop_counts = select(
+                func.count(checked_out.id).label("stop_count")
+            ).where(
+                checked_out.user_id == Attendance.user_id,
+                checked_out.check_out.isnot(None)
+            ).correlate(Attendance).lateral("stop_counts")
+
+            query = build_record_query(
+                db, filters, reasons.label("reasons"), stop_counts.c.stop_count
+            ).outerjoin(stop_counts, true())
+            return newest_first(query)
+        return ndjson_response(build_query, AttendanceRecordService._ndjson_record)
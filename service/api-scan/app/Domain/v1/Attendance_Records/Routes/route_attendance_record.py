@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+
+from app.Shared.Infra.database import get_read_db
+from app.Shared.Infra.ndjson import NDJSON_MEDIA_TYPE, wants_ndjson
+from app.Shared.Core.responses import model_response
+from app.Domain.v1.Attendance_Records.Schemas.attendance_record_schema import (
+    AttendanceRecordFilters,
+    AttendanceRecordListResponse,
+    AttendanceStatisticsResponse
+)
+from app.Domain.v1.Attendance_Records.Controllers.attendance_record_controller import AttendanceRecordService
+
+router = APIRouter(prefix="/attendance-records", tags=["Attendance Records"])
+
+def get_record_filters(
+    user_id: Optional[int] = None,
+    office_id: Optional[int] = None,
+    date_from: Optional[date] = Query(None, description="First log_date (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="Last log_date (YYYY-MM-DD)"),
+    month: Optional[str] = Query(None, description="YYYY-MM, shorthand for date_from/date_to"),
+    status: Optional[str] = Query(None, description="present | late | absent"),
+    name: Optional[str] = Query(None, description="Staff full name contains")
+) -> AttendanceRecordFilters:
+    """ Query params shared by the list and the export """
+    if month and not (date_from or date_to):
+        date_from, date_to = AttendanceRecordService.month_range(month)
+    return AttendanceRecordFilters(
+        user_id=user_id,
+        office_id=office_id,
+        date_from=date_from,
+        date_to=date_to,
+        status=status,
+        name=name
+    )
+
+@router.get("", response_model=AttendanceRecordListResponse, responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}})
+def get_attendance_records(
+    request: Request,
+    filters: AttendanceRecordFilters = Depends(get_record_filters),
+    per_page: int = Query(15, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="pagination.next_cursor of the previous page"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Attendance history, newest first, keyset paginated
+
+    Query params:
+    - user_id, office_id, date_from, date_to (or month), status, name
+    - per_page, cursor
+
+    With `Accept: application/x-ndjson` the whole filtered history is streamed,
+    one record per line (per_page/cursor ignored)
+    """
+    if wants_ndjson(request):
+        return AttendanceRecordService.stream_records(filters)
+    return model_response(AttendanceRecordService.get_records(db, filters, per_page, cursor))
+
+@router.get("/statistics", response_model=AttendanceStatisticsResponse)
+def get_attendance_statistics(
+    date_from: Optional[date] = Query(None, description="First log_date (YYYY-MM-DD), default Jan 1 of date_to's year"),
+    date_to: Optional[date] = Query(None, description="Last log_date (YYYY-MM-DD), default today"),
+    office_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Lateness / attendance totals over a range, with a per-month breakdown
+
+    Closed months that were archived are answered from the memory-mapped column files
+    (`source: archive`), the others from Postgres (`source: database`)
+    """
+    date_to = date_to or date.today()
+    date_from = date_from or date(date_to.year, 1, 1)
+    return model_response(AttendanceRecordService.get_statistics(db, date_from, date_to, office_id, user_id))
+
+@router.get("/export")
+def export_attendance_records(
+    filters: AttendanceRecordFilters = Depends(get_record_filters),
+    export_format: str = Query("xlsx", alias="format", pattern="^(xlsx|csv)$")
+):
+    """ Streamed export of the filtered history (constant memory, starts immediately) """
+    return AttendanceRecordService.export_records(filters, export_format)
@@ -0,0 +1,65 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import date, time, datetime
+
+# Filters shared by the list and the export
+class AttendanceRecordFilters(BaseModel):
+    user_id: Optional[int] = None
+    office_id: Optional[int] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    status: Optional[str] = None
+    name: Optional[str] = Field(None, description="Staff full name contains")
+
+class AttendanceRecordReason(BaseModel):
+    id: int
+    reason_type: str
+    reason: str
+
+# One history row (same fields as the Laravel attendance-records resource, plus ids)
+class AttendanceRecordItem(BaseModel):
+    id: int
+    user_id: int
+    staff_name: str
+    office_id: Optional[int] = None
+    office_name: str
+    log_date: date
+    check_in: Optional[time] = None
+    check_out: Optional[time] = None
+    status: str
+    minutes_late: int = 0
+    work_hours: Optional[float] = None
+    stop_count: int = 0
+    reasons: List[AttendanceRecordReason] = []
+    created_at: Optional[datetime] = None
+
+class AttendanceRecordPagination(BaseModel):
+    per_page: int
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= for the next page; null on the last page")
+
+class AttendanceRecordListResponse(BaseModel):
+    status: str = "success"
+    data: List[AttendanceRecordItem]
+    pagination: AttendanceRecordPagination
+
+# Aggregates over a date range (archived months are read from the columnar archive)
+class AttendanceStatisticsTotals(BaseModel):
+    total: int = 0
+    present: int = 0
+    late: int = 0
+    absent: int = 0
+    checked_out: int = 0
+    late_rate: float = Field(0.0, description="late / (present + late), percent")
+    avg_minutes_late: float = Field(0.0, description="Average over late check-ins")
+    work_hours: float = 0.0
+
+class AttendanceStatisticsMonth(AttendanceStatisticsTotals):
+    month: str # YYYY-MM
+    source: str = Field(..., description="archive | database")
+
+class AttendanceStatisticsResponse(BaseModel):
+    status: str = "success"
+    date_from: date
+    date_to: date
+    totals: AttendanceStatisticsTotals
+    months: List[AttendanceStatisticsMonth]
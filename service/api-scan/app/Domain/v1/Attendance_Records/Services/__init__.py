@@ -0,0 +1,16 @@
+from app.Domain.v1.Attendance_Records.Services.record_query import build_record_query, newest_first
+from app.Domain.v1.Attendance_Records.Services.record_export import (
+    EXPORT_HEADINGS,
+    iter_export_rows,
+    stream_csv,
+    stream_xlsx_export
+)
+
+__all__ = [
+    "build_record_query",
+    "newest_first",
+    "EXPORT_HEADINGS",
+    "iter_export_rows",
+    "stream_csv",
+    "stream_xlsx_export",
+]
@@ -0,0 +1,257 @@
+"""
+    Columnar archive of closed attendance months on local disk.
+
+    One directory per month ({ATTENDANCE_ARCHIVE_DIR}/YYYY-MM/) with one .npy file per column and
+    a meta.json written last (a month without meta.json is not archived). Readers memory-map the
+    columns, so a multi-year report touches only the pages it needs and never Postgres.
+
+    A committed write into an archived month (backdated absence, late kiosk sync) leaves a
+    YYYY-MM.dirty marker next to the month: readers go back to Postgres for it until the next
+    export rebuilds the month and clears the marker.
+
+    Encoding (fixed width, nulls as sentinels):
+        id int64 | user_id int32 | office_id int32 (-1) | day int32 (days since 1970-01-01)
+        status uint8 (STATUS_CODES) | minutes_late int16 | work_hours float32 (NaN)
+        check_in / check_out int16 minute of day (-1)
+"""
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVE_VERSION = 1
+
+STATUS_CODES = {"present": 1, "late": 2, "absent": 3}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+COLUMNS = {
+    "id": np.int64,
+    "user_id": np.int32,
+    "office_id": np.int32,
+    "day": np.int32,
+    "status": np.uint8,
+    "minutes_late": np.int16,
+    "work_hours": np.float32,
+    "check_in": np.int16,
+    "check_out": np.int16,
+}
+
+# Rows fetched per server-side cursor round trip during export
+_EXPORT_FETCH_SIZE = 5000
+
+def day_number(day: date) -> int:
+    return day.toordinal() - _EPOCH_ORDINAL
+
+def month_key(month: date) -> str:
+    return f"{month.year:04d}-{month.month:02d}"
+
+def month_bounds(month: date) -> Tuple[date, date]:
+    first = month.replace(day=1)
+    next_month = date(first.year + (first.month == 12), first.month % 12 + 1, 1)
+    return first, next_month - timedelta(days=1)
+
+def months_between(date_from: date, date_to: date) -> List[date]:
+    months, month = [], date_from.replace(day=1)
+    while month <= date_to:
+        months.append(month)
+        month = date(month.year + (month.month == 12), month.month % 12 + 1, 1)
+    return months
+
+def is_closed_month(month: date, today: Optional[date] = None) -> bool:
+    """Closed = its last day is at least ATTENDANCE_ARCHIVE_CLOSED_AFTER_DAYS old (late corrections settle)"""
+    _, last_day = month_bounds(month)
+    return last_day <= (today or date.today()) - timedelta(days=settings.ATTENDANCE_ARCHIVE_CLOSED_AFTER_DAYS)
+
+def _month_dir(month: date) -> str:
+    return os.path.join(settings.ATTENDANCE_ARCHIVE_DIR, month_key(month))
+
+def _meta_path(month: date) -> str:
+    return os.path.join(_month_dir(month), "meta.json")
+
+def _dirty_path(month: date) -> str:
+    # Beside the month directory, so an export swapping the directory never drops it
+    return os.path.join(settings.ATTENDANCE_ARCHIVE_DIR, f"{month_key(month)}.dirty")
+
+def _minute_of_day(value) -> int:
+    return value.hour * 60 + value.minute if value is not None else -1
+
+# ==================== Export ====================
+
+def export_month(db: Session, month: date) -> Dict:
+    """
+        Write one month as column files (tmp dir + rename: readers never see a half-written month).
+        Returns the meta document.
+    """
+    started = time.time()
+    first, last = month_bounds(month)
+    query = db.query(
+        Attendance.id, Attendance.user_id, Attendance.office_id, Attendance.log_date, Attendance.status,
+        Attendance.minutes_late, Attendance.work_hours, Attendance.check_in, Attendance.check_out
+    ).filter(
+        Attendance.log_date >= first,
+        Attendance.log_date <= last
+    ).order_by(Attendance.log_date, Attendance.id)
+
+    values: Dict[str, list] = {name: [] for name in COLUMNS}
+    for row in query.yield_per(_EXPORT_FETCH_SIZE):
+        values["id"].append(row.id)
+        values["user_id"].append(row.user_id)
+        values["office_id"].append(row.office_id if row.office_id is not None else -1)
+        values["day"].append(day_number(row.log_date))
+        values["status"].append(STATUS_CODES.get(row.status, 0))
+        values["minutes_late"].append(row.minutes_late or 0)
+        values["work_hours"].append(float(row.work_hours) if row.work_hours is not None else np.nan)
+        values["check_in"].append(_minute_of_day(row.check_in))
+        values["check_out"].append(_minute_of_day(row.check_out))
+
+    final_dir = _month_dir(month)
+    tmp_dir = f"{final_dir}.tmp-{os.getpid()}-{time.monotonic_ns()}"
+    os.makedirs(tmp_dir)
+    try:
+        for name, dtype in COLUMNS.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.asarray(values[name], dtype=dtype))
+        meta = {
+            "version": ARCHIVE_VERSION,
+            "month": month_key(month),
+            "rows": len(values["id"]),
+            "status_codes": STATUS_CODES,
+            "built_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+        # Swap directories; mmaps of the previous build stay valid until their readers drop them
+        previous = None
+        if os.path.isdir(final_dir):
+            previous = f"{final_dir}.old-{time.monotonic_ns()}"
+            os.rename(final_dir, previous)
+        os.rename(tmp_dir, final_dir)
+        if previous:
+            shutil.rmtree(previous, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    _clear_dirty(month, started)
+    logger.info("attendance_month_archived", month=meta["month"], rows=meta["rows"])
+    return meta
+
+# ==================== Invalidation ====================
+
+def mark_dirty(months: Iterable[date]) -> None:
+    """Archived months that received a committed write: served from Postgres until re-exported"""
+    for month in months:
+        if not os.path.exists(_meta_path(month)):
+            continue
+        path = _dirty_path(month)
+        try:
+            with open(path, "a"):
+                pass
+            # A marker left by an earlier write must still look newer than a running export
+            os.utime(path)
+        except OSError as e:
+            logger.warning("attendance_month_dirty_mark_failed", month=month_key(month), error=str(e))
+            continue
+        logger.info("attendance_month_archive_dirty", month=month_key(month))
+
+def _clear_dirty(month: date, exported_since: float) -> None:
+    """Drop the marker unless a write landed after the export started reading"""
+    path = _dirty_path(month)
+    try:
+        if os.stat(path).st_mtime < exported_since:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def archive_closed_months(db: Session, today: Optional[date] = None, force: bool = False) -> List[str]:
+    """
+        Export every closed month not archived yet or marked dirty (all closed months with force);
+        returns YYYY-MM keys
+    """
+    oldest = db.query(func.min(Attendance.log_date)).scalar()
+    if oldest is None:
+        return []
+    archived = []
+    for month in months_between(oldest, today or date.today()):
+        if not is_closed_month(month, today):
+            break
+        if force or not is_archived(month):
+            export_month(db, month)
+            archived.append(month_key(month))
+    return archived
+
+# ==================== Read ====================
+
+@dataclass(frozen=True)
+class MonthColumns:
+    """Memory-mapped columns of one archived month"""
+    month: str
+    rows: int
+    columns: Dict[str, np.ndarray]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+@lru_cache(maxsize=128)
+def _load_month(key: str, built_at: str, rows: int) -> MonthColumns:
+    """Cached per build: a re-export changes built_at and therefore the cache key"""
+    directory = os.path.join(settings.ATTENDANCE_ARCHIVE_DIR, key)
+    # Zero-length arrays cannot be mapped
+    mmap_mode = "r" if rows else None
+    columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode) for name in COLUMNS}
+    return MonthColumns(month=key, rows=rows, columns=columns)
+
+def read_meta(month: date) -> Optional[Dict]:
+    """Meta of a usable build; None when the month is not archived or marked dirty"""
+    if os.path.exists(_dirty_path(month)):
+        return None
+    try:
+        with open(_meta_path(month)) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return meta if meta.get("version") == ARCHIVE_VERSION else None
+
+def load_month(month: date) -> Optional[MonthColumns]:
+    meta = read_meta(month)
+    if meta is None:
+        return None
+    return _load_month(meta["month"], meta["built_at"], meta["rows"])
+
+def is_archived(month: date) -> bool:
+    return read_meta(month) is not None
+
+def archived_months(months: List[date]) -> List[date]:
+    return [month for month in months if is_archived(month)]
+
+def select_rows(
+    columns: MonthColumns,
+    date_from: date,
+    date_to: date,
+    office_id: Optional[int] = None,
+    user_id: Optional[int] = None
+) -> np.ndarray:
+    """Boolean mask of rows in [date_from, date_to] matching the filters (vectorized)"""
+    day = columns["day"]
+    mask = (day >= day_number(date_from)) & (day <= day_number(date_to))
+    if office_id is not None:
+        mask &= columns["office_id"] == office_id
+    if user_id is not None:
+        mask &= columns["user_id"] == user_id
+    return mask
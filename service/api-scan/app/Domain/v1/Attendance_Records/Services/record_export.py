@@ -0,0 +1,95 @@
+import csv
+import io
+from typing import Iterator, Tuple
+
+from sqlalchemy import select, true
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Domain.v1.Attendances.Models.attendance_reason_model import AttendanceReason
+from app.Domain.v1.Attendance_Records.Schemas.attendance_record_schema import AttendanceRecordFilters
+from app.Domain.v1.Attendance_Records.Services.record_query import build_record_query, newest_first
+from app.Shared.Infra.database import ReadSessionLocal
+from app.Shared.Infra.streaming_xlsx import stream_xlsx
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Same columns as the Laravel AttendanceHistoryExport
+EXPORT_HEADINGS = [
+    "ID", "Staff Name", "Username", "Email", "Office", "Date", "Check In", "Check Out",
+    "Status", "Minutes Late", "Work Hours", "Reason Type", "Reason",
+]
+
+# Rows fetched per server-side cursor round trip
+EXPORT_FETCH_SIZE = 2000
+
+# CSV rows buffered per yielded chunk
+_CSV_ROWS_PER_CHUNK = 500
+
+def _export_row(row) -> Tuple:
+    return (
+        row.id,
+        row.staff_name or "N/A",
+        row.username or "N/A",
+        row.email or "N/A",
+        row.office_name or "N/A",
+        row.log_date.isoformat() if row.log_date else "",
+        row.check_in.strftime("%H:%M:%S") if row.check_in else "",
+        row.check_out.strftime("%H:%M:%S") if row.check_out else "",
+        row.status.replace("_", " ").capitalize() if row.status else "",
+        row.minutes_late or 0,
+        float(row.work_hours) if row.work_hours is not None else "",
+        row.reason_type or "",
+        row.reason or "",
+    )
+
+def iter_export_rows(filters: AttendanceRecordFilters) -> Iterator[Tuple]:
+    """
+        Server-side cursor (yield_per) over the filtered history, newest first.
+        Own session: the request's get_db session is closed before a streamed body runs.
+    """
+    db = ReadSessionLocal()
+    try:
+        # First reason per attendance via LATERAL (index on attendance_reasons.attendance_id)
+        first_reason = select(
+            AttendanceReason.reason_type, AttendanceReason.reason
+        ).where(
+            AttendanceReason.attendance_id == Attendance.id
+        ).order_by(
+            AttendanceReason.id
+        ).limit(1).lateral("first_reason")
+
+        query = build_record_query(
+            db, filters, first_reason.c.reason_type, first_reason.c.reason
+        ).outerjoin(first_reason, true())
+
+        exported = 0
+        for row in newest_first(query).yield_per(EXPORT_FETCH_SIZE):
+            exported += 1
+            yield _export_row(row)
+        logger.info("attendance_export_completed", rows=exported)
+    finally:
+        db.close()
+
+def stream_csv(filters: AttendanceRecordFilters) -> Iterator[bytes]:
+    """UTF-8 CSV with BOM (Excel opens it with the right encoding)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADINGS)
+    yield b"\xef\xbb\xbf" + buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+
+    pending = 0
+    for values in iter_export_rows(filters):
+        writer.writerow(values)
+        pending += 1
+        if pending >= _CSV_ROWS_PER_CHUNK:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode()
+
+def stream_xlsx_export(filters: AttendanceRecordFilters) -> Iterator[bytes]:
+    return stream_xlsx(EXPORT_HEADINGS, iter_export_rows(filters), sheet_name="Attendance History")
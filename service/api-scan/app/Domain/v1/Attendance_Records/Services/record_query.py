@@ -0,0 +1,55 @@
+from sqlalchemy.orm import Session, Query
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Domain.v1.Offices.Models.office_model import Office
+from app.Domain.v1.Users.Models.user_model import User
+from app.Domain.v1.Users.Models.staff_info_model import StaffInfo
+from app.Domain.v1.Attendance_Records.Schemas.attendance_record_schema import AttendanceRecordFilters
+
+def build_record_query(db: Session, filters: AttendanceRecordFilters, *extra_columns) -> Query:
+    """
+        Flat column query over attendances + staff / user / office (no ORM objects, no lazy loads).
+        Filters are sargable: log_date range instead of year()/month() so the log_date index is used.
+    """
+    query = db.query(
+        Attendance.id,
+        Attendance.user_id,
+        Attendance.office_id,
+        Attendance.log_date,
+        Attendance.check_in,
+        Attendance.check_out,
+        Attendance.status,
+        Attendance.minutes_late,
+        Attendance.work_hours,
+        Attendance.created_at,
+        StaffInfo.full_name.label("staff_name"),
+        User.username,
+        User.email,
+        Office.name.label("office_name"),
+        *extra_columns
+    ).outerjoin(
+        User, User.id == Attendance.user_id
+    ).outerjoin(
+        StaffInfo, StaffInfo.user_id == Attendance.user_id
+    ).outerjoin(
+        Office, Office.id == Attendance.office_id
+    )
+
+    if filters.user_id is not None:
+        query = query.filter(Attendance.user_id == filters.user_id)
+    if filters.office_id is not None:
+        query = query.filter(Attendance.office_id == filters.office_id)
+    if filters.date_from is not None:
+        query = query.filter(Attendance.log_date >= filters.date_from)
+    if filters.date_to is not None:
+        query = query.filter(Attendance.log_date <= filters.date_to)
+    if filters.status:
+        query = query.filter(Attendance.status == filters.status)
+    if filters.name:
+        query = query.filter(StaffInfo.full_name.ilike(f"%{filters.name}%"))
+
+    return query
+
+def newest_first(query: Query) -> Query:
+    """History order; (log_date, id) is unique so it doubles as the keyset"""
+    return query.order_by(Attendance.log_date.desc(), Attendance.id.desc())
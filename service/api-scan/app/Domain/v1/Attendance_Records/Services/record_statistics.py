@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Domain.v1.Attendance_Records.Schemas.attendance_record_schema import (
+    AttendanceStatisticsTotals,
+    AttendanceStatisticsMonth,
+    AttendanceStatisticsResponse
+)
+from app.Domain.v1.Attendance_Records.Services.columnar_archive import (
+    STATUS_CODES,
+    load_month,
+    month_bounds,
+    month_key,
+    months_between,
+    select_rows
+)
+
+@dataclass
+class _Sums:
+    """Additive per-month aggregates (archive and database parts merge by addition)"""
+    total: int = 0
+    present: int = 0
+    late: int = 0
+    absent: int = 0
+    checked_out: int = 0
+    late_minutes: int = 0
+    work_hours: float = 0.0
+
+    def add(self, other: "_Sums") -> None:
+        for name in self.__dataclass_fields__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def fields(self) -> Dict:
+        attended = self.present + self.late
+        return {
+            "total": self.total,
+            "present": self.present,
+            "late": self.late,
+            "absent": self.absent,
+            "checked_out": self.checked_out,
+            "late_rate": round(self.late / attended * 100, 2) if attended else 0.0,
+            "avg_minutes_late": round(self.late_minutes / self.late, 2) if self.late else 0.0,
+            "work_hours": round(self.work_hours, 2),
+        }
+
+def _archive_sums(columns, date_from: date, date_to: date, office_id: Optional[int], user_id: Optional[int]) -> _Sums:
+    """Vectorized over memory-mapped columns; only the pages of the masked columns are read"""
+    mask = select_rows(columns, date_from, date_to, office_id, user_id)
+    status = columns["status"][mask]
+    late_mask = status == STATUS_CODES["late"]
+    return _Sums(
+        total=int(status.size),
+        present=int(np.count_nonzero(status == STATUS_CODES["present"])),
+        late=int(np.count_nonzero(late_mask)),
+        absent=int(np.count_nonzero(status == STATUS_CODES["absent"])),
+        checked_out=int(np.count_nonzero(columns["check_out"][mask] >= 0)),
+        late_minutes=int(columns["minutes_late"][mask][late_mask].sum(dtype=np.int64)),
+        work_hours=float(np.nansum(columns["work_hours"][mask], dtype=np.float64)),
+    )
+
+def _database_sums(
+    db: Session, date_from: date, date_to: date, office_id: Optional[int], user_id: Optional[int]
+) -> Dict[str, _Sums]:
+    """One GROUP BY (month, status) for a run of non-archived months"""
+    month = func.to_char(Attendance.log_date, "YYYY-MM")
+    query = db.query(
+        month.label("month"),
+        Attendance.status,
+        func.count(Attendance.id).label("total"),
+        func.count(Attendance.check_out).label("checked_out"),
+        func.coalesce(func.sum(Attendance.minutes_late), 0).label("late_minutes"),
+        func.coalesce(func.sum(Attendance.work_hours), 0).label("work_hours")
+    ).filter(
+        Attendance.log_date >= date_from,
+        Attendance.log_date <= date_to
+    )
+    if office_id is not None:
+        query = query.filter(Attendance.office_id == office_id)
+    if user_id is not None:
+        query = query.filter(Attendance.user_id == user_id)
+
+    sums: Dict[str, _Sums] = {}
+    for row in query.group_by(month, Attendance.status):
+        part = _Sums(
+            total=row.total,
+            checked_out=row.checked_out,
+            late_minutes=int(row.late_minutes) if row.status == "late" else 0,
+            work_hours=float(row.work_hours)
+        )
+        if row.status in ("present", "late", "absent"):
+            setattr(part, row.status, row.total)
+        sums.setdefault(row.month, _Sums()).add(part)
+    return sums
+
+def compute_statistics(
+    db: Session, date_from: date, date_to: date, office_id: Optional[int] = None, user_id: Optional[int] = None
+) -> AttendanceStatisticsResponse:
+    """
+        Archived months come from the memory-mapped column files, the rest from Postgres
+        (one query per contiguous run of non-archived months, usually just the recent tail)
+    """
+    months = months_between(date_from, date_to)
+    per_month: Dict[str, _Sums] = {}
+    sources: Dict[str, str] = {}
+
+    pending: List[date] = []
+    def flush_pending():
+        if not pending:
+            return
+        run_from = max(date_from, month_bounds(pending[0])[0])
+        run_to = min(date_to, month_bounds(pending[-1])[1])
+        for key, sums in _database_sums(db, run_from, run_to, office_id, user_id).items():
+            per_month[key] = sums
+        for month in pending:
+            sources[month_key(month)] = "database"
+        pending.clear()
+
+    for month in months:
+        columns = load_month(month)
+        if columns is None:
+            pending.append(month)
+            continue
+        flush_pending()
+        per_month[month_key(month)] = _archive_sums(columns, date_from, date_to, office_id, user_id)
+        sources[month_key(month)] = "archive"
+    flush_pending()
+
+    totals = _Sums()
+    month_items = []
+    for month in months:
+        key = month_key(month)
+        sums = per_month.get(key, _Sums())
+        totals.add(sums)
+        month_items.append(AttendanceStatisticsMonth(month=key, source=sources[key], **sums.fields()))
+
+    return AttendanceStatisticsResponse(
+        date_from=date_from,
+        date_to=date_to,
+        totals=AttendanceStatisticsTotals(**totals.fields()),
+        months=month_items
+    )
@@ -0,0 +1,35 @@
+"""
+    Close a finished day by hand (same code and lock as the nightly Celery jobs):
+    auto-checkout open check-ins at shift end, then mark staff without attendance absent.
+    Safe to run any number of times.
+
+    Usage:
+        python -m app.Domain.v1.Attendances.Commands.close_attendance_day
+        python -m app.Domain.v1.Attendances.Commands.close_attendance_day --date 2026-10-16
+        python -m app.Domain.v1.Attendances.Commands.close_attendance_day --date 2026-10-16 --only auto_absent
+"""
+import argparse
+
+from app.Domain.v1.Attendances.Services import day_close_service
+from app.Domain.v1.Attendances.Tasks.attendance_tasks import closing_day, run_day_job
+
+JOBS = {
+    "auto_checkout": day_close_service.auto_checkout,
+    "auto_absent": day_close_service.auto_absent,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Auto-checkout and auto-absent for one day")
+    parser.add_argument("--date", help="Day to close (YYYY-MM-DD), default yesterday (Bangkok)")
+    parser.add_argument("--only", choices=sorted(JOBS), help="Run a single step")
+    args = parser.parse_args()
+
+    day = closing_day(args.date)
+    for name, job in JOBS.items():
+        if args.only and name != args.only:
+            continue
+        result = run_day_job(name, job, day)
+        print(f"{name} {day}: " + ("skipped (locked by another run)" if result["skipped"] else f"{result['rows']} rows"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+    Pre-create future attendances partitions and retire the ones past retention.
+    Safe to run any number of times (schedule it daily).
+
+    Usage:
+        python -m app.Domain.v1.Attendances.Commands.maintain_partitions
+        python -m app.Domain.v1.Attendances.Commands.maintain_partitions --date 2026-12-01
+"""
+import argparse
+from datetime import date, datetime
+
+from app.Domain.v1.Attendances.Services.partition_service import maintain_partitions
+
+def main():
+    parser = argparse.ArgumentParser(description="Create / retire monthly attendances partitions")
+    parser.add_argument("--date", help="Pretend today is this day (YYYY-MM-DD), default today")
+    args = parser.parse_args()
+
+    today = datetime.strptime(args.date, '%Y-%m-%d').date() if args.date else date.today()
+    result = maintain_partitions(today)
+    print(f"created: {', '.join(result['created']) or '-'}")
+    print(f"retired: {', '.join(result['retired']) or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,38 @@
 from sqlalchemy.orm import Session 
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.dialects.postgresql import insert
 from fastapi import HTTPException, status
-from typing import Optional
-from datetime import datetime, date, time as dt_time, timezone
+from typing import List, Optional, Sequence
+from datetime import datetime, date, timedelta, timezone
+from zoneinfo import ZoneInfo
 
 from app.Domain.v1.Attendances.Models.attendance_model import Attendance
 from app.Domain.v1.Attendances.Models.attendance_reason_model import AttendanceReason
-from app.Domain.v1.QR_codes.Models.qr_model import QRCode
 from app.Domain.v1.Offices.Models.office_model import Office
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+from app.Domain.v1.Dashboard.Services.counter_service import (
+    record_check_in,
+    record_check_out,
+    record_absence
+)
+from app.Domain.v1.Dashboard.Services.summary_service import apply_summary_delta, apply_summary_deltas
+from app.Domain.v1.Dashboard.Services.event_service import publish_attendance_event
+from app.Domain.v1.Attendances.Services.hot_queries import (
+    QR_TOKEN_LOOKUP,
+    OFFICE_BY_ID,
+    ATTENDANCE_FOR_DAY,
+    ATTENDANCE_EXISTS_FOR_DAY
+)
+from app.Domain.v1.QR_codes.Services.signed_token import (
+    SignedTokenError,
+    signed_tokens_enabled,
+    is_signed_token,
+    verify_signed_token
+)
+from app.Domain.v1.Attendances.Services import check_in_rules
+from app.Domain.v1.Attendances.Services.kiosk_sync import APPLIED, sync_scans
+from app.Domain.v1.Attendances.Services.day_close_service import AUTO_ABSENT_REASON_TYPE
 
 from app.Domain.v1.Attendances.Schemas.attendance_schema import (
     CheckInRequest,
@@ -19,25 +45,46 @@ from app.Domain.v1.Attendances.Schemas.attendance_schema import (
     QRValidationResponse,
     OfficeInfo,
     PermissionRequest,
-    PermissionResponse
+    PermissionResponse,
+    BulkPermissionRequest,
+    BulkPermissionResponse,
+    KioskSyncRequest,
+    KioskSyncResponse,
+    KioskScanResult
 )
 
+logger = get_logger(__name__)
+
 class AttendanceService:
     """ Service layer for attendance bussiness logic """
     # Help Methods
 
     @staticmethod
-    def _get_qr_code_or_404(db: Session, qr_token: str) -> QRCode:
-        """  Get QR code by token or raise 404 """
-        qr_code = db.query(QRCode).filter(QRCode.qr_token == qr_token).first()
+    def _get_qr_code_or_404(db: Session, qr_token: str):
+        """  (office_id, is_active) of a QR token or raise 404 """
+        qr_code = db.execute(QR_TOKEN_LOOKUP, {"qr_token": qr_token}).first()
         if not qr_code:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"QR code with token '{qr_token}' not found")
         return qr_code
 
+    @staticmethod
+    def _resolve_office_id(db: Session, qr_token: str) -> int:
+        """ Office behind a scanned token: HMAC check for signed tokens, qr_codes lookup otherwise """
+        if signed_tokens_enabled() and is_signed_token(qr_token):
+            try:
+                return verify_signed_token(qr_token)
+            except SignedTokenError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        qr_code = AttendanceService._get_qr_code_or_404(db, qr_token)
+        if not qr_code.is_active:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="QR code is inactive")
+        return qr_code.office_id
+
     @staticmethod
     def _get_office_or_404(db: Session, office_id: int) -> Office:
         """Get office by ID or raise 404"""
-        office = db.query(Office).filter(Office.id == office_id).first()
+        office = db.execute(OFFICE_BY_ID, {"office_id": office_id}).scalars().first()
         if not office:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -46,40 +93,97 @@ class AttendanceService:
         return office
     
     @staticmethod
-    def _calculate_minutes_late(check_in: dt_time, shift_start: dt_time) -> int:
-        """Calculate how many minutes late the user is"""
-        # convert time to minutes since midnight
-        check_in_minutes = check_in.hour * 60 + check_in.minute
-        shift_start_minutes = shift_start.hour * 60 + shift_start.minute
-
-        # Calculate difference
-        late_minutes = check_in_minutes - shift_start_minutes
-        return max(0, late_minutes)
-    
+    def _office_info(office: Optional[Office]) -> Optional[OfficeInfo]:
+        """ OfficeInfo straight from the ORM row (trusted DB values: no re-validation) """
+        if office is None:
+            return None
+        return OfficeInfo.model_construct(id=office.id, name=office.name, public_ip=office.public_ip)
+
     @staticmethod
-    def _determine_status(minutes_late: int) -> str:
-        """Determine attendance status based on minutes late"""
-        if minutes_late == 0:
-            return "present"
-        else:
-            return "late"
-    
+    def _reason_response(reason: AttendanceReason) -> AttendanceReasonResponse:
+        return AttendanceReasonResponse.model_construct(
+            id=reason.id,
+            attendance_id=reason.attendance_id,
+            reason_type=reason.reason_type,
+            reason=reason.reason,
+            created_at=reason.created_at,
+            updated_at=reason.updated_at
+        )
+
+    @staticmethod
+    def _attendance_response(
+        attendance: Attendance, office: Optional[Office] = None, reasons: Sequence[AttendanceReason] = ()
+    ) -> AttendanceResponse:
+        """
+            AttendanceResponse straight from the ORM row.
+            model_construct skips validation; routes send it with model_response so it is encoded once by orjson.
+        """
+        return AttendanceResponse.model_construct(
+            id=attendance.id,
+            user_id=attendance.user_id,
+            office_id=attendance.office_id,
+            log_date=attendance.log_date,
+            check_in=attendance.check_in,
+            check_out=attendance.check_out,
+            status=attendance.status,
+            minutes_late=attendance.minutes_late,
+            work_hours=float(attendance.work_hours) if attendance.work_hours is not None else None,
+            created_at=attendance.created_at,
+            updated_at=attendance.updated_at,
+            office=AttendanceService._office_info(office),
+            attendance_reasons=[AttendanceService._reason_response(reason) for reason in reasons]
+        )
+
+    @staticmethod
+    def _ip_rejection_detail(rejection: str, office: Office, client_ip: Optional[str]) -> str:
+        if rejection == check_in_rules.NO_CLIENT_IP:
+            return "Unable to determine your IP address. Check-in requires IP validation. Please ensure you are connected to the network."
+        if rejection == check_in_rules.INTERNAL_IP:
+            # The client should send its public IP in the request body when behind Docker / a LAN
+            return f"Unable to validate IP address. Server detected internal network IP ({client_ip}) instead of your public IP. Expected Office IP: {office.public_ip}"
+        return f"IP address mismatch. You must be at {office.name} to check in. Your IP: {client_ip}, Expected Office IP: {office.public_ip}"
+
+    @staticmethod
+    def _attendance_for_day(db: Session, user_id: int, log_date: date) -> Optional[Attendance]:
+        return db.execute(ATTENDANCE_FOR_DAY, {"user_id": user_id, "log_date": log_date}).scalars().first()
+
+    @staticmethod
+    def _has_attendance_for_day(db: Session, user_id: int, log_date: date) -> bool:
+        return db.execute(ATTENDANCE_EXISTS_FOR_DAY, {"user_id": user_id, "log_date": log_date}).first() is not None
+
+    @staticmethod
+    def _auto_absent_marked():
+        """True for an attendance row written by the day-close job (a permission request may replace it)"""
+        return exists().where(
+            AttendanceReason.attendance_id == Attendance.id,
+            AttendanceReason.reason_type == AUTO_ABSENT_REASON_TYPE
+        )
+
+    @staticmethod
+    def _remove_auto_absent_marks(db: Session, attendance_ids: Sequence[int]) -> None:
+        db.execute(delete(AttendanceReason).where(
+            AttendanceReason.attendance_id.in_(attendance_ids),
+            AttendanceReason.reason_type == AUTO_ABSENT_REASON_TYPE
+        ))
+
     @staticmethod
     def validate_qr_code(db: Session, request: QRValidationRequest) -> QRValidationResponse:
         """ Validate QR code and return office info """
         try:
-            qr_code = AttendanceService._get_qr_code_or_404(db, request.qr_token)
-
-            # Check if QR code is active
-            if not qr_code.is_active:
+            try:
+                office_id = AttendanceService._resolve_office_id(db, request.qr_token)
+            except HTTPException as e:
+                if e.status_code != status.HTTP_400_BAD_REQUEST:
+                    raise
+                # Inactive / expired / forged codes are a validation result, not an error
                 return QRValidationResponse(
                     valid=False,
-                    message="QR code is inactive",
+                    message=e.detail,
                     office=None
                 )
             
             # Get office information
-            office = AttendanceService._get_office_or_404(db, qr_code.office_id)
+            office = AttendanceService._get_office_or_404(db, office_id)
 
             # SECURITY: Validate client IP matches office IP (STRICT MODE)
             # This prevents staff from validating QR codes remotely
@@ -127,11 +231,7 @@ class AttendanceService:
             return QRValidationResponse(
                 valid=True,
                 message="QR code is valid",
-                office=OfficeInfo(
-                    id=office.id,
-                    name=office.name,
-                    public_ip=office.public_ip
-                )
+                office=AttendanceService._office_info(office)
             )
         except HTTPException:
             raise
@@ -144,62 +244,24 @@ class AttendanceService:
         """ Handle user check-in with IP validation """
         try:
             # 1. Validate QR Code
-            qr_code = AttendanceService._get_qr_code_or_404(db, request.qr_token)
-
-            if not qr_code.is_active:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="QR code is inactive")
+            office_id = AttendanceService._resolve_office_id(db, request.qr_token)
 
             # 2. Get office information
-            office = AttendanceService._get_office_or_404(db, qr_code.office_id)
+            office = AttendanceService._get_office_or_404(db, office_id)
 
             # 2.5. SECURITY: Validate client IP matches office IP (STRICT MODE)
             # This prevents staff from checking in remotely using screenshots of QR codes
-            if office.public_ip:
-                print(f"DEBUG: Office {office.name} has public_ip: {office.public_ip}")
-                print(f"DEBUG: Client IP extracted: {client_ip}")
-                
-                # ALWAYS require client_ip when office.public_ip is configured
-                if not client_ip:
-                    print(f"DEBUG: Check-in FAILED - No client IP extracted")
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="Unable to determine your IP address. Check-in requires IP validation. Please ensure you are connected to the network."
-                    )
-
-                # STRICT VALIDATION: Always require IP match when office.public_ip is set
-                # Use client-provided IP (from frontend) if available, otherwise use server-extracted IP
-                # This allows validation to work even when accessing through local network
-                is_docker_ip = client_ip.startswith(("172.", "10.", "192.168.", "127.", "localhost"))
-                print(f"DEBUG: Is Docker/internal IP: {is_docker_ip}")
-
-                if is_docker_ip:
-                    # Docker/internal IP detected - this means server couldn't extract public IP
-                    # Client should provide their public IP in the request body
-                    # If we still see Docker IP, validation fails (client didn't provide public IP)
-                    print(f"DEBUG: Check-in FAILED - Docker/internal IP detected: {client_ip}. Client should provide public IP in request. Expected Office IP: {office.public_ip}")
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail=f"Unable to validate IP address. Server detected internal network IP ({client_ip}) instead of your public IP. Expected Office IP: {office.public_ip}"
-                    )
-                
-                # Public IP detected (either from client or server) - strict comparison required
-                if client_ip != office.public_ip:
-                    print(f"DEBUG: Check-in FAILED - IP mismatch: {client_ip} != {office.public_ip}")
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail=f"IP address mismatch. You must be at {office.name} to check in. Your IP: {client_ip}, Expected Office IP: {office.public_ip}"
-                    )
-                else:
-                    print(f"DEBUG: Check-in PASSED - IP matches: {client_ip} == {office.public_ip}")
+            ip_rejection = check_in_rules.ip_rejection(office, client_ip)
+            if ip_rejection is not None:
+                logger.info("check_in_ip_rejected", office_id=office.id, client_ip=client_ip, reason=ip_rejection)
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=AttendanceService._ip_rejection_detail(ip_rejection, office, client_ip)
+                )
 
             # 3. Check if user already checked in today
             today = date.today()
-            existing_attendance = db.query(Attendance).filter(
-                Attendance.user_id == user_id,
-                Attendance.log_date == today
-            ).first()
-
-            if existing_attendance:
+            if AttendanceService._has_attendance_for_day(db, user_id, today):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="You have already checked in today"
@@ -207,17 +269,12 @@ class AttendanceService:
             
             # 4. Get current time and calculate if late
             # Use Asia/Bangkok timezone (UTC+7) instead of UTC
-            from zoneinfo import ZoneInfo
             bangkok_tz = ZoneInfo("Asia/Bangkok")
             now = datetime.now(bangkok_tz)
             check_in_time = now.time()
 
-            minute_late = AttendanceService._calculate_minutes_late(
-                check_in_time,
-                office.shift_start
-            )
-
-            attendance_status = AttendanceService._determine_status(minute_late)
+            minute_late = check_in_rules.minutes_late(check_in_time, office.shift_start)
+            attendance_status = check_in_rules.attendance_status(minute_late)
 
             # 5 Create attendance recoard
             attendance = Attendance(
@@ -232,31 +289,24 @@ class AttendanceService:
             )
 
             db.add(attendance)
+            apply_summary_delta(
+                db, today, office.id,
+                total_count=1,
+                present_count=1 if attendance_status == "present" else 0,
+                late_count=1 if attendance_status == "late" else 0,
+                late_minutes=minute_late
+            )
             db.commit()
             db.refresh(attendance)
 
+            # 5.5 Update live dashboard counters and notify live dashboards
+            record_check_in(today, office.id, attendance_status)
+            publish_attendance_event("check_in", today, office.id, user_id, attendance_status)
+
             # 6. Format response
-            return CheckInResponse(
+            return CheckInResponse.model_construct(
                 message="Check-in successful" if minute_late == 0 else f"Checked in {minute_late} minutes late",
-                attendance=AttendanceResponse(
-                    id=attendance.id,
-                    user_id=attendance.user_id,
-                    office_id=attendance.office_id,
-                    log_date=attendance.log_date,
-                    check_in=attendance.check_in,
-                    check_out=attendance.check_out,
-                    status=attendance.status,
-                    minutes_late=attendance.minutes_late,
-                    work_hours=attendance.work_hours,
-                    created_at=attendance.created_at,
-                    updated_at=attendance.updated_at,
-                    office=OfficeInfo(
-                        id=office.id,
-                        name=office.name,
-                        public_ip=office.public_ip
-                    ),
-                    attendance_reasons=[]
-                ),
+                attendance=AttendanceService._attendance_response(attendance, office),
                 is_late=minute_late > 0,
                 minutes_late=minute_late
             )
@@ -275,10 +325,7 @@ class AttendanceService:
         try:
             # 1. Get today's attendance
             today = date.today()
-            attendance = db.query(Attendance).filter(
-                Attendance.user_id == user_id,
-                Attendance.log_date == today
-            ).first()
+            attendance = AttendanceService._attendance_for_day(db, user_id, today)
 
             if not attendance:
                 raise HTTPException(
@@ -297,7 +344,6 @@ class AttendanceService:
             office = AttendanceService._get_office_or_404(db, attendance.office_id)
 
             # 4. Get current time
-            from zoneinfo import ZoneInfo
             bangkok_tz = ZoneInfo("Asia/Bangkok")
             now = datetime.now(bangkok_tz)
             check_out_time = now.time()
@@ -330,31 +376,22 @@ class AttendanceService:
                 )
                 db.add(reason_record)
 
+            apply_summary_delta(
+                db, today, attendance.office_id,
+                checked_out_count=1,
+                work_hours=work_hours
+            )
             db.commit()
             db.refresh(attendance)
 
+            # 8.5 Update live dashboard counters and notify live dashboards
+            record_check_out(today, attendance.office_id)
+            publish_attendance_event("check_out", today, attendance.office_id, user_id, attendance.status)
+
             # 9. Format response
-            return CheckOutResponse(
+            return CheckOutResponse.model_construct(
                 message="Check-out successful" if not is_early_leave else f"Early check-out recorded. Work hours: {work_hours}",
-                attendance=AttendanceResponse(
-                    id=attendance.id,
-                    user_id=attendance.user_id,
-                    office_id=attendance.office_id,
-                    log_date=attendance.log_date,
-                    check_in=attendance.check_in,
-                    check_out=attendance.check_out,
-                    status=attendance.status,
-                    minutes_late=attendance.minutes_late,
-                    work_hours=attendance.work_hours,
-                    created_at=attendance.created_at,
-                    updated_at=attendance.updated_at,
-                    office=OfficeInfo(
-                        id=office.id,
-                        name=office.name,
-                        public_ip=office.public_ip
-                    ),
-                    attendance_reasons=[]
-                ),
+                attendance=AttendanceService._attendance_response(attendance, office),
                 work_hours=work_hours,
                 is_early_leave=is_early_leave
             )
@@ -374,10 +411,7 @@ class AttendanceService:
         try:
             # Get today's attendance
             today = date.today()
-            attendance = db.query(Attendance).filter(
-                Attendance.user_id == user_id,
-                Attendance.log_date == today
-            ).first()
+            attendance = AttendanceService._attendance_for_day(db, user_id, today)
 
             if not attendance:
                 raise HTTPException(
@@ -389,25 +423,7 @@ class AttendanceService:
             office = AttendanceService._get_office_or_404(db, attendance.office_id)
 
             # Format response
-            return AttendanceResponse(
-                id=attendance.id,
-                user_id=attendance.user_id,
-                office_id=attendance.office_id,
-                log_date=attendance.log_date,
-                check_in=attendance.check_in,
-                check_out=attendance.check_out,
-                status=attendance.status,
-                minutes_late=attendance.minutes_late,
-                work_hours=attendance.work_hours,
-                created_at=attendance.created_at,
-                updated_at=attendance.updated_at,
-                office=OfficeInfo(
-                    id=office.id,
-                    name=office.name,
-                    public_ip=office.public_ip
-                ),
-                attendance_reasons=[]
-            )
+            return AttendanceService._attendance_response(attendance, office)
 
         except HTTPException:
             raise
@@ -425,7 +441,6 @@ class AttendanceService:
         """
 
         try:
-            from zoneinfo import ZoneInfo
             phnom_penh_tz = ZoneInfo("Asia/Phnom_Penh")
             now = datetime.now(phnom_penh_tz)
 
@@ -433,33 +448,41 @@ class AttendanceService:
             request_date = datetime.strptime(request.date, '%Y-%m-%d').date()
 
             # Check if request date is today or in the post
-            existing = db.query(Attendance).filter(
-                Attendance.user_id == user_id,
-                Attendance.log_date == request_date
+            existing = db.execute(
+                select(Attendance, AttendanceService._auto_absent_marked()).where(
+                    Attendance.user_id == user_id,
+                    Attendance.log_date == request_date
+                ).limit(1)
             ).first()
-
-            if existing:
+            if existing is not None and not existing[1]:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Attendance record already exists for {request.date}" 
                 )
-            
-            # Create attendance record
-            attendance = Attendance(
-                user_id=user_id,
-                office_id=None,  # No office for absence
-                log_date=request_date,
-                check_in=None,   # No check-in for absence
-                check_out=None,
-                status='absent',
-                minutes_late=0,
-                work_hours=None,
-                created_at=now,
-                updated_at=now
-            )
 
-            db.add(attendance)
-            db.flush() # Get attendance id withiout commiting
+            if existing is None:
+                # Create attendance record
+                attendance = Attendance(
+                    user_id=user_id,
+                    office_id=None,  # No office for absence
+                    log_date=request_date,
+                    check_in=None,   # No check-in for absence
+                    check_out=None,
+                    status='absent',
+                    minutes_late=0,
+                    work_hours=None,
+                    created_at=now,
+                    updated_at=now
+                )
+
+                db.add(attendance)
+                db.flush() # Get attendance id withiout commiting
+            else:
+                # Marked absent by the day-close job: the day stays absent (summary unchanged),
+                # the requested reason replaces the automatic one
+                attendance = existing[0]
+                AttendanceService._remove_auto_absent_marks(db, [attendance.id])
+                attendance.updated_at = now
 
             # Create attendance reason record
             attendance_reason = AttendanceReason(
@@ -471,44 +494,22 @@ class AttendanceService:
             )
 
             db.add(attendance_reason)
+            if existing is None:
+                apply_summary_delta(db, request_date, None, total_count=1, absent_count=1)
             db.commit()
             db.refresh(attendance)
             db.refresh(attendance_reason)
 
-            # Build Reponse
-            attendance_response = AttendanceResponse(
-                id=attendance.id,
-                user_id=attendance.user_id,
-                office_id=attendance.office_id,
-                log_date=attendance.log_date,
-                check_in=attendance.check_in,
-                check_out=attendance.check_out,
-                status=attendance.status,
-                minutes_late=attendance.minutes_late,
-                work_hours=attendance.work_hours,
-                created_at=attendance.created_at,
-                updated_at=attendance.updated_at,
-                office=None,
-                attendance_reasons=[AttendanceReasonResponse(
-                    id=attendance_reason.id,
-                    attendance_id=attendance_reason.attendance_id,
-                    reason_type=attendance_reason.reason_type,
-                    reason=attendance_reason.reason,
-                    created_at=attendance_reason.created_at,
-                    updated_at=attendance_reason.updated_at
-                )]
-            )
+            # Update live dashboard counters and notify live dashboards
+            if existing is None:
+                record_absence(request_date)
+                publish_attendance_event("absence", request_date, None, user_id, "absent")
 
-            reason_response = AttendanceReasonResponse(
-                id=attendance_reason.id,
-                attendance_id=attendance_reason.attendance_id,
-                reason_type=attendance_reason.reason_type,
-                reason=attendance_reason.reason,
-                created_at=attendance_reason.created_at,
-                updated_at=attendance_reason.updated_at
-            )
+            # Build Reponse
+            attendance_response = AttendanceService._attendance_response(attendance, reasons=[attendance_reason])
+            reason_response = attendance_response.attendance_reasons[0]
             
-            return PermissionResponse(
+            return PermissionResponse.model_construct(
                 message=f"Absence request submitted for {request.date}",
                 attendance=attendance_response,
                 attendance_reason=reason_response
@@ -524,6 +525,195 @@ class AttendanceService:
                 detail=f"Failed to create permission request: {str(e)}"
             )
 
+    @staticmethod
+    def _permission_dates(request: BulkPermissionRequest) -> List[date]:
+        """ Requested days from dates or start_date / end_date, sorted and de-duplicated """
+        if request.dates:
+            if request.start_date or request.end_date:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Send either dates or start_date / end_date, not both"
+                )
+            days = set(request.dates)
+        elif request.start_date and request.end_date:
+            if request.end_date < request.start_date:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="end_date cannot be before start_date"
+                )
+            span = (request.end_date - request.start_date).days + 1
+            if span > settings.PERMISSION_MAX_DAYS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"An absence request covers at most {settings.PERMISSION_MAX_DAYS} days"
+                )
+            days = {
+                request.start_date + timedelta(days=offset) for offset in range(span)
+                if request.include_weekends or (request.start_date + timedelta(days=offset)).weekday() < 5
+            }
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide dates, or both start_date and end_date"
+            )
+
+        if not days:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The requested range contains no working days"
+            )
+        if len(days) > settings.PERMISSION_MAX_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"An absence request covers at most {settings.PERMISSION_MAX_DAYS} days"
+            )
+        return sorted(days)
+
+    @staticmethod
+    def create_bulk_permission_request(db: Session, user_id: int, request: BulkPermissionRequest) -> BulkPermissionResponse:
+        """
+            Absence for several days in one transaction
+            One existence query, then multi-row INSERT ... RETURNING for attendances and their reasons
+            Days that already have an attendance are skipped, not errors, except days the
+            day-close job marked absent: those keep their row and get the requested reason
+        """
+        requested = AttendanceService._permission_dates(request)
+
+        try:
+            now = datetime.now(ZoneInfo("Asia/Phnom_Penh"))
+
+            # 1. Existing rows for the whole set (log_date IN prunes to the months involved)
+            existing = db.execute(
+                select(Attendance.id, Attendance.log_date, AttendanceService._auto_absent_marked()).where(
+                    Attendance.user_id == user_id,
+                    Attendance.log_date.in_(requested)
+                )
+            ).all()
+            existing_dates = {row.log_date for row in existing}
+            new_dates = [day for day in requested if day not in existing_dates]
+            auto_absent = [row for row in existing if row[2]]
+
+            attendances: List[Attendance] = []
+            reasons_by_attendance = {}
+            if new_dates:
+                # 2. Attendance rows; a day taken by a concurrent request is skipped by ON CONFLICT
+                attendances = db.scalars(
+                    insert(Attendance).values([
+                        {
+                            "user_id": user_id,
+                            "office_id": None,  # No office for absence
+                            "log_date": day,
+                            "check_in": None,
+                            "check_out": None,
+                            "status": "absent",
+                            "minutes_late": 0,
+                            "work_hours": None,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for day in new_dates
+                    ]).on_conflict_do_nothing(
+                        index_elements=[Attendance.user_id, Attendance.log_date]
+                    ).returning(Attendance)
+                ).all()
+            inserted_dates = {attendance.log_date for attendance in attendances}
+
+            if auto_absent:
+                # Days marked absent by the day-close job: same row (summary unchanged), new reason
+                AttendanceService._remove_auto_absent_marks(db, [row.id for row in auto_absent])
+                attendances += db.scalars(
+                    update(Attendance).where(
+                        Attendance.id.in_([row.id for row in auto_absent]),
+                        Attendance.log_date.in_([row.log_date for row in auto_absent])
+                    ).values(updated_at=now).returning(Attendance),
+                    execution_options={"synchronize_session": False}
+                ).all()
+
+            if attendances:
+                # 3. One reason row per created attendance
+                reasons = db.scalars(
+                    insert(AttendanceReason).values([
+                        {
+                            "attendance_id": attendance.id,
+                            "reason_type": request.reason_type,
+                            "reason": request.reason,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for attendance in attendances
+                    ]).returning(AttendanceReason)
+                ).all()
+                reasons_by_attendance = {reason.attendance_id: reason for reason in reasons}
+
+                apply_summary_deltas(db, {
+                    (day, None): {"total_count": 1, "absent_count": 1}
+                    for day in inserted_dates
+                })
+
+            # Build the response from RETURNING values before commit expires them
+            attendances.sort(key=lambda attendance: attendance.log_date)
+            created = [
+                AttendanceService._attendance_response(attendance, reasons=[reasons_by_attendance[attendance.id]])
+                for attendance in attendances
+            ]
+            created_dates = {attendance.log_date for attendance in attendances}
+            skipped = [day for day in requested if day not in created_dates]
+            db.commit()
+
+            # Update live dashboard counters and notify live dashboards (new rows only)
+            # (dates taken before commit: reading the expired rows would reload each one)
+            for day in sorted(inserted_dates):
+                record_absence(day)
+                publish_attendance_event("absence", day, None, user_id, "absent")
+
+            return BulkPermissionResponse.model_construct(
+                message=f"Absence request submitted for {len(created)} day(s)"
+                    + (f", {len(skipped)} already recorded" if skipped else ""),
+                attendances=created,
+                skipped_dates=skipped
+            )
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            db.rollback()
+            logger.error("bulk_permission_request_failed", user_id=user_id, error=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create permission request: {str(e)}"
+            )
 
+    @staticmethod
+    def sync_kiosk_batch(db: Session, device_id: str, request: KioskSyncRequest) -> KioskSyncResponse:
+        """
+            Apply scans queued by an offline kiosk (see Services/kiosk_sync.py)
+            One transaction for the whole batch; per-scan problems are outcomes, not errors
+        """
+        if len(request.scans) > settings.KIOSK_SYNC_MAX_SCANS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A sync batch holds at most {settings.KIOSK_SYNC_MAX_SCANS} scans"
+            )
 
+        try:
+            outcomes = sync_scans(db, device_id, request.scans)
+
+            results = [KioskScanResult.model_construct(**vars(outcome)) for outcome in outcomes]
+            duplicates = sum(1 for result in results if result.duplicate)
+            applied = sum(1 for result in results if result.status == APPLIED and not result.duplicate)
+            return KioskSyncResponse.model_construct(
+                device_id=device_id,
+                applied=applied,
+                rejected=len(results) - applied - duplicates,
+                duplicates=duplicates,
+                results=results
+            )
 
+        except HTTPException:
+            raise
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to sync kiosk scans: {str(e)}"
+            )
@@ -1,4 +1,5 @@
 from app.Domain.v1.Attendances.Models.attendance_model import Attendance
 from app.Domain.v1.Attendances.Models.attendance_reason_model import AttendanceReason
+from app.Domain.v1.Attendances.Models.kiosk_scan_model import KioskScan
 
-__all__ = ["Attendance", "AttendanceReason"]
\ No newline at end of file
+__all__ = ["Attendance", "AttendanceReason", "KioskScan"]
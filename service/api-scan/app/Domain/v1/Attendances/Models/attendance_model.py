@@ -6,6 +6,11 @@ from app.Shared.Infra.database import Base
 class Attendance(Base):
     """Model for attendance - matches existing attendances table"""
     __tablename__ = "attendances"
+    # Monthly RANGE partitions on log_date (migrations 0002, Shared/Infra/partitioning.py).
+    # The database key is (id, log_date) and so is the ORM identity (__mapper_args__ below): the
+    # UPDATE of a flush and refresh() filter on log_date too, so Postgres prunes to one partition.
+    # Filters on log_date (=, BETWEEN, >=/<=) let Postgres prune to the matching month(s).
+    __table_args__ = {"postgresql_partition_by": "RANGE (log_date)"}
 
     id = Column(Integer, primary_key=True, index=True)
     # Part of composite index
@@ -22,5 +27,7 @@ class Attendance(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __mapper_args__ = {"primary_key": [id, log_date]}
+
     # Relationships
     attendance_reasons = relationship("AttendanceReason", back_populates='attendance', cascade='all, delete-orphan')
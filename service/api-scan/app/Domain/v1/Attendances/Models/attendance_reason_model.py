@@ -9,6 +9,7 @@ class AttendanceReason(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     # Has index: attendance_reasons_attendance_id_index
+    # ORM-only FK since attendances is partitioned (no database constraint, see migration 0002)
     attendance_id = Column(Integer, ForeignKey('attendances.id', ondelete='CASCADE'), nullable=False, index=True)
     # Has index: attendance_reasons_type_index
     reason_type = Column(String, nullable=False, index=True)
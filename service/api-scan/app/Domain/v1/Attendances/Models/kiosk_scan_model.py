@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.Shared.Infra.database import Base
+
+class KioskScan(Base):
+    """Ledger of synced offline kiosk scans - kiosk_scans table (migration 0003)"""
+    __tablename__ = "kiosk_scans"
+
+    # Client-generated scan id, unique per device: a re-sent scan is answered from this row
+    device_id = Column(String(64), primary_key=True)
+    scan_id = Column(String(64), primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    action = Column(String(16), nullable=False)  # check_in, check_out
+    scanned_at = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String(16), nullable=False)  # pending (inside the sync transaction), applied, rejected
+    reason = Column(Text, nullable=True)
+    # No database FK: attendances is partitioned (see migration 0002)
+    attendance_id = Column(Integer, nullable=True)
+    attendance_status = Column(String, nullable=True)
+    # Has index: kiosk_scans_created_at_index (retention purge)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
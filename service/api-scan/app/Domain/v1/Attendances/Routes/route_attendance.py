@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, status, Request, HTTPException
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import httpx
 
 from app.Shared.Infra.database import get_db
+from app.Shared.Core.responses import model_response
 from app.Domain.v1.Attendances.Controllers.attendance_controller import AttendanceService
+from app.Domain.v1.Attendances.Services.kiosk_sync import kiosk_signature_valid
 from app.Domain.v1.Attendances.Schemas.attendance_schema import (
     CheckInRequest,
     CheckInResponse,
@@ -15,7 +19,11 @@ from app.Domain.v1.Attendances.Schemas.attendance_schema import (
     PublicIpResponse,
     AttendanceResponse,
     PermissionResponse,
-    PermissionRequest
+    PermissionRequest,
+    BulkPermissionRequest,
+    BulkPermissionResponse,
+    KioskSyncRequest,
+    KioskSyncResponse
 )
 
 router = APIRouter(tags=["Attendance"])
@@ -137,7 +145,7 @@ def validate_qr_code(
             detail="Cannot determine your IP address. Please ensure you are connected to the internet."
         )
     
-    return AttendanceService.validate_qr_code(db, request)
+    return model_response(AttendanceService.validate_qr_code(db, request))
 
 @router.post("/check-in", response_model=CheckInResponse, status_code=status.HTTP_201_CREATED)
 def check_in(
@@ -192,7 +200,10 @@ def check_in(
         )
     
     # Pass client IP to service for validation
-    return AttendanceService.check_in(db, user_id, request, client_ip=client_ip)
+    return model_response(
+        AttendanceService.check_in(db, user_id, request, client_ip=client_ip),
+        status_code=status.HTTP_201_CREATED
+    )
 
 # ==================== Check-Out ====================
 
@@ -227,7 +238,7 @@ def check_out(
             detail="Invalid user ID format"
         )
     
-    return AttendanceService.check_out(db, user_id, request)
+    return model_response(AttendanceService.check_out(db, user_id, request))
 
 @router.post("/permission-request", response_model=PermissionResponse, status_code=status.HTTP_201_CREATED)
 def submit_permission_request(
@@ -260,7 +271,45 @@ def submit_permission_request(
         )
     
     # Call service to create permission request
-    return AttendanceService.create_permission_request(db, user_id, request)
+    return model_response(
+        AttendanceService.create_permission_request(db, user_id, request),
+        status_code=status.HTTP_201_CREATED
+    )
+
+@router.post("/permission-request/bulk", response_model=BulkPermissionResponse, status_code=status.HTTP_201_CREATED)
+def submit_bulk_permission_request(
+    request: BulkPermissionRequest,
+    http_request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+        Submit absence for several days at once
+        _ Either a list of dates or start_date / end_date (weekends skipped unless include_weekends)
+        _ Days that already have an attendance record are returned in skipped_dates
+        _ Requires auth ( user_id from header )
+    """
+
+    # Extract user_id from API Gateway header
+    user_id = http_request.headers.get("X-User-ID")
+
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not authenticated. X-User-ID header missing."
+        )
+
+    try:
+        user_id = int(user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid user ID format"
+        )
+
+    return model_response(
+        AttendanceService.create_bulk_permission_request(db, user_id, request),
+        status_code=status.HTTP_201_CREATED
+    )
 
 #  Get Attendance  For Staff after Login
 @router.get("/today-attendance", response_model=AttendanceResponse, status_code=status.HTTP_200_OK)
@@ -292,4 +341,47 @@ def get_today_attendance(
             detail="Invalid user ID format"
         )
     
-    return AttendanceService.get_today_attendance(db, user_id)
+    return model_response(AttendanceService.get_today_attendance(db, user_id))
+
+# ==================== Offline Kiosk Sync ====================
+
+async def signed_kiosk_batch(http_request: Request) -> Tuple[str, KioskSyncRequest]:
+    """
+        Verify X-Kiosk-Signature over the raw body before parsing it.
+        The device key is the authority here: scans carry their own user_id.
+    """
+    device_id = http_request.headers.get("X-Kiosk-Id", "").strip()
+    signature = http_request.headers.get("X-Kiosk-Signature", "")
+    if not device_id or not signature:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Kiosk not authenticated. X-Kiosk-Id and X-Kiosk-Signature headers are required."
+        )
+
+    body = await http_request.body()
+    if not kiosk_signature_valid(device_id, body, signature):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid kiosk signature"
+        )
+
+    try:
+        return device_id, KioskSyncRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+@router.post("/kiosk/sync", response_model=KioskSyncResponse, status_code=status.HTTP_200_OK)
+def sync_kiosk_scans(
+    batch: Tuple[str, KioskSyncRequest] = Depends(signed_kiosk_batch),
+    db: Session = Depends(get_db)
+):
+    """
+    Sync scans queued by a kiosk while it was offline
+
+    - Batch is signed with the kiosk's device key (X-Kiosk-Id / X-Kiosk-Signature)
+    - Each scan is validated like a live check-in / check-out and applied at its recorded time
+    - Whole batch is written in one transaction
+    - Returns one outcome per scan; a scan_id synced before returns its stored outcome
+    """
+    device_id, request = batch
+    return model_response(AttendanceService.sync_kiosk_batch(db, device_id, request))
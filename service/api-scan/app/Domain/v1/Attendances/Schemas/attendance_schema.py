@@ -140,3 +140,91 @@ class PermissionResponse(BaseModel):
     message: str
     attendance: AttendanceResponse
     attendance_reason: AttendanceReasonResponse
+
+# Bulk Permission Request (several days of absence in one call)
+class BulkPermissionRequest(BaseModel):
+    dates: Optional[list[date]] = Field(None, description="Dates of absence (alternative to start_date / end_date)")
+    start_date: Optional[date] = Field(None, description="First day of absence (YYYY-MM-DD)")
+    end_date: Optional[date] = Field(None, description="Last day of absence, inclusive (YYYY-MM-DD)")
+    include_weekends: bool = Field(False, description="Also request Saturdays and Sundays in a start/end range")
+    reason_type: str = Field(..., description="Type: absent")
+    reason: str = Field(..., min_length=10, max_length=500, description="Detailed reason for absence")
+
+    @validator('dates')
+    def validate_dates(cls, v):
+        if v is not None and any(day < date.today() for day in v):
+            raise ValueError('Dates cannot be in the past')
+        return v
+
+    @validator('start_date')
+    def validate_start_date(cls, v):
+        if v is not None and v < date.today():
+            raise ValueError('start_date cannot be in the past')
+        return v
+
+    @validator('reason_type')
+    def validate_reason_type(cls, v):
+        if v != 'absent':
+            raise ValueError('reason_type must be "absent"')
+        return v
+
+    @validator('reason')
+    def validate_reason(cls, v):
+        if not v or len(v.strip()) < 10:
+            raise ValueError('Reason must be at least 10 characters')
+        return v.strip()
+
+# Bulk Permission Response
+class BulkPermissionResponse(BaseModel):
+    message: str
+    attendances: list[AttendanceResponse]
+    skipped_dates: list[date]  # an attendance already existed
+
+# Offline kiosk batch sync: one queued scan
+class KioskScanItem(BaseModel):
+    scan_id: str = Field(..., min_length=1, max_length=64, description="Client-generated id, unique per kiosk")
+    user_id: int
+    qr_token: str = Field(..., description="QR code token scanned at the kiosk")
+    scanned_at: datetime = Field(..., description="Device time of the scan, with timezone offset")
+    client_ip: Optional[str] = Field(None, description="Public IP of the kiosk when the scan was taken")
+    action: str = Field("check_in", description="check_in or check_out")
+
+    @validator('qr_token')
+    def validate_qr_token(cls, v):
+        if not v or len(v.strip()) == 0:
+            raise ValueError('qr_token is required')
+        return v.strip()
+
+    @validator('scanned_at')
+    def validate_scanned_at(cls, v):
+        if v.tzinfo is None:
+            raise ValueError('scanned_at must include a timezone offset')
+        return v
+
+    @validator('action')
+    def validate_action(cls, v):
+        if v not in ('check_in', 'check_out'):
+            raise ValueError('action must be "check_in" or "check_out"')
+        return v
+
+# Kiosk Sync Request
+class KioskSyncRequest(BaseModel):
+    scans: list[KioskScanItem] = Field(..., min_length=1)
+
+# Outcome of one scan
+class KioskScanResult(BaseModel):
+    scan_id: str
+    action: str
+    status: str  # applied, rejected
+    duplicate: bool = False  # outcome of an earlier sync of the same scan_id
+    reason: Optional[str] = None
+    attendance_id: Optional[int] = None
+    attendance_status: Optional[str] = None
+
+# Kiosk Sync Response
+class KioskSyncResponse(BaseModel):
+    device_id: str
+    applied: int
+    rejected: int
+    duplicates: int
+    results: list[KioskScanResult]
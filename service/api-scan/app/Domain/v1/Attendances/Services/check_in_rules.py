@@ -0,0 +1,42 @@
+"""
+    Check-in rules shared by live check-in (AttendanceService.check_in) and offline kiosk sync
+    (kiosk_sync.py): lateness against the office shift and the strict office IP check.
+    Callers word the rejection for their audience (HTTP detail vs. per-scan reason).
+"""
+from datetime import time as dt_time
+from typing import Optional
+
+from app.Domain.v1.Offices.Models.office_model import Office
+
+PRESENT = "present"
+LATE = "late"
+
+# IP rejections
+NO_CLIENT_IP = "no_client_ip"
+INTERNAL_IP = "internal_ip"
+IP_MISMATCH = "ip_mismatch"
+
+# Docker / private networks: the server saw a hop, not the device's public IP
+INTERNAL_IP_PREFIXES = ("172.", "10.", "192.168.", "127.", "localhost")
+
+def minutes_late(check_in: dt_time, shift_start: dt_time) -> int:
+    """Whole minutes after shift start (seconds ignored), 0 when on time"""
+    return max(0, (check_in.hour * 60 + check_in.minute) - (shift_start.hour * 60 + shift_start.minute))
+
+def attendance_status(late: int) -> str:
+    return PRESENT if late == 0 else LATE
+
+def ip_rejection(office: Office, client_ip: Optional[str]) -> Optional[str]:
+    """
+        Strict mode: an office with public_ip configured only accepts check-ins from that IP
+        (stops remote check-ins with a screenshot of the QR code). None when accepted.
+    """
+    if not office.public_ip:
+        return None
+    if not client_ip:
+        return NO_CLIENT_IP
+    if client_ip.startswith(INTERNAL_IP_PREFIXES):
+        return INTERNAL_IP
+    if client_ip != office.public_ip:
+        return IP_MISMATCH
+    return None
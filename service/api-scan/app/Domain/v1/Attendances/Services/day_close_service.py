@@ -0,0 +1,168 @@
+"""
+    Closing a finished day, set-based (one statement per step, whatever the headcount):
+
+    - auto-checkout: attendances still open (check_in, no check_out) are closed at their office's
+      shift_end with computed work_hours in one UPDATE ... FROM offices, plus one multi-row
+      INSERT of "auto_check_out" reasons so the audit trail tells them apart from real scans
+    - auto-absent: every staff member (staff_info, joined by that day) with no attendance row gets
+      an "absent" row at their office in one INSERT ... SELECT, plus an "auto_absent" reason per
+      row; a later permission request for that day replaces the reason instead of being refused
+
+    Both are idempotent (re-running finds nothing left to do) and write the summary rollup in the
+    same transaction. Live counters of the day are rebuilt afterwards; no per-user dashboard
+    events are published for a past day.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Numeric, cast, exists, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Domain.v1.Attendances.Models.attendance_reason_model import AttendanceReason
+from app.Domain.v1.Dashboard.Services.counter_service import rebuild_counters
+from app.Domain.v1.Dashboard.Services.summary_service import apply_summary_deltas
+from app.Domain.v1.Offices.Models.office_model import Office
+from app.Domain.v1.Users.Models.staff_info_model import StaffInfo
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+AUTO_CHECK_OUT_REASON = "Checked out automatically at shift end (no check-out scan)"
+AUTO_ABSENT_REASON_TYPE = "auto_absent"
+AUTO_ABSENT_REASON = "Marked absent automatically at day close (no attendance recorded)"
+
+def is_working_day(day: date) -> bool:
+    weekdays = {int(part) for part in settings.AUTO_ABSENT_WEEKDAYS.split(",") if part.strip()}
+    return day.weekday() in weekdays
+
+def _refresh_counters(db: Session, day: date) -> None:
+    """Live counters follow SQL after a bulk change; a Redis outage is repaired by the next read"""
+    try:
+        rebuild_counters(db, day)
+    except Exception as e:
+        logger.warning("dashboard_counters_rebuild_failed", day=str(day), error=str(e))
+
+def auto_checkout(db: Session, day: date) -> int:
+    """Close the day's open check-ins at shift end; returns the number of rows closed. Commits."""
+    attendances = Attendance.__table__
+    offices = Office.__table__
+    # A check-in after shift end closes at its own time (0 hours) rather than before it
+    closed_at = func.greatest(offices.c.shift_end, attendances.c.check_in)
+    work_hours = func.round(cast(func.extract("epoch", closed_at - attendances.c.check_in) / 3600, Numeric), 2)
+    now = datetime.now(timezone.utc)
+
+    try:
+        closed = db.execute(
+            update(attendances).where(
+                attendances.c.office_id == offices.c.id,
+                attendances.c.log_date == day,
+                attendances.c.check_in.is_not(None),
+                attendances.c.check_out.is_(None)
+            ).values(
+                check_out=closed_at,
+                work_hours=work_hours,
+                updated_at=now
+            ).returning(attendances.c.id, attendances.c.office_id, attendances.c.work_hours)
+        ).all()
+
+        if closed:
+            db.execute(insert(AttendanceReason).values([
+                {
+                    "attendance_id": row.id,
+                    "reason_type": "auto_check_out",
+                    "reason": AUTO_CHECK_OUT_REASON,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for row in closed
+            ]))
+
+            deltas: Dict[Tuple[date, Optional[int]], Dict[str, float]] = defaultdict(lambda: defaultdict(int))
+            for row in closed:
+                deltas[(day, row.office_id)]["checked_out_count"] += 1
+                deltas[(day, row.office_id)]["work_hours"] += row.work_hours or 0
+            apply_summary_deltas(db, deltas)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if closed:
+        _refresh_counters(db, day)
+    logger.info("attendance_auto_checkout", day=str(day), closed=len(closed))
+    return len(closed)
+
+def auto_absent(db: Session, day: date) -> int:
+    """Insert "absent" for staff with no attendance on a working day; returns rows inserted. Commits."""
+    if not is_working_day(day):
+        logger.info("attendance_auto_absent_skipped", day=str(day), reason="not a working day")
+        return 0
+
+    # One office per user (latest profile row if staff_info holds several)
+    staff = select(
+        StaffInfo.user_id, StaffInfo.office_id
+    ).distinct(
+        StaffInfo.user_id
+    ).where(
+        or_(StaffInfo.join_date.is_(None), StaffInfo.join_date <= day)
+    ).order_by(
+        StaffInfo.user_id, StaffInfo.id.desc()
+    ).subquery()
+
+    now = datetime.now(timezone.utc)
+    missing = select(
+        staff.c.user_id,
+        staff.c.office_id,
+        literal(day),
+        literal("absent"),
+        literal(0),
+        literal(now),
+        literal(now)
+    ).where(
+        ~exists().where(
+            Attendance.user_id == staff.c.user_id,
+            Attendance.log_date == day
+        )
+    )
+
+    try:
+        inserted = db.execute(
+            insert(Attendance.__table__).from_select(
+                ["user_id", "office_id", "log_date", "status", "minutes_late", "created_at", "updated_at"],
+                missing
+            ).on_conflict_do_nothing(
+                # A late check-in racing the job keeps its row
+                index_elements=["user_id", "log_date"]
+            ).returning(Attendance.__table__.c.id, Attendance.__table__.c.office_id)
+        ).all()
+
+        if inserted:
+            db.execute(insert(AttendanceReason).values([
+                {
+                    "attendance_id": row.id,
+                    "reason_type": AUTO_ABSENT_REASON_TYPE,
+                    "reason": AUTO_ABSENT_REASON,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for row in inserted
+            ]))
+
+            deltas: Dict[Tuple[date, Optional[int]], Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+            for row in inserted:
+                deltas[(day, row.office_id)]["total_count"] += 1
+                deltas[(day, row.office_id)]["absent_count"] += 1
+            apply_summary_deltas(db, deltas)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if inserted:
+        _refresh_counters(db, day)
+    logger.info("attendance_auto_absent", day=str(day), inserted=len(inserted))
+    return len(inserted)
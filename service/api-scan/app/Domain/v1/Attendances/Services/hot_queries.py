@@ -0,0 +1,33 @@
+"""
+    Pre-built statements for the check-in / check-out hot path.
+
+    Built once at import with bound parameters: SQLAlchemy finds the compiled SQL in its
+    statement cache without rebuilding an ORM Query per call, and the SQL text is identical on
+    every execution, so psycopg prepares it server-side on each pooled connection after
+    DB_PREPARE_THRESHOLD runs (see Shared/Infra/database.py). Execute with db.execute(STMT, params).
+"""
+from sqlalchemy import bindparam, select
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Domain.v1.Offices.Models.office_model import Office
+from app.Domain.v1.QR_codes.Models.qr_model import QRCode
+
+# Scanned token -> (office_id, is_active); covered by qr_codes_active_token_index
+QR_TOKEN_LOOKUP = select(
+    QRCode.office_id, QRCode.is_active
+).where(
+    QRCode.qr_token == bindparam("qr_token")
+).limit(1)
+
+OFFICE_BY_ID = select(Office).where(Office.id == bindparam("office_id")).limit(1)
+
+# The user's row for one day (unique on user_id, log_date)
+ATTENDANCE_FOR_DAY = select(Attendance).where(
+    Attendance.user_id == bindparam("user_id"),
+    Attendance.log_date == bindparam("log_date")
+).limit(1)
+
+ATTENDANCE_EXISTS_FOR_DAY = select(Attendance.id).where(
+    Attendance.user_id == bindparam("user_id"),
+    Attendance.log_date == bindparam("log_date")
+).limit(1)
@@ -0,0 +1,494 @@
+"""
+    Offline kiosk batch sync.
+
+    A kiosk that lost its uplink queues scans (client-generated scan_id, user, QR token, device
+    timestamp, client IP) and posts them as one batch signed with its device key: X-Kiosk-Id plus
+    X-Kiosk-Signature, the hex HMAC-SHA256 of the raw body under that device's KIOSK_SYNC_KEYS secret.
+
+    The batch is validated as a set: one query each for the scan ids already synced, users, QR
+    tokens, offices and existing attendances, and every token / office is looked up once however
+    many scans carry it. Signed QR tokens are verified against the scan time. Scans are applied in
+    scanned_at order with their recorded time: check-ins as one multi-row INSERT, check-outs as one
+    UPDATE ... FROM (VALUES ...), in a single transaction with the summary rollup and the
+    kiosk_scans ledger. A scan id already in the ledger gets its stored outcome back.
+"""
+import hashlib
+import hmac
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Date, DateTime, Integer, Numeric, Time, column, delete, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Domain.v1.Attendances.Models.kiosk_scan_model import KioskScan
+from app.Domain.v1.Attendances.Schemas.attendance_schema import KioskScanItem
+from app.Domain.v1.Attendances.Services import check_in_rules
+from app.Domain.v1.Dashboard.Services.counter_service import apply_deltas
+from app.Domain.v1.Dashboard.Services.event_service import publish_attendance_event
+from app.Domain.v1.Dashboard.Services.summary_service import apply_summary_deltas
+from app.Domain.v1.Offices.Models.office_model import Office
+from app.Domain.v1.QR_codes.Models.qr_model import QRCode
+from app.Domain.v1.QR_codes.Services.signed_token import (
+    SignedTokenError,
+    is_signed_token,
+    parse_key_list,
+    signed_tokens_enabled,
+    verify_signed_token
+)
+from app.Domain.v1.Users.Models.user_model import User
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CHECK_IN = "check_in"
+CHECK_OUT = "check_out"
+
+APPLIED = "applied"
+REJECTED = "rejected"
+PENDING = "pending"
+
+# Attendance times are Bangkok wall-clock (same as live check-in / check-out)
+LOCAL_TZ = ZoneInfo("Asia/Bangkok")
+
+# Device secrets live in memory only; loaded once per process
+_DEVICE_KEYS: Dict[str, bytes] = parse_key_list(settings.KIOSK_SYNC_KEYS)
+
+def kiosk_signature_valid(device_id: str, body: bytes, signature: str) -> bool:
+    """X-Kiosk-Signature = hex HMAC-SHA256(device secret, raw body)"""
+    key = _DEVICE_KEYS.get(device_id)
+    if key is None:
+        return False
+    expected = hmac.new(key, body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
+@dataclass
+class ScanOutcome:
+    scan_id: str
+    action: str
+    status: str = REJECTED
+    duplicate: bool = False
+    reason: Optional[str] = None
+    attendance_id: Optional[int] = None
+    attendance_status: Optional[str] = None
+
+@dataclass
+class _DayRow:
+    """One (user, day) attendance as the batch sees it: existing row or pending insert"""
+    office_id: Optional[int]
+    check_in: Optional[dt_time]
+    status: str
+    attendance_id: Optional[int] = None
+    check_out: Optional[dt_time] = None
+    work_hours: Optional[float] = None
+    minutes_late: int = 0
+    created_at: Optional[datetime] = None
+    check_in_scan: Optional[str] = None
+    check_out_scan: Optional[str] = None
+
+def _work_hours(day: date, check_in: dt_time, check_out: dt_time) -> float:
+    return round((datetime.combine(day, check_out) - datetime.combine(day, check_in)).total_seconds() / 3600, 2)
+
+def _ip_rejection(office: Office, client_ip: Optional[str]) -> Optional[str]:
+    """Live check-in's office IP rule (check_in_rules.ip_rejection), worded for the scan"""
+    rejection = check_in_rules.ip_rejection(office, client_ip)
+    if rejection == check_in_rules.NO_CLIENT_IP:
+        return "Scan has no client IP; this office requires IP validation"
+    if rejection == check_in_rules.INTERNAL_IP:
+        return f"Scan recorded an internal network IP ({client_ip}) instead of the public IP"
+    if rejection == check_in_rules.IP_MISMATCH:
+        return f"IP address mismatch: scanned from {client_ip}, {office.name} expects {office.public_ip}"
+    return None
+
+# ==================== Ledger ====================
+
+def _claim_scans(db: Session, device_id: str, scans: Sequence[KioskScanItem]) -> Set[str]:
+    """
+        Insert ledger rows as pending; returns the scan ids this batch owns.
+        A concurrent sync of the same ids blocks on the key until the other transaction ends.
+    """
+    stmt = insert(KioskScan).values([
+        {
+            "device_id": device_id,
+            "scan_id": scan.scan_id,
+            "user_id": scan.user_id,
+            "action": scan.action,
+            "scanned_at": scan.scanned_at,
+            "status": PENDING,
+        }
+        for scan in scans
+    ]).on_conflict_do_nothing(
+        index_elements=[KioskScan.device_id, KioskScan.scan_id]
+    ).returning(KioskScan.scan_id)
+    return set(db.execute(stmt).scalars())
+
+def _stored_outcomes(db: Session, device_id: str, scan_ids: Sequence[str]) -> Dict[str, ScanOutcome]:
+    if not scan_ids:
+        return {}
+    rows = db.execute(
+        select(
+            KioskScan.scan_id, KioskScan.action, KioskScan.status, KioskScan.reason,
+            KioskScan.attendance_id, KioskScan.attendance_status
+        ).where(
+            KioskScan.device_id == device_id,
+            KioskScan.scan_id.in_(scan_ids)
+        )
+    ).all()
+    return {
+        row.scan_id: ScanOutcome(
+            scan_id=row.scan_id,
+            action=row.action,
+            status=row.status,
+            duplicate=True,
+            reason=row.reason,
+            attendance_id=row.attendance_id,
+            attendance_status=row.attendance_status
+        )
+        for row in rows
+    }
+
+def _record_outcomes(db: Session, device_id: str, outcomes: Sequence[ScanOutcome]) -> None:
+    """ORM bulk UPDATE by primary key (one executemany)"""
+    db.execute(update(KioskScan), [
+        {
+            "device_id": device_id,
+            "scan_id": outcome.scan_id,
+            "status": outcome.status,
+            "reason": outcome.reason,
+            "attendance_id": outcome.attendance_id,
+            "attendance_status": outcome.attendance_status,
+        }
+        for outcome in outcomes
+    ])
+
+# ==================== Set lookups ====================
+
+def _known_users(db: Session, user_ids: Set[int]) -> Set[int]:
+    return set(db.execute(select(User.id).where(User.id.in_(user_ids))).scalars())
+
+def _token_offices(db: Session, scans: Sequence[KioskScanItem]) -> Dict[str, Tuple[Optional[int], Optional[str]]]:
+    """
+        Plain token -> (office_id, rejection) in one qr_codes query.
+        Signed tokens are checked per scan (their validity depends on the scan time).
+    """
+    plain = {
+        scan.qr_token for scan in scans
+        if not (signed_tokens_enabled() and is_signed_token(scan.qr_token))
+    }
+    if not plain:
+        return {}
+    found = {
+        row.qr_token: row
+        for row in db.execute(
+            select(QRCode.qr_token, QRCode.office_id, QRCode.is_active).where(QRCode.qr_token.in_(plain))
+        )
+    }
+    resolved = {}
+    for token in plain:
+        row = found.get(token)
+        if row is None:
+            resolved[token] = (None, f"QR code with token '{token}' not found")
+        elif not row.is_active:
+            resolved[token] = (None, "QR code is inactive")
+        else:
+            resolved[token] = (row.office_id, None)
+    return resolved
+
+def _resolve_office_id(
+    scan: KioskScanItem, token_offices: Dict[str, Tuple[Optional[int], Optional[str]]]
+) -> Tuple[Optional[int], Optional[str]]:
+    if scan.qr_token in token_offices:
+        return token_offices[scan.qr_token]
+    try:
+        # The code on the kiosk screen was current when the scan was taken, not now
+        return verify_signed_token(scan.qr_token, now=scan.scanned_at.timestamp()), None
+    except SignedTokenError as e:
+        return None, str(e)
+
+def _offices(db: Session, office_ids: Set[int]) -> Dict[int, Office]:
+    if not office_ids:
+        return {}
+    return {office.id: office for office in db.execute(select(Office).where(Office.id.in_(office_ids))).scalars()}
+
+def _existing_days(db: Session, keys: Set[Tuple[int, date]]) -> Dict[Tuple[int, date], _DayRow]:
+    if not keys:
+        return {}
+    days = [day for _, day in keys]
+    rows = db.execute(
+        select(
+            Attendance.id, Attendance.user_id, Attendance.log_date, Attendance.office_id,
+            Attendance.check_in, Attendance.check_out, Attendance.status
+        ).where(
+            # log_date bounds let Postgres prune to the batch's month partitions
+            Attendance.log_date.between(min(days), max(days)),
+            tuple_(Attendance.user_id, Attendance.log_date).in_(list(keys))
+        )
+    ).all()
+    return {
+        (row.user_id, row.log_date): _DayRow(
+            office_id=row.office_id,
+            check_in=row.check_in,
+            status=row.status,
+            attendance_id=row.id,
+            check_out=row.check_out
+        )
+        for row in rows
+    }
+
+# ==================== Writes ====================
+
+def _insert_check_ins(
+    db: Session, pending: Dict[Tuple[int, date], _DayRow], now: datetime
+) -> Dict[Tuple[int, date], int]:
+    """One multi-row INSERT; rows lost to a concurrent live check-in are simply not returned"""
+    if not pending:
+        return {}
+    stmt = insert(Attendance).values([
+        {
+            "user_id": user_id,
+            "office_id": row.office_id,
+            "log_date": day,
+            "check_in": row.check_in,
+            "check_out": row.check_out,
+            "status": row.status,
+            "minutes_late": row.minutes_late,
+            "work_hours": row.work_hours,
+            "created_at": row.created_at,
+            "updated_at": now,
+        }
+        for (user_id, day), row in pending.items()
+    ]).on_conflict_do_nothing(
+        index_elements=[Attendance.user_id, Attendance.log_date]
+    ).returning(Attendance.id, Attendance.user_id, Attendance.log_date)
+    return {(row.user_id, row.log_date): row.id for row in db.execute(stmt)}
+
+def _update_check_outs(
+    db: Session, check_outs: Dict[Tuple[int, date], _DayRow], now: datetime
+) -> Set[int]:
+    """One UPDATE ... FROM (VALUES ...); rows checked out concurrently are not returned"""
+    if not check_outs:
+        return set()
+    batch = values(
+        column("id", Integer),
+        column("log_date", Date),
+        column("check_out", Time),
+        column("work_hours", Numeric(4, 2)),
+        column("updated_at", DateTime(timezone=True)),
+        name="check_outs"
+    ).data([
+        (row.attendance_id, day, row.check_out, row.work_hours, now)
+        for (_, day), row in check_outs.items()
+    ])
+    attendances = Attendance.__table__
+    stmt = update(attendances).where(
+        attendances.c.id == batch.c.id,
+        attendances.c.log_date == batch.c.log_date,
+        attendances.c.check_out.is_(None)
+    ).values(
+        check_out=batch.c.check_out,
+        work_hours=batch.c.work_hours,
+        updated_at=batch.c.updated_at
+    ).returning(attendances.c.id)
+    return set(db.execute(stmt).scalars())
+
+# ==================== Batch ====================
+
+def sync_scans(db: Session, device_id: str, scans: Sequence[KioskScanItem]) -> List[ScanOutcome]:
+    """
+        Apply one kiosk batch; returns one outcome per submitted scan, in request order.
+        Caller handles rollback on error (nothing is committed before the final commit).
+    """
+    now = datetime.now(timezone.utc)
+
+    # A scan id repeated inside the batch is a duplicate of its first occurrence
+    unique: Dict[str, KioskScanItem] = {}
+    for scan in scans:
+        unique.setdefault(scan.scan_id, scan)
+
+    claimed = _claim_scans(db, device_id, list(unique.values()))
+    outcomes: Dict[str, ScanOutcome] = _stored_outcomes(db, device_id, [s for s in unique if s not in claimed])
+    fresh = [scan for scan in unique.values() if scan.scan_id in claimed]
+    for scan in fresh:
+        outcomes[scan.scan_id] = ScanOutcome(scan_id=scan.scan_id, action=scan.action)
+
+    # 1. Per-scan checks against set lookups
+    oldest = now - timedelta(hours=settings.KIOSK_SYNC_MAX_AGE_HOURS)
+    newest = now + timedelta(seconds=settings.KIOSK_SYNC_MAX_CLOCK_SKEW)
+    users = _known_users(db, {scan.user_id for scan in fresh}) if fresh else set()
+    token_offices = _token_offices(db, fresh)
+
+    candidates: List[Tuple[KioskScanItem, int]] = []
+    for scan in fresh:
+        outcome = outcomes[scan.scan_id]
+        if scan.scanned_at < oldest:
+            outcome.reason = f"Scan is older than {settings.KIOSK_SYNC_MAX_AGE_HOURS} hours"
+        elif scan.scanned_at > newest:
+            outcome.reason = "Scan time is in the future (check the kiosk clock)"
+        elif scan.user_id not in users:
+            outcome.reason = f"User {scan.user_id} not found"
+        else:
+            office_id, outcome.reason = _resolve_office_id(scan, token_offices)
+            if office_id is not None:
+                candidates.append((scan, office_id))
+
+    offices = _offices(db, {office_id for _, office_id in candidates})
+    valid: List[Tuple[KioskScanItem, Office, datetime]] = []
+    for scan, office_id in candidates:
+        outcome = outcomes[scan.scan_id]
+        office = offices.get(office_id)
+        if office is None:
+            outcome.reason = f"Office {office_id} not found"
+            continue
+        outcome.reason = _ip_rejection(office, scan.client_ip)
+        if outcome.reason is None:
+            valid.append((scan, office, scan.scanned_at.astimezone(LOCAL_TZ)))
+
+    # 2. Replay valid scans in the order they happened
+    valid.sort(key=lambda item: item[0].scanned_at)
+    days = _existing_days(db, {(scan.user_id, local.date()) for scan, _, local in valid})
+    pending: Dict[Tuple[int, date], _DayRow] = {}
+    check_outs: Dict[Tuple[int, date], _DayRow] = {}
+
+    for scan, office, local in valid:
+        outcome = outcomes[scan.scan_id]
+        key = (scan.user_id, local.date())
+        row = days.get(key)
+        clock = local.time().replace(tzinfo=None)
+
+        if scan.action == CHECK_IN:
+            if row is not None:
+                outcome.reason = f"Already checked in on {key[1].isoformat()}"
+                continue
+            minutes_late = check_in_rules.minutes_late(clock, office.shift_start)
+            row = _DayRow(
+                office_id=office.id,
+                check_in=clock,
+                status=check_in_rules.attendance_status(minutes_late),
+                minutes_late=minutes_late,
+                created_at=local,
+                check_in_scan=scan.scan_id
+            )
+            days[key] = pending[key] = row
+            continue
+
+        if row is None or row.check_in is None:
+            outcome.reason = f"No check-in on {key[1].isoformat()}"
+        elif row.check_out is not None:
+            outcome.reason = f"Already checked out at {row.check_out.strftime('%H:%M:%S')}"
+        elif clock <= row.check_in:
+            outcome.reason = "Check-out is not after check-in"
+        else:
+            row.check_out = clock
+            row.work_hours = _work_hours(key[1], row.check_in, clock)
+            row.check_out_scan = scan.scan_id
+            if key not in pending:
+                check_outs[key] = row
+
+    # 3. Writes
+    inserted = _insert_check_ins(db, pending, now)
+    updated = _update_check_outs(db, check_outs, now)
+
+    summary: Dict[Tuple[date, Optional[int]], Dict[str, float]] = defaultdict(lambda: defaultdict(int))
+    counters: Dict[Tuple[date, Optional[int]], Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    events: List[Tuple[str, date, Optional[int], int, str]] = []
+
+    for key, row in pending.items():
+        user_id, day = key
+        attendance_id = inserted.get(key)
+        for scan_id in filter(None, (row.check_in_scan, row.check_out_scan)):
+            outcome = outcomes[scan_id]
+            if attendance_id is None:
+                # A live check-in for the same day committed first
+                outcome.reason = (
+                    f"Already checked in on {day.isoformat()}" if outcome.action == CHECK_IN
+                    else f"Check-in on {day.isoformat()} was not applied"
+                )
+                continue
+            outcome.status = APPLIED
+            outcome.attendance_id = attendance_id
+            outcome.attendance_status = row.status
+        if attendance_id is None:
+            continue
+
+        deltas = summary[(day, row.office_id)]
+        deltas["total_count"] += 1
+        deltas[f"{row.status}_count"] += 1
+        deltas["late_minutes"] += row.minutes_late
+        counters[(day, row.office_id)]["total"] += 1
+        counters[(day, row.office_id)][row.status] += 1
+        events.append((CHECK_IN, day, row.office_id, user_id, row.status))
+        if row.check_out is not None:
+            deltas["checked_out_count"] += 1
+            deltas["work_hours"] += row.work_hours
+            counters[(day, row.office_id)]["checked_out"] += 1
+            events.append((CHECK_OUT, day, row.office_id, user_id, row.status))
+
+    for key, row in check_outs.items():
+        user_id, day = key
+        outcome = outcomes[row.check_out_scan]
+        if row.attendance_id not in updated:
+            outcome.reason = f"Already checked out on {day.isoformat()}"
+            continue
+        outcome.status = APPLIED
+        outcome.attendance_id = row.attendance_id
+        outcome.attendance_status = row.status
+        deltas = summary[(day, row.office_id)]
+        deltas["checked_out_count"] += 1
+        deltas["work_hours"] += row.work_hours
+        counters[(day, row.office_id)]["checked_out"] += 1
+        events.append((CHECK_OUT, day, row.office_id, user_id, row.status))
+
+    apply_summary_deltas(db, summary)
+    if fresh:
+        _record_outcomes(db, device_id, [outcomes[scan.scan_id] for scan in fresh])
+    db.commit()
+
+    # 4. Live counters and dashboard events, once the batch is durable
+    for (day, office_id), deltas in counters.items():
+        apply_deltas(day, office_id, dict(deltas))
+    for event in events:
+        publish_attendance_event(*event)
+
+    applied = sum(1 for scan in fresh if outcomes[scan.scan_id].status == APPLIED)
+    logger.info(
+        "kiosk_sync_applied",
+        device_id=device_id,
+        scans=len(scans),
+        applied=applied,
+        rejected=len(fresh) - applied,
+        duplicates=len(scans) - len(fresh)
+    )
+
+    results = []
+    seen: Set[str] = set()
+    for scan in scans:
+        outcome = outcomes[scan.scan_id]
+        if scan.scan_id in seen and not outcome.duplicate:
+            outcome = ScanOutcome(**{**vars(outcome), "duplicate": True})
+        seen.add(scan.scan_id)
+        results.append(outcome)
+    return results
+
+# ==================== Retention ====================
+
+def purge_synced_scans(db: Session, before: datetime) -> int:
+    """
+        Drop ledger rows synced before `before`. Commits.
+        Keep KIOSK_SCAN_RETENTION_DAYS above KIOSK_SYNC_MAX_AGE_HOURS: a scan re-sent after its
+        ledger row is gone is then rejected as too old instead of applied twice.
+    """
+    try:
+        deleted = db.execute(
+            delete(KioskScan).where(KioskScan.created_at < before).execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info("kiosk_scans_purged", before=before.isoformat(), deleted=deleted)
+    return deleted
@@ -0,0 +1,50 @@
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+from app.Shared.Infra.database import engine
+from app.Shared.Infra.partitioning import Partition, apply_retention, ensure_partitions
+
+logger = get_logger(__name__)
+
+TABLE = "attendances"
+
+def _retire_reasons(conn: Connection, partition: Partition, mode: str) -> None:
+    """
+        attendance_reasons has no FK to the partitioned table: move (archive) or delete (drop)
+        the reasons of a partition before it leaves the parent. detach keeps them in place.
+    """
+    if mode == "detach":
+        return
+    moved = (
+        f"DELETE FROM attendance_reasons r USING {partition.name} a "
+        "WHERE r.attendance_id = a.id RETURNING r.*"
+    )
+    if mode == "drop":
+        conn.execute(text(moved))
+        return
+    archive = f"{settings.ATTENDANCE_ARCHIVE_SCHEMA}.{partition.name}_reasons"
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {archive} (LIKE attendance_reasons INCLUDING DEFAULTS)"))
+    # Same transaction as the DETACH (apply_retention): a failed detach puts the reasons back
+    conn.execute(text(f"WITH moved AS ({moved}) INSERT INTO {archive} SELECT * FROM moved"))
+
+def maintain_partitions(today: Optional[date] = None) -> Dict[str, List[str]]:
+    """
+        Nightly: pre-create the next ATTENDANCE_PARTITION_MONTHS_AHEAD months, then retire
+        partitions older than ATTENDANCE_RETENTION_MONTHS (0 keeps everything)
+    """
+    created = ensure_partitions(engine, TABLE, settings.ATTENDANCE_PARTITION_MONTHS_AHEAD, today)
+    retired = apply_retention(
+        engine,
+        TABLE,
+        settings.ATTENDANCE_RETENTION_MONTHS,
+        mode=settings.ATTENDANCE_RETENTION_MODE,
+        archive_schema=settings.ATTENDANCE_ARCHIVE_SCHEMA,
+        today=today,
+        before_detach=_retire_reasons
+    )
+    return {"created": created, "retired": retired}
@@ -0,0 +1,92 @@
+"""
+    Scheduled attendance jobs (beat schedule in Shared/Infra/celery_app.py).
+    Each runs under a Redis lock so replicas never run the same job concurrently; a replica that
+    finds the lock taken skips. Day jobs default to yesterday in Bangkok time.
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.orm import Session
+
+from app.Domain.v1.Attendance_Records.Services.columnar_archive import (
+    archive_closed_months as run_archive_closed_months
+)
+from app.Domain.v1.Attendances.Services import day_close_service
+from app.Domain.v1.Attendances.Services.kiosk_sync import purge_synced_scans
+from app.Domain.v1.Attendances.Services.partition_service import maintain_partitions as run_maintain_partitions
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+from app.Shared.Infra.celery_app import celery_app
+from app.Shared.Infra.database import SessionLocal
+from app.Shared.Infra.distributed_lock import redis_lock
+
+logger = get_logger(__name__)
+
+LOCAL_TZ = ZoneInfo("Asia/Bangkok")
+
+def closing_day(day: Optional[str] = None) -> date:
+    """YYYY-MM-DD, default the Bangkok day that just ended"""
+    if day:
+        return datetime.strptime(day, '%Y-%m-%d').date()
+    return datetime.now(LOCAL_TZ).date() - timedelta(days=1)
+
+def run_day_job(name: str, job: Callable[[Session, date], int], day: date) -> dict:
+    """job(db, day) under the job's lock; shared by the tasks and the close_attendance_day command"""
+    with redis_lock(f"attendances:{name}", settings.JOB_LOCK_TTL) as acquired:
+        if not acquired:
+            logger.info("attendance_job_skipped", job=name, day=str(day), reason="locked")
+            return {"job": name, "day": day.isoformat(), "skipped": True}
+
+        db = SessionLocal()
+        try:
+            count = job(db, day)
+        finally:
+            db.close()
+    return {"job": name, "day": day.isoformat(), "skipped": False, "rows": count}
+
+@celery_app.task(name="attendances.auto_checkout")
+def auto_checkout(day: Optional[str] = None) -> dict:
+    return run_day_job("auto_checkout", day_close_service.auto_checkout, closing_day(day))
+
+@celery_app.task(name="attendances.auto_absent")
+def auto_absent(day: Optional[str] = None) -> dict:
+    return run_day_job("auto_absent", day_close_service.auto_absent, closing_day(day))
+
+@celery_app.task(name="attendances.maintain_partitions")
+def maintain_partitions() -> dict:
+    with redis_lock("attendances:maintain_partitions", settings.JOB_LOCK_TTL) as acquired:
+        if not acquired:
+            logger.info("attendance_job_skipped", job="maintain_partitions", reason="locked")
+            return {"job": "maintain_partitions", "skipped": True}
+        return {"job": "maintain_partitions", "skipped": False, **run_maintain_partitions()}
+
+@celery_app.task(name="attendances.purge_kiosk_scans")
+def purge_kiosk_scans() -> dict:
+    with redis_lock("attendances:purge_kiosk_scans", settings.JOB_LOCK_TTL) as acquired:
+        if not acquired:
+            logger.info("attendance_job_skipped", job="purge_kiosk_scans", reason="locked")
+            return {"job": "purge_kiosk_scans", "skipped": True}
+
+        before = datetime.now(timezone.utc) - timedelta(days=settings.KIOSK_SCAN_RETENTION_DAYS)
+        db = SessionLocal()
+        try:
+            deleted = purge_synced_scans(db, before)
+        finally:
+            db.close()
+    return {"job": "purge_kiosk_scans", "skipped": False, "rows": deleted}
+
+@celery_app.task(name="attendances.archive_closed_months")
+def archive_closed_months() -> dict:
+    """Closed months not archived yet or marked dirty by a backdated write"""
+    with redis_lock("attendances:archive_closed_months", settings.JOB_LOCK_TTL) as acquired:
+        if not acquired:
+            logger.info("attendance_job_skipped", job="archive_closed_months", reason="locked")
+            return {"job": "archive_closed_months", "skipped": True}
+
+        db = SessionLocal()
+        try:
+            archived = run_archive_closed_months(db)
+        finally:
+            db.close()
+    return {"job": "archive_closed_months", "skipped": False, "months": archived}
@@ -0,0 +1,47 @@
+"""
+    Backfill daily_attendance_summary from the attendances table (one month per transaction).
+
+    Usage:
+        python -m app.Domain.v1.Dashboard.Commands.backfill_summary --from 2025-01-01
+        python -m app.Domain.v1.Dashboard.Commands.backfill_summary --from 2025-01-01 --to 2025-12-31
+"""
+import argparse
+from datetime import date, datetime, timedelta
+
+from app.Shared.Infra.database import SessionLocal
+from app.Domain.v1.Dashboard.Services.summary_service import rebuild_summary
+# Import models so SQLAlchemy registers them in metadata for foreign key resolution
+from app.Domain.v1.Users.Models.user_model import User
+from app.Domain.v1.Attendances.Models.attendance_reason_model import AttendanceReason
+
+def backfill(start: date, end: date) -> None:
+    """Rebuild rollup rows month by month to keep each transaction small"""
+    db = SessionLocal()
+    try:
+        chunk_start = start
+        while chunk_start <= end:
+            if chunk_start.month == 12:
+                next_month = date(chunk_start.year + 1, 1, 1)
+            else:
+                next_month = date(chunk_start.year, chunk_start.month + 1, 1)
+            chunk_end = min(end, next_month - timedelta(days=1))
+
+            rows = rebuild_summary(db, chunk_start, chunk_end)
+            print(f"{chunk_start} .. {chunk_end}: {rows} rollup rows")
+
+            chunk_start = next_month
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill daily_attendance_summary from attendances")
+    parser.add_argument("--from", dest="start", required=True, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", help="Last day (YYYY-MM-DD), default today")
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start, '%Y-%m-%d').date()
+    end = datetime.strptime(args.end, '%Y-%m-%d').date() if args.end else date.today()
+    backfill(start, end)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+    Rebuild the Redis dashboard counters from the attendances table.
+
+    Usage:
+        python -m app.Domain.v1.Dashboard.Commands.reconcile_counters
+        python -m app.Domain.v1.Dashboard.Commands.reconcile_counters --date 2026-01-15 --days 7
+"""
+import argparse
+from datetime import date, datetime, timedelta
+
+from app.Shared.Infra.database import SessionLocal
+from app.Domain.v1.Dashboard.Services.counter_service import rebuild_counters
+# Import models so SQLAlchemy registers them in metadata for foreign key resolution
+from app.Domain.v1.Users.Models.user_model import User
+from app.Domain.v1.Attendances.Models.attendance_reason_model import AttendanceReason
+
+def reconcile(end_day: date, days: int = 1) -> None:
+    """Rebuild counters for `days` days ending at `end_day` (inclusive)"""
+    db = SessionLocal()
+    try:
+        for offset in range(days):
+            day = end_day - timedelta(days=offset)
+            totals = rebuild_counters(db, day)
+            print(f"{day}: {totals}")
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild dashboard counters from SQL")
+    parser.add_argument("--date", help="Last day to rebuild (YYYY-MM-DD), default today")
+    parser.add_argument("--days", type=int, default=1, help="Number of days to rebuild")
+    args = parser.parse_args()
+
+    end_day = datetime.strptime(args.date, '%Y-%m-%d').date() if args.date else date.today()
+    reconcile(end_day, args.days)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from datetime import date, timedelta
-from typing import List
-from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from datetime import date
+from typing import List, Optional
+from app.Shared.Infra.database import SessionLocal
+from app.Domain.v1.Dashboard.Services.counter_service import get_counters
+from app.Domain.v1.Dashboard.Services.summary_service import (
+    get_daily_totals,
+    is_closed_month,
+    get_cached_trends,
+    rollup_watermarks,
+    store_cached_trend
+)
 from app.Domain.v1.Dashboard.Schemas.dashboard_schema import (
     DailyStats,
     MonthlyTrendPoint,
@@ -13,73 +20,63 @@ from app.Domain.v1.Dashboard.Schemas.dashboard_schema import (
 class DashboardService:
     """Business Logic for Dashboard"""
     @staticmethod
-    def _get_daily_stats(db: Session) -> DailyStats:
+    def _get_daily_stats(db: Session, office_id: Optional[int] = None) -> DailyStats:
         """ 
             Get today's attendance statistics
-            Single optimized query with aggregations
+            O(1) read from the live Redis counters (see counter_service)
         """
         today = date.today()
 
-        # Single aggregation query  ( FAST! )
-        result = db.query(
-            func.count(Attendance.id).label("total"),
-            func.sum(case((Attendance.status == 'on_time', 1), else_=0)).label('on_time'),
-            func.sum(case((Attendance.status == 'late', 1), else_=0)).label('late'),
-            func.sum(case((Attendance.status == 'absent', 1), else_=0)).label('absent')
-        ).filter(Attendance.log_date == today).first()
+        counters = get_counters(db, today, office_id)
 
-        # Calculate total staff
-        on_time = result.on_time or 0
-        late = result.late or 0
-        absent = result.absent or 0
-        total = result.total or 0
+        present = counters["present"]
+        late = counters["late"]
 
         stats = DailyStats(
             date=str(today),
-            total_staff=total,
-            active_staff=on_time + late,
-            absent_staff=absent,
-            on_time_count=on_time,
-            late_count=late
+            total_staff=counters["total"],
+            active_staff=present + late,
+            absent_staff=counters["absent"],
+            on_time_count=present,
+            late_count=late,
+            checked_out_count=counters["checked_out"]
         )
 
         return stats
 
     @staticmethod
-    def _get_monthly_trend(db: Session, year: int, month: int) -> MonthlyTrend :
-        """ 
-            Get monthly trend with daily percentages
-            Single query grouped by date
+    def _get_stream_snapshot(office_id: Optional[int] = None) -> dict:
+        """
+            First frame of a live stream connection
+            Opens its own session: streams outlive request-scoped dependencies
         """
+        today = date.today()
+        db = SessionLocal()
+        try:
+            counters = get_counters(db, today, office_id)
+        finally:
+            db.close()
+
+        return {
+            "type": "snapshot",
+            "date": today.isoformat(),
+            "events": [],
+            "counters": counters
+        }
 
-        # Get First and last day of month
-        first_day = date(year, month, 1)
-        if month == 12:
-            last_day = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            last_day = date(year, month + 1, 1) - timedelta(days=1)
-
-        # Query all days in month (single query with GROUP BY)
-        results = db.query(
-            Attendance.log_date,
-            func.count(Attendance.id).label("total"),
-            func.sum(case((Attendance.status == 'on_time', 1), else_=0)).label('on_time'),
-            func.sum(case((Attendance.status == 'late',1), else_=0)).label('late'),
-            func.sum(case((Attendance.status == 'absent',1), else_=0)).label('absent')
-        ).filter(
-            Attendance.log_date >= first_day,
-            Attendance.log_date <= last_day
-        ).group_by(
-            Attendance.log_date
-        ).order_by(
-            Attendance.log_date
-        ).all()
+    @staticmethod
+    def _build_monthly_trend(db: Session, year: int, month: int) -> MonthlyTrend:
+        """ 
+            Build monthly trend with daily percentages
+            Reads the daily_attendance_summary rollup (<= 31 x offices rows)
+        """
+        results = get_daily_totals(db, year, month)
 
         # Calculate percentages for each day
         data_points: List[MonthlyTrendPoint] = []
         for row in results:
             total = row.total or 0
-            on_time = row.on_time or 0
+            on_time = row.present or 0
             late = row.late or 0
             absent = row.absent or 0
 
@@ -98,7 +95,7 @@ class DashboardService:
                 on_time_percentage=on_time_pct,
                 late_percentage=late_pct,
                 absent_percentage=absent_pct,
-                total_staff=total,
+                total_staff=int(total),
             ))
 
         trend = MonthlyTrend(
@@ -108,6 +105,55 @@ class DashboardService:
 
         return trend
 
+    @staticmethod
+    def _get_monthly_trend(db: Session, year: int, month: int) -> MonthlyTrend :
+        """ 
+            Get monthly trend with daily percentages
+            Closed months are served from the Redis cache, keyed on their rollup watermark
+        """
+        if not is_closed_month(year, month):
+            return DashboardService._build_monthly_trend(db, year, month)
+
+        versions = rollup_watermarks(db, [(year, month)])
+        cached = get_cached_trends(versions).get((year, month))
+        if cached:
+            return MonthlyTrend.model_validate_json(cached)
+
+        trend = DashboardService._build_monthly_trend(db, year, month)
+        store_cached_trend(year, month, versions[(year, month)], trend.model_dump_json())
+        return trend
+
+    @staticmethod
+    def _get_trend_range(db: Session, months: int) -> List[MonthlyTrend]:
+        """
+            Get the last `months` monthly trends (oldest first), current month included
+            One watermark query and one MGET for the closed months, rollup query only for the misses
+        """
+        today = date.today()
+
+        # Walk back from the current month
+        year_months: List[tuple] = []
+        year, month = today.year, today.month
+        for _ in range(months):
+            year_months.append((year, month))
+            year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+        year_months.reverse()
+
+        versions = rollup_watermarks(db, [ym for ym in year_months if is_closed_month(*ym)])
+        cached = get_cached_trends(versions)
+
+        trends: List[MonthlyTrend] = []
+        for year, month in year_months:
+            if (year, month) in cached:
+                trends.append(MonthlyTrend.model_validate_json(cached[(year, month)]))
+                continue
+            trend = DashboardService._build_monthly_trend(db, year, month)
+            if (year, month) in versions:
+                store_cached_trend(year, month, versions[(year, month)], trend.model_dump_json())
+            trends.append(trend)
+
+        return trends
+
     @staticmethod
     def _get_dashboard(db: Session) -> DashboardResponse:
         """
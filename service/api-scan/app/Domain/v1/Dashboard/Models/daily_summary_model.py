@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, Date, DateTime, Numeric
+from sqlalchemy.sql import func
+from app.Shared.Infra.database import Base
+
+class DailyAttendanceSummary(Base):
+    """Model for daily rollup - matches daily_attendance_summary table (Laravel migration)"""
+    __tablename__ = "daily_attendance_summary"
+
+    # Composite primary key: one row per (date, office)
+    summary_date = Column(Date, primary_key=True)
+    # 0 = records without office (absence requests)
+    office_id = Column(Integer, primary_key=True, default=0)
+    total_count = Column(Integer, nullable=False, default=0)
+    present_count = Column(Integer, nullable=False, default=0)
+    late_count = Column(Integer, nullable=False, default=0)
+    absent_count = Column(Integer, nullable=False, default=0)
+    checked_out_count = Column(Integer, nullable=False, default=0)
+    late_minutes = Column(Integer, nullable=False, default=0)
+    work_hours = Column(Numeric(12, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from typing import List, Optional
 
 from app.Shared.Infra.database import get_db
 from app.Domain.v1.Dashboard.Schemas.dashboard_schema import (
@@ -8,29 +11,37 @@ from app.Domain.v1.Dashboard.Schemas.dashboard_schema import (
     DashboardResponse
 )
 from app.Domain.v1.Dashboard.Controllers.dashboard_controller import DashboardService
+from app.Domain.v1.Dashboard.Services.event_service import dashboard_event_hub
+from app.Shared.Core.config import settings
+from app.Shared.Core.responses import model_response, dumps
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/daily-stats", response_model=DailyStats, status_code=status.HTTP_200_OK)
-def get_daily_stats(db: Session = Depends(get_db)):
+def get_daily_stats(office_id: Optional[int] = None, db: Session = Depends(get_db)):
 
     """
     Get today's attendance statistics
     
+    Query params:
+    - office_id: Optional, restrict counters to one office
+
     Returns:
     - total_staff: Total attendance records today
     - active_staff: Staff who checked in (on_time + late)
     - absent_staff: Staff marked as absent
     - on_time_count: Staff who came on time
     - late_count: Staff who came late
+    - checked_out_count: Staff who already checked out
     """
     
-    return DashboardService._get_daily_stats(db)
+    return model_response(DashboardService._get_daily_stats(db, office_id))
 
 @router.get("/monthly-trend", response_model=MonthlyTrend, status_code=status.HTTP_200_OK)
 def get_monthly_trend(
     year: int,
     month: int,
+    # Primary, not the replica: closed-month trends are cached for a day (summary_service)
     db: Session = Depends(get_db)
 ):
     """
@@ -43,7 +54,23 @@ def get_monthly_trend(
     Returns:
     - List of daily data points with percentages
     """
-    return DashboardService._get_monthly_trend(db, year, month)
+    return model_response(DashboardService._get_monthly_trend(db, year, month))
+
+@router.get("/trend", response_model=List[MonthlyTrend], status_code=status.HTTP_200_OK)
+def get_trend(
+    months: int = Query(12, ge=1, le=36),
+    # Primary, not the replica: closed-month trends are cached for a day (summary_service)
+    db: Session = Depends(get_db)
+):
+    """
+    Get the last N monthly trends (oldest first, current month included)
+    
+    Query params:
+    - months: Number of months (1-36, default 12)
+    
+    Closed months come from the immutable cache, only the current month is read from the rollup
+    """
+    return model_response(DashboardService._get_trend_range(db, months))
 
 @router.get("/", response_model=DashboardResponse, status_code=status.HTTP_200_OK)
 def get_dashboard(db: Session = Depends(get_db)):
@@ -54,4 +81,53 @@ def get_dashboard(db: Session = Depends(get_db)):
     - daily_stats: Today's statistics
     - monthly_trend: Current month's trend data
     """
-    return DashboardService._get_dashboard(db)
\ No newline at end of file
+    return model_response(DashboardService._get_dashboard(db))
+
+# ==================== Live stream ====================
+
+@router.websocket("/ws")
+async def dashboard_websocket(websocket: WebSocket, office_id: Optional[int] = None):
+    """
+    Live dashboard over WebSocket
+    
+    - First frame: snapshot of today's counters
+    - Then one coalesced "update" frame per flush interval with new events + counters
+    - "heartbeat" frame when idle
+    """
+    await websocket.accept()
+    subscription = dashboard_event_hub.subscribe(office_id)
+    try:
+        await websocket.send_json(await run_in_threadpool(DashboardService._get_stream_snapshot, office_id))
+        while True:
+            frame = await subscription.next_frame(settings.DASHBOARD_STREAM_HEARTBEAT)
+            await websocket.send_json(frame or {"type": "heartbeat"})
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        dashboard_event_hub.unsubscribe(subscription)
+
+@router.get("/stream")
+async def dashboard_stream(request: Request, office_id: Optional[int] = None):
+    """
+    Live dashboard over Server-Sent Events (same frames as /ws)
+    """
+    snapshot = await run_in_threadpool(DashboardService._get_stream_snapshot, office_id)
+
+    async def event_source():
+        subscription = dashboard_event_hub.subscribe(office_id)
+        try:
+            yield f"event: snapshot\ndata: {dumps(snapshot).decode()}\n\n"
+            while not await request.is_disconnected():
+                frame = await subscription.next_frame(settings.DASHBOARD_STREAM_HEARTBEAT)
+                if frame is None:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"event: update\ndata: {dumps(frame).decode()}\n\n"
+        finally:
+            dashboard_event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -11,6 +11,7 @@ class DailyStats(BaseModel):
     absent_staff:int
     on_time_count:int
     late_count:int
+    checked_out_count:int = 0
     
 # Monthly Trend Point Schema
 class MonthlyTrendPoint(BaseModel):
@@ -0,0 +1,27 @@
+from app.Domain.v1.Dashboard.Services.counter_service import (
+    record_check_in,
+    record_check_out,
+    record_absence,
+    get_counters,
+    rebuild_counters
+)
+from app.Domain.v1.Dashboard.Services.summary_service import (
+    apply_summary_delta,
+    rebuild_summary
+)
+from app.Domain.v1.Dashboard.Services.event_service import (
+    publish_attendance_event,
+    dashboard_event_hub
+)
+
+__all__ = [
+    "record_check_in",
+    "record_check_out",
+    "record_absence",
+    "get_counters",
+    "rebuild_counters",
+    "apply_summary_delta",
+    "rebuild_summary",
+    "publish_attendance_event",
+    "dashboard_event_hub",
+]
\ No newline at end of file
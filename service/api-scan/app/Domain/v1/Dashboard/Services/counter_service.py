@@ -0,0 +1,177 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from datetime import date
+from typing import Dict, Optional
+
+import redis
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Shared.Infra.distributed_lock import redis_lock
+from app.Shared.Infra.redis import get_sync_redis
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Counter fields kept in every hash
+COUNTER_FIELDS = ("total", "present", "late", "absent", "checked_out")
+
+# Marker field: hash was rebuilt from SQL at least once (safe to trust)
+BUILT_FIELD = "_built"
+
+# Rebuild tries before giving up on a day whose counters never stop moving
+REBUILD_ATTEMPTS = 5
+
+def _day_key(day: date) -> str:
+    """Company-wide counters for one day"""
+    return f"dashboard:counters:{day.isoformat()}"
+
+def _office_key(day: date, office_id: int) -> str:
+    """Per-office counters for one day"""
+    return f"dashboard:counters:{day.isoformat()}:office:{office_id}"
+
+def _empty_counters() -> Dict[str, int]:
+    return {field: 0 for field in COUNTER_FIELDS}
+
+def apply_deltas(day: date, office_id: Optional[int], deltas: Dict[str, int]) -> None:
+    """
+        Atomically increment day (and office) counters in one MULTI/EXEC.
+        Never raises - a failed increment is repaired by reconciliation.
+    """
+    try:
+        client = get_sync_redis()
+        keys = [_day_key(day)]
+        if office_id is not None:
+            keys.append(_office_key(day, office_id))
+
+        pipe = client.pipeline(transaction=True)
+        for key in keys:
+            for field, amount in deltas.items():
+                if amount:
+                    pipe.hincrby(key, field, amount)
+            pipe.expire(key, settings.DASHBOARD_COUNTERS_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("dashboard_counters_update_failed", day=str(day), office_id=office_id, error=str(e))
+
+def record_check_in(day: date, office_id: Optional[int], attendance_status: str) -> None:
+    """New present/late attendance row"""
+    apply_deltas(day, office_id, {"total": 1, attendance_status: 1})
+
+def record_check_out(day: date, office_id: Optional[int]) -> None:
+    """Existing attendance row got its check_out"""
+    apply_deltas(day, office_id, {"checked_out": 1})
+
+def record_absence(day: date, office_id: Optional[int] = None) -> None:
+    """New absent attendance row (permission request)"""
+    apply_deltas(day, office_id, {"total": 1, "absent": 1})
+
+def _aggregate_from_sql(db: Session, day: date) -> Dict[Optional[int], Dict[str, int]]:
+    """ Single GROUP BY office_id over the day's attendances """
+    rows = db.query(
+        Attendance.office_id,
+        func.count(Attendance.id).label("total"),
+        func.sum(case((Attendance.status == 'present', 1), else_=0)).label("present"),
+        func.sum(case((Attendance.status == 'late', 1), else_=0)).label("late"),
+        func.sum(case((Attendance.status == 'absent', 1), else_=0)).label("absent"),
+        func.count(Attendance.check_out).label("checked_out")
+    ).filter(
+        Attendance.log_date == day
+    ).group_by(
+        Attendance.office_id
+    ).all()
+
+    per_office: Dict[Optional[int], Dict[str, int]] = {}
+    for row in rows:
+        per_office[row.office_id] = {field: int(getattr(row, field) or 0) for field in COUNTER_FIELDS}
+    return per_office
+
+def _sum_counters(per_office: Dict[Optional[int], Dict[str, int]]) -> Dict[str, int]:
+    totals = _empty_counters()
+    for counters in per_office.values():
+        for field in COUNTER_FIELDS:
+            totals[field] += counters[field]
+    return totals
+
+def rebuild_counters(db: Session, day: date) -> Dict[str, int]:
+    """
+        Reconciliation: recompute the day's hashes from SQL and overwrite Redis.
+        Returns the company-wide counters.
+
+        The day hash is WATCHed from before the SQL read. Every increment (apply_deltas) touches
+        it and runs after its row committed, so an increment landing before EXEC aborts the write
+        and the rebuild starts over with a fresh read, instead of erasing the increment.
+    """
+    client = get_sync_redis()
+    for attempt in range(1, REBUILD_ATTEMPTS + 1):
+        with client.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(_day_key(day))
+                per_office = _aggregate_from_sql(db, day)
+                totals = _sum_counters(per_office)
+                stale_keys = list(client.scan_iter(match=f"{_day_key(day)}:office:*"))
+
+                pipe.multi()
+                if stale_keys:
+                    pipe.delete(*stale_keys)
+                pipe.delete(_day_key(day))
+                pipe.hset(_day_key(day), mapping={**totals, BUILT_FIELD: 1})
+                pipe.expire(_day_key(day), settings.DASHBOARD_COUNTERS_TTL)
+                for office_id, counters in per_office.items():
+                    if office_id is None:
+                        continue
+                    pipe.hset(_office_key(day, office_id), mapping={**counters, BUILT_FIELD: 1})
+                    pipe.expire(_office_key(day, office_id), settings.DASHBOARD_COUNTERS_TTL)
+                pipe.execute()
+            except redis.WatchError:
+                continue
+
+        logger.info(
+            "dashboard_counters_rebuilt", day=str(day), offices=len(per_office), total=totals["total"], attempts=attempt
+        )
+        return totals
+
+    # Redis keeps its (incremented) hashes; the next reconciliation tries again
+    logger.warning("dashboard_counters_rebuild_contended", day=str(day), attempts=REBUILD_ATTEMPTS)
+    return totals
+
+async def read_counters_async(client, day: date, office_id: Optional[int] = None) -> Dict[str, int]:
+    """ HGETALL through the async client (stream frames); no SQL fallback """
+    key = _day_key(day) if office_id is None else _office_key(day, office_id)
+    raw = await client.hgetall(key)
+    return {field: int(raw.get(field, 0)) for field in COUNTER_FIELDS}
+
+def get_counters(db: Session, day: date, office_id: Optional[int] = None) -> Dict[str, int]:
+    """
+        O(1) read of the day's counters (HGETALL).
+        Rebuilds from SQL if the day was never reconciled; falls back to SQL if Redis is down.
+    """
+    key = _day_key(day) if office_id is None else _office_key(day, office_id)
+    try:
+        client = get_sync_redis()
+        pipe = client.pipeline(transaction=False)
+        pipe.hexists(_day_key(day), BUILT_FIELD)
+        pipe.hgetall(key)
+        is_built, raw = pipe.execute()
+
+        if not is_built:
+            # Day never reconciled (cold start / eviction): one reader rebuilds from SQL, the
+            # others answer from SQL meanwhile rather than each running its own rebuild
+            with redis_lock(f"dashboard:counters:{day.isoformat()}", settings.DASHBOARD_COUNTERS_REBUILD_LOCK_TTL) as acquired:
+                if not acquired:
+                    per_office = _aggregate_from_sql(db, day)
+                    if office_id is None:
+                        return _sum_counters(per_office)
+                    return per_office.get(office_id, _empty_counters())
+                totals = rebuild_counters(db, day)
+            if office_id is None:
+                return totals
+            raw = client.hgetall(key)
+
+        return {field: int(raw.get(field, 0)) for field in COUNTER_FIELDS}
+    except Exception as e:
+        logger.warning("dashboard_counters_read_failed", day=str(day), office_id=office_id, error=str(e))
+        per_office = _aggregate_from_sql(db, day)
+        if office_id is None:
+            return _sum_counters(per_office)
+        return per_office.get(office_id, _empty_counters())
@@ -0,0 +1,167 @@
+import asyncio
+import json
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from app.Domain.v1.Dashboard.Services.counter_service import read_counters_async
+from app.Shared.Infra.redis import get_redis, get_sync_redis
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# ==================== Publisher (sync write paths) ====================
+
+def publish_attendance_event(
+    event_type: str,
+    day: date,
+    office_id: Optional[int],
+    user_id: int,
+    attendance_status: Optional[str] = None
+) -> None:
+    """
+        Publish check_in / check_out / absence to every api-scan worker.
+        Never raises - dashboards resync from counters on the next frame anyway.
+    """
+    event = {
+        "type": event_type,
+        "date": day.isoformat(),
+        "office_id": office_id,
+        "user_id": user_id,
+        "status": attendance_status,
+        "at": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        get_sync_redis().publish(settings.DASHBOARD_STREAM_CHANNEL, json.dumps(event))
+    except Exception as e:
+        logger.warning("dashboard_event_publish_failed", type=event_type, error=str(e))
+
+# ==================== Per-connection subscription ====================
+
+class Subscription:
+    """ Bounded frame queue for one dashboard connection (WebSocket or SSE) """
+
+    def __init__(self, office_id: Optional[int], max_frames: int):
+        self.office_id = office_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_frames)
+        self.dropped_events = 0
+
+    def push(self, frame: Dict[str, Any]) -> None:
+        """ Backpressure: a slow consumer loses its oldest frame, never blocks the hub """
+        if self.queue.full():
+            stale = self.queue.get_nowait()
+            self.dropped_events += len(stale["events"])
+        self.queue.put_nowait(frame)
+
+    async def next_frame(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """ Next frame, or None on heartbeat timeout """
+        try:
+            frame = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        if self.dropped_events:
+            # Counters in the frame are absolute, so dashboards stay correct after drops
+            frame = {**frame, "dropped_events": self.dropped_events}
+            self.dropped_events = 0
+        return frame
+
+# ==================== Hub (one per worker) ====================
+
+class DashboardEventHub:
+    """
+        Fans Redis pub/sub events out to this worker's dashboard connections.
+        Bursts are coalesced: one frame (events + fresh counters) per flush interval.
+    """
+
+    def __init__(self):
+        self._subscribers: Set[Subscription] = set()
+        self._pending: List[Dict[str, Any]] = []
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._listen()),
+            asyncio.create_task(self._flush_loop()),
+        ]
+        logger.info("dashboard_hub_started", channel=settings.DASHBOARD_STREAM_CHANNEL)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("dashboard_hub_stopped")
+
+    def subscribe(self, office_id: Optional[int] = None) -> Subscription:
+        subscription = Subscription(office_id, settings.DASHBOARD_STREAM_QUEUE_SIZE)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    async def _listen(self) -> None:
+        """ Collect events from Redis; reconnect with a short backoff on failure """
+        while True:
+            try:
+                client = await get_redis()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(settings.DASHBOARD_STREAM_CHANNEL)
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        try:
+                            self._pending.append(json.loads(message["data"]))
+                        except (ValueError, TypeError):
+                            continue
+                finally:
+                    await pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("dashboard_hub_listen_failed", error=str(e))
+                await asyncio.sleep(1.0)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.DASHBOARD_STREAM_FLUSH_INTERVAL)
+            if not self._pending or not self._subscribers:
+                self._pending.clear()
+                continue
+
+            events, self._pending = self._pending, []
+            try:
+                await self._broadcast(events)
+            except Exception as e:
+                logger.warning("dashboard_hub_flush_failed", error=str(e))
+
+    async def _broadcast(self, events: List[Dict[str, Any]]) -> None:
+        """ Read counters once per office in use, then push one frame per subscriber """
+        today = date.today()
+        client = await get_redis()
+
+        office_ids = {subscription.office_id for subscription in self._subscribers}
+        counters = {
+            office_id: await read_counters_async(client, today, office_id)
+            for office_id in office_ids
+        }
+
+        for subscription in list(self._subscribers):
+            if subscription.office_id is None:
+                own_events = events
+            else:
+                own_events = [event for event in events if event.get("office_id") == subscription.office_id]
+                if not own_events:
+                    continue
+            subscription.push({
+                "type": "update",
+                "date": today.isoformat(),
+                "events": own_events,
+                "counters": counters[subscription.office_id],
+            })
+
+# Singleton instance
+dashboard_event_hub = DashboardEventHub()
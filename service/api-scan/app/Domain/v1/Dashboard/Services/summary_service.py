@@ -0,0 +1,231 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, select, literal, event
+from sqlalchemy.dialects.postgresql import insert
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Domain.v1.Attendance_Records.Services.columnar_archive import mark_dirty as mark_archive_dirty
+from app.Domain.v1.Dashboard.Models.daily_summary_model import DailyAttendanceSummary
+from app.Shared.Infra.redis import get_sync_redis
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# office_id used for rows without office (absence requests)
+NO_OFFICE_ID = 0
+
+# Columns that can be incremented through apply_summary_delta
+SUMMARY_FIELDS = (
+    "total_count",
+    "present_count",
+    "late_count",
+    "absent_count",
+    "checked_out_count",
+    "late_minutes",
+    "work_hours",
+)
+
+# Session.info key: closed months touched in the current transaction
+_PENDING_INVALIDATIONS = "closed_months"
+
+def _month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """First day of month and first day of next month"""
+    first_day = date(year, month, 1)
+    next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return first_day, next_month
+
+def is_closed_month(year: int, month: int, today: Optional[date] = None) -> bool:
+    """A month is closed (immutable) once today is past its last day"""
+    today = today or date.today()
+    return (year, month) < (today.year, today.month)
+
+# ==================== Incremental maintenance ====================
+
+def apply_summary_delta(db: Session, day: date, office_id: Optional[int], **deltas) -> None:
+    """
+        Upsert-increment the (day, office) rollup row inside the caller's transaction.
+        Caller commits - the rollup and the attendance write succeed or fail together.
+    """
+    apply_summary_deltas(db, {(day, office_id): deltas})
+
+def apply_summary_deltas(db: Session, deltas: Mapping[Tuple[date, Optional[int]], Mapping[str, float]]) -> None:
+    """
+        Batch form of apply_summary_delta: one multi-row upsert for many (day, office) rows.
+        Rows are written in key order so concurrent batches lock them in the same order.
+    """
+    merged: Dict[Tuple[date, int], Dict[str, float]] = {}
+    for (day, office_id), row_deltas in deltas.items():
+        key = (day, office_id if office_id is not None else NO_OFFICE_ID)
+        values = merged.setdefault(key, {field: 0 for field in SUMMARY_FIELDS})
+        for field in SUMMARY_FIELDS:
+            values[field] += row_deltas.get(field, 0)
+    if not merged:
+        return
+
+    now = datetime.now(timezone.utc)
+    stmt = insert(DailyAttendanceSummary).values([
+        {"summary_date": day, "office_id": office_key, "updated_at": now, **values}
+        for (day, office_key), values in sorted(merged.items())
+    ])
+    changed = [field for field in SUMMARY_FIELDS if any(values[field] for values in merged.values())]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyAttendanceSummary.summary_date, DailyAttendanceSummary.office_id],
+        set_={
+            **{field: getattr(DailyAttendanceSummary, field) + stmt.excluded[field] for field in changed},
+            "updated_at": now,
+        }
+    )
+    db.execute(stmt)
+
+    # Writes into an already closed month (late sync, backfill) must drop its columnar archive,
+    # once committed (see columnar_archive.mark_dirty). Its cached trend needs nothing: the write
+    # moves the month's rollup watermark, which versions the cache key.
+    for day, _ in merged:
+        if is_closed_month(day.year, day.month):
+            db.info.setdefault(_PENDING_INVALIDATIONS, set()).add((day.year, day.month))
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    months = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if months:
+        mark_archive_dirty(date(year, month, 1) for year, month in months)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+# ==================== Backfill ====================
+
+def rebuild_summary(db: Session, start: date, end: date) -> int:
+    """
+        Recompute rollup rows for [start, end] from attendances with one INSERT ... SELECT.
+        Returns the number of rollup rows written. Commits.
+
+        A row inserted by a concurrent apply_summary_deltas after the DELETE is overwritten
+        (ON CONFLICT) rather than failing the rebuild on the unique key.
+    """
+    office_key = func.coalesce(Attendance.office_id, literal(NO_OFFICE_ID))
+
+    aggregate = select(
+        Attendance.log_date,
+        office_key,
+        func.count(Attendance.id),
+        func.sum(case((Attendance.status == 'present', 1), else_=0)),
+        func.sum(case((Attendance.status == 'late', 1), else_=0)),
+        func.sum(case((Attendance.status == 'absent', 1), else_=0)),
+        func.count(Attendance.check_out),
+        func.coalesce(func.sum(Attendance.minutes_late), 0),
+        func.coalesce(func.sum(Attendance.work_hours), 0),
+        func.now()
+    ).where(
+        Attendance.log_date >= start,
+        Attendance.log_date <= end
+    ).group_by(
+        Attendance.log_date,
+        office_key
+    )
+
+    try:
+        db.query(DailyAttendanceSummary).filter(
+            DailyAttendanceSummary.summary_date >= start,
+            DailyAttendanceSummary.summary_date <= end
+        ).delete(synchronize_session=False)
+
+        stmt = insert(DailyAttendanceSummary).from_select(
+            [
+                "summary_date", "office_id", "total_count", "present_count", "late_count",
+                "absent_count", "checked_out_count", "late_minutes", "work_hours", "updated_at",
+            ],
+            aggregate
+        )
+        result = db.execute(stmt.on_conflict_do_update(
+            index_elements=[DailyAttendanceSummary.summary_date, DailyAttendanceSummary.office_id],
+            set_={field: stmt.excluded[field] for field in (*SUMMARY_FIELDS, "updated_at")}
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    # Rewritten rows carry now() as updated_at: cached trends of these months are outdated by key
+    logger.info("daily_summary_rebuilt", start=str(start), end=str(end), rows=result.rowcount)
+    return result.rowcount
+
+# ==================== Reads ====================
+
+def get_daily_totals(db: Session, year: int, month: int, office_id: Optional[int] = None):
+    """
+        Company-wide (or one office) totals per day for a month.
+        At most 31 x offices rollup rows - independent of headcount.
+    """
+    first_day, next_month = _month_bounds(year, month)
+
+    query = db.query(
+        DailyAttendanceSummary.summary_date.label("log_date"),
+        func.sum(DailyAttendanceSummary.total_count).label("total"),
+        func.sum(DailyAttendanceSummary.present_count).label("present"),
+        func.sum(DailyAttendanceSummary.late_count).label("late"),
+        func.sum(DailyAttendanceSummary.absent_count).label("absent")
+    ).filter(
+        DailyAttendanceSummary.summary_date >= first_day,
+        DailyAttendanceSummary.summary_date < next_month
+    )
+    if office_id is not None:
+        query = query.filter(DailyAttendanceSummary.office_id == office_id)
+
+    return query.group_by(
+        DailyAttendanceSummary.summary_date
+    ).order_by(
+        DailyAttendanceSummary.summary_date
+    ).all()
+
+def rollup_watermarks(db: Session, months: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], str]:
+    """
+        Latest rollup write per month, one GROUP BY over at most 31 x offices rows per month.
+        Every attendance write bumps updated_at of its rollup row, so the watermark moves with
+        each committed change to the month.
+    """
+    months = sorted(set(months))
+    if not months:
+        return {}
+    month = func.date_trunc("month", DailyAttendanceSummary.summary_date)
+    rows = db.query(
+        month.label("month"),
+        func.max(DailyAttendanceSummary.updated_at).label("watermark")
+    ).filter(
+        DailyAttendanceSummary.summary_date >= _month_bounds(*months[0])[0],
+        DailyAttendanceSummary.summary_date < _month_bounds(*months[-1])[1]
+    ).group_by(month).all()
+    found = {(row.month.year, row.month.month): row.watermark.isoformat() for row in rows}
+    return {ym: found.get(ym, "-") for ym in months}
+
+# ==================== Trend cache (closed months) ====================
+# Keyed on the month's rollup watermark: a reader that built a trend from pre-commit rollup
+# rows stores it under the old watermark, which no later reader asks for. The TTL bounds what
+# the watermark can miss (a write committed with an older timestamp) and drops old versions.
+
+def _trend_key(year: int, month: int, version: str) -> str:
+    return f"dashboard:trend:{year}-{month:02d}:{version}"
+
+def get_cached_trends(versions: Mapping[Tuple[int, int], str]) -> Dict[Tuple[int, int], str]:
+    """ One MGET for the requested closed months at their watermark; returns only the hits (JSON strings) """
+    if not versions:
+        return {}
+    months = list(versions)
+    try:
+        values = get_sync_redis().mget([_trend_key(year, month, versions[(year, month)]) for year, month in months])
+    except Exception as e:
+        logger.warning("trend_cache_read_failed", error=str(e))
+        return {}
+    return {ym: value for ym, value in zip(months, values) if value}
+
+def store_cached_trend(year: int, month: int, version: str, payload: str) -> None:
+    """ Closed months only, under the watermark read before the trend was built """
+    if not is_closed_month(year, month):
+        return
+    try:
+        get_sync_redis().set(_trend_key(year, month, version), payload, ex=settings.DASHBOARD_TREND_CACHE_TTL)
+    except Exception as e:
+        logger.warning("trend_cache_write_failed", month=f"{year}-{month:02d}", error=str(e))
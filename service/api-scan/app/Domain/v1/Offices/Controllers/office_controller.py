@@ -1,17 +1,36 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Tuple
 from datetime import datetime, timezone
 from app.Domain.v1.Offices.Models.office_model import Office
 from app.Domain.v1.Offices.Schemas.office_schema import OfficeCreate, OfficeUpdate
 from app.Domain.v1.QR_codes.Models.qr_model import QRCode
+from app.Shared.Core.pagination import paginate_keyset
+from app.Shared.Infra.ndjson import ndjson_response
 
 class OfficeService:
     """Service layer for office business logic"""
     @staticmethod
-    def get_all_offices(db: Session, skip: int = 0, limit: int = 100) -> List[Office]:
-        """Get all offices"""
-        return db.query(Office).offset(skip).limit(limit).all()
+    def get_all_offices(
+        db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Office], Optional[str]]:
+        """Get all offices, oldest first; returns (offices, next_cursor)"""
+        query = db.query(Office)
+        if skip and not cursor:
+            # Legacy offset paging: still supported, but deep pages scan every skipped row
+            return query.order_by(Office.created_at.asc().nulls_last(), Office.id.asc()).offset(skip).limit(limit).all(), None
+        return paginate_keyset(query, Office.created_at, Office.id, limit, cursor, descending=False)
+
+    @staticmethod
+    def stream_offices() -> StreamingResponse:
+        """Every office as NDJSON, oldest first (plain columns, no ORM objects)"""
+        def build_query(db: Session):
+            return db.query(
+                Office.id, Office.name, Office.public_ip, Office.shift_start, Office.shift_end,
+                Office.created_at, Office.updated_at
+            ).order_by(Office.created_at.asc().nulls_last(), Office.id.asc())
+        return ndjson_response(build_query, lambda row: row._asdict())
     
     @staticmethod
     def get_office_by_id(db: Session, office_id: int) -> Office:
@@ -1,17 +1,34 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.Shared.Infra.database import get_db
+from app.Shared.Infra.database import get_db, get_read_db
 from app.Domain.v1.Offices.Schemas.office_schema import OfficeResponse, OfficeCreate, OfficeUpdate
 from app.Domain.v1.Offices.Controllers.office_controller import OfficeService
+from app.Shared.Core.pagination import NEXT_CURSOR_HEADER
+from app.Shared.Infra.ndjson import NDJSON_MEDIA_TYPE, wants_ndjson
 
 router = APIRouter(tags=["Offices"])
 
-@router.get("/", response_model=List[OfficeResponse])
-def get_all_offices(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """ Get all offices """
-    offices = OfficeService.get_all_offices(db, skip=skip, limit=limit)
+@router.get("/", response_model=List[OfficeResponse], responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}})
+def get_all_offices(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get all offices (keyset paginated; next page cursor in X-Next-Cursor)
+
+    With `Accept: application/x-ndjson` every office is streamed, one per line (skip/limit/cursor ignored)
+    """
+    if wants_ndjson(request):
+        return OfficeService.stream_offices()
+    offices, next_cursor = OfficeService.get_all_offices(db, skip=skip, limit=limit, cursor=cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return offices
 
 @router.get("/{office_id}", response_model=OfficeResponse)
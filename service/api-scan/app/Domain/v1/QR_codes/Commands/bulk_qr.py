@@ -0,0 +1,50 @@
+"""
+    Bulk generate / rotate QR codes (same job as POST /generate-code/bulk, run inline).
+
+    Usage:
+        python -m app.Domain.v1.QR_codes.Commands.bulk_qr --mode rotate
+        python -m app.Domain.v1.QR_codes.Commands.bulk_qr --mode generate --office-id 3 --office-id 7
+
+    Images are pre-rendered into QR_RENDER_CACHE_DIR; point it at the service's cache
+    volume so the API serves them without rendering.
+"""
+import argparse
+import asyncio
+import sys
+
+from app.Domain.v1.QR_codes.Services.qr_bulk_service import BULK_MODES, create_job, get_job, run_bulk_job
+from app.Domain.v1.QR_codes.Services.qr_render_cache import qr_render_cache
+from app.Shared.Infra.redis import close_redis
+
+async def run(mode: str, office_ids, size: int) -> int:
+    try:
+        job = await create_job(mode)
+        if job is None:
+            print("Another bulk QR job is already running", file=sys.stderr)
+            return 1
+
+        await run_bulk_job(job["job_id"], mode, office_ids, size)
+        job = await get_job(job["job_id"])
+        print(
+            f"job {job['job_id']}: {job['status']} - "
+            f"{job.get('rendered', 0)}/{job.get('total', 0)} rendered, {job.get('written', 0)} written"
+        )
+        if job["status"] != "completed":
+            print(job.get("error", ""), file=sys.stderr)
+            return 1
+        return 0
+    finally:
+        qr_render_cache.shutdown()
+        await close_redis()
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk generate / rotate office QR codes")
+    parser.add_argument("--mode", choices=BULK_MODES, default="rotate")
+    parser.add_argument("--office-id", dest="office_ids", type=int, action="append", help="Limit to office (repeatable)")
+    parser.add_argument("--size", type=int, default=10, help="Pixels per QR module for pre-rendered images")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args.mode, args.office_ids, args.size)))
+
+if __name__ == "__main__":
+    main()
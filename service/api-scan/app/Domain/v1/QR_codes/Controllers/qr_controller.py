@@ -1,7 +1,10 @@
-from sqlalchemy.orm import Session
-from fastapi import HTTPException, status
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload
+from fastapi import HTTPException, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional, Tuple
 from datetime import datetime, timezone 
+import time
 
 from app.Domain.v1.QR_codes.Models.qr_model import QRCode
 from app.Domain.v1.Offices.Models.office_model import Office
@@ -9,11 +12,24 @@ from app.Domain.v1.QR_codes.Schemas.qr_schema import (
     GenerateQRCodeRequest,
     GenerateQRCodeResponse,
     QRCodeResponse,
-    OfficeInfo
+    OfficeInfo,
+    BulkQRCodeRequest,
+    BulkQRJobResponse,
+    KioskQRCodeResponse
 )
 from app.Domain.v1.QR_codes.Services.qr_service import (
-    generate_qr_code_for_office,
-    generate_qr_code_image
+    generate_unique_token,
+    build_qr_payload
+)
+from app.Domain.v1.QR_codes.Services.qr_render_cache import RenderedQR, qr_render_cache
+from app.Domain.v1.QR_codes.Services.qr_bulk_service import create_job, get_job, run_bulk_job
+from app.Domain.v1.QR_codes.Services.signed_token import signed_tokens_enabled, issue_signed_token
+from app.Shared.Core.pagination import paginate_keyset
+from app.Shared.Infra.ndjson import ndjson_response
+from app.Domain.v1.QR_codes.Services.qr_export_service import (
+    ExportFilters,
+    stream_zip_export,
+    stream_pdf_export
 )
 
 class QRCodeService:
@@ -29,26 +45,26 @@ class QRCodeService:
 
     # Format the response for the API
     @staticmethod
-    def _format_response(qr_record: QRCode, image_b64: str, office: Office) -> GenerateQRCodeResponse:
+    def _format_response(qr_record: QRCode, image_b64: str, office: OfficeInfo) -> GenerateQRCodeResponse:
         return GenerateQRCodeResponse(
             id=qr_record.id,
             office_id=qr_record.office_id,
             qr_token=qr_record.qr_token,
             is_active=qr_record.is_active,
             qr_code_image=f"data:image/png;base64,{image_b64}",
-            office=OfficeInfo(id=office.id, name=office.name, public_ip=office.public_ip),
+            office=office,
             created_at=qr_record.created_at,
             updated_at=qr_record.updated_at
         )
 
-    # Create a new QR code for a new office
+    # DB part of create (runs in the threadpool); returns what rendering needs
     @staticmethod
-    def generate_qr_code(db: Session, request: GenerateQRCodeRequest) -> GenerateQRCodeResponse:
+    def _create_qr_record(db: Session, request: GenerateQRCodeRequest) -> Tuple[QRCode, OfficeInfo, str]:
         office = QRCodeService._get_office_or_404(db, request.office_id)
-        
-        token, _, image = generate_qr_code_for_office(
-            office.id, office.name, office.public_ip
-        )
+        office_info = OfficeInfo(id=office.id, name=office.name, public_ip=office.public_ip)
+
+        token = generate_unique_token()
+        payload = build_qr_payload(office.id, office.name, office.public_ip, token)
 
         now = datetime.now(timezone.utc)
 
@@ -71,20 +87,27 @@ class QRCodeService:
                 detail=f"Failed to create QR code: {str(e)}"
             )
 
-        return QRCodeService._format_response(qr_code, image, office)
+        return qr_code, office_info, payload
 
-    # Regenerate the QR token for an existing QR code
+    # Create a new QR code for a new office
     @staticmethod
-    def regenerate_qr_token(db: Session, qr_code_id: int) -> GenerateQRCodeResponse:
+    async def generate_qr_code(db: Session, request: GenerateQRCodeRequest) -> GenerateQRCodeResponse:
+        qr_code, office_info, payload = await run_in_threadpool(QRCodeService._create_qr_record, db, request)
+        rendered = await qr_render_cache.render_png(payload)
+        return QRCodeService._format_response(qr_code, rendered.to_base64(), office_info)
+
+    # DB part of regenerate (runs in the threadpool)
+    @staticmethod
+    def _rotate_qr_record(db: Session, qr_code_id: int) -> Tuple[QRCode, OfficeInfo, str]:
         qr_code = db.query(QRCode).filter(QRCode.id == qr_code_id).first()
         if not qr_code:
             raise HTTPException(status.HTTP_404_NOT_FOUND, "QR record not found")
         
         office = QRCodeService._get_office_or_404(db, qr_code.office_id)
-        
-        new_token, _, new_image = generate_qr_code_for_office(
-            office.id, office.name, office.public_ip
-        )
+        office_info = OfficeInfo(id=office.id, name=office.name, public_ip=office.public_ip)
+
+        new_token = generate_unique_token()
+        payload = build_qr_payload(office.id, office.name, office.public_ip, new_token)
 
         qr_code.qr_token = new_token
         qr_code.updated_at = datetime.now(timezone.utc)
@@ -92,15 +115,106 @@ class QRCodeService:
         db.commit()
         db.refresh(qr_code)
 
-        return QRCodeService._format_response(qr_code, new_image, office)
+        return qr_code, office_info, payload
+
+    # Regenerate the QR token for an existing QR code
+    @staticmethod
+    async def regenerate_qr_token(db: Session, qr_code_id: int) -> GenerateQRCodeResponse:
+        qr_code, office_info, payload = await run_in_threadpool(QRCodeService._rotate_qr_record, db, qr_code_id)
+        rendered = await qr_render_cache.render_png(payload)
+        return QRCodeService._format_response(qr_code, rendered.to_base64(), office_info)
+
+    # Office data for the kiosk payload (runs in the threadpool)
+    @staticmethod
+    def _get_office_info(db: Session, office_id: int) -> OfficeInfo:
+        office = QRCodeService._get_office_or_404(db, office_id)
+        return OfficeInfo(id=office.id, name=office.name, public_ip=office.public_ip)
+
+    # Current signed rotating code for a kiosk screen
+    @staticmethod
+    async def get_kiosk_qr_code(db: Session, office_id: int) -> KioskQRCodeResponse:
+        if not signed_tokens_enabled():
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Signed QR tokens are not enabled")
+
+        office_info = await run_in_threadpool(QRCodeService._get_office_info, db, office_id)
+        token, expires_at = issue_signed_token(office_info.id)
+        # Token changes every window: memory LRU only, never the disk tier
+        rendered = await qr_render_cache.render_png(
+            build_qr_payload(office_info.id, office_info.name, office_info.public_ip, token),
+            persist=False
+        )
+
+        return KioskQRCodeResponse(
+            office=office_info,
+            qr_token=token,
+            qr_code_image=f"data:image/png;base64,{rendered.to_base64()}",
+            expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc),
+            refresh_in=max(1, expires_at - int(time.time()))
+        )
+
+    # Start a bulk generate / rotate job (runs after the response is sent)
+    @staticmethod
+    async def start_bulk_job(request: BulkQRCodeRequest, background_tasks: BackgroundTasks) -> BulkQRJobResponse:
+        job = await create_job(request.mode)
+        if job is None:
+            raise HTTPException(status.HTTP_409_CONFLICT, "Another bulk QR job is already running")
+
+        background_tasks.add_task(run_bulk_job, job["job_id"], request.mode, request.office_ids, request.size)
+        return BulkQRJobResponse(**job)
+
+    # Poll a bulk job
+    @staticmethod
+    async def get_bulk_job(job_id: str) -> BulkQRJobResponse:
+        job = await get_job(job_id)
+        if not job:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, f"Bulk job {job_id} not found")
+        return BulkQRJobResponse(**job)
 
     # Get all QR codes
     @staticmethod
-    def get_all_qr_codes(db: Session, skip: int, limit: int, is_active: Optional[bool], office_id: Optional[int]):
-        query = db.query(QRCode)
+    def get_all_qr_codes(
+        db: Session, skip: int, limit: int, is_active: Optional[bool], office_id: Optional[int],
+        cursor: Optional[str] = None
+    ) -> Tuple[List[QRCode], Optional[str]]:
+        """Newest first; office joined in the same query (no per-row lazy load). Returns (rows, next_cursor)"""
+        query = db.query(QRCode).options(joinedload(QRCode.office))
         if is_active is not None: query = query.filter(QRCode.is_active == is_active)
         if office_id is not None: query = query.filter(QRCode.office_id == office_id)
-        return query.order_by(QRCode.created_at.desc()).offset(skip).limit(limit).all()
+        if skip and not cursor:
+            # Legacy offset paging: still supported, but deep pages scan every skipped row
+            return query.order_by(QRCode.created_at.desc().nulls_last(), QRCode.id.desc()).offset(skip).limit(limit).all(), None
+        return paginate_keyset(query, QRCode.created_at, QRCode.id, limit, cursor)
+
+    @staticmethod
+    def _ndjson_qr_row(row) -> dict:
+        """Same shape as QRCodeResponse"""
+        return {
+            "id": row.id,
+            "office_id": row.office_id,
+            "qr_token": row.qr_token,
+            "is_active": row.is_active,
+            "office": {
+                "id": row.office_id,
+                "name": row.office_name,
+                "public_ip": row.office_public_ip
+            } if row.office_name is not None else None,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at
+        }
+
+    @staticmethod
+    def stream_qr_codes(is_active: Optional[bool], office_id: Optional[int]) -> StreamingResponse:
+        """Every matching QR code as NDJSON, newest first; office columns from the same join"""
+        def build_query(db: Session):
+            query = db.query(
+                QRCode.id, QRCode.office_id, QRCode.qr_token, QRCode.is_active,
+                QRCode.created_at, QRCode.updated_at,
+                Office.name.label("office_name"), Office.public_ip.label("office_public_ip")
+            ).outerjoin(Office, Office.id == QRCode.office_id)
+            if is_active is not None: query = query.filter(QRCode.is_active == is_active)
+            if office_id is not None: query = query.filter(QRCode.office_id == office_id)
+            return query.order_by(QRCode.created_at.desc().nulls_last(), QRCode.id.desc())
+        return ndjson_response(build_query, QRCodeService._ndjson_qr_row)
 
     # Get a QR code by ID
     @staticmethod
@@ -152,26 +266,41 @@ class QRCodeService:
             updated_at=qr_code.updated_at
         )
 
-    # Get a QR code image by ID
+    # Payload encoded in the QR image (stored token + current office data)
     @staticmethod
-    def get_qr_code_image(db: Session, qr_code_id: int) -> str:
-        """Get QR code image by ID (regenerate from token)"""
+    def get_qr_payload(db: Session, qr_code_id: int) -> str:
         qr_code = db.query(QRCode).filter(QRCode.id == qr_code_id).first()
         if not qr_code:
             raise HTTPException(status.HTTP_404_NOT_FOUND, f"QR code {qr_code_id} not found")
         
-        # Get office information to regenerate QR code with office data
         office = db.query(Office).filter(Office.id == qr_code.office_id).first()
         if not office:
             raise HTTPException(status.HTTP_404_NOT_FOUND, f"Office {qr_code.office_id} not found")
         
-        # Regenerate QR code image from stored token and office info
         # CRITICAL: Use the EXISTING token from database, not generate a new one
-        _, qr_data_json, qr_image = generate_qr_code_for_office(
-            office.id, office.name, office.public_ip, qr_token=qr_code.qr_token
+        return build_qr_payload(office.id, office.name, office.public_ip, qr_code.qr_token)
+
+    # Get a QR code image by ID
+    @staticmethod
+    async def get_qr_code_image(db: Session, qr_code_id: int, size: int = 10, fmt: str = "png") -> RenderedQR:
+        """Get QR code image by ID (cached render of the stored token)"""
+        payload = await run_in_threadpool(QRCodeService.get_qr_payload, db, qr_code_id)
+        return await qr_render_cache.render(payload, size, fmt=fmt)
+
+    # Streamed export of many QR codes: zip of images or a printable PDF sheet
+    @staticmethod
+    def export_qr_codes(filters: ExportFilters, export_format: str, image_format: str, size: int) -> StreamingResponse:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d")
+        if export_format == "pdf":
+            body, media_type = stream_pdf_export(filters), "application/pdf"
+        else:
+            body, media_type = stream_zip_export(filters, image_format, size), "application/zip"
+
+        return StreamingResponse(
+            body,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="qr-codes-{stamp}.{export_format}"'}
         )
-        
-        return f"data:image/png;base64,{qr_image}"
 
 
     # Delete a QR code
@@ -1,36 +1,89 @@
-from fastapi import APIRouter, Depends, status, Response
+from fastapi import APIRouter, Depends, status, Response, Request, Query, Path, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.Shared.Infra.database import get_db
+from app.Shared.Infra.database import get_db, get_read_db
 from app.Domain.v1.QR_codes.Controllers.qr_controller import QRCodeService
+from app.Domain.v1.QR_codes.Services.qr_export_service import ExportFilters
+from app.Shared.Core.pagination import NEXT_CURSOR_HEADER
+from app.Shared.Infra.ndjson import NDJSON_MEDIA_TYPE, wants_ndjson
 from app.Domain.v1.QR_codes.Schemas.qr_schema import (
     GenerateQRCodeRequest,
     QRCodeResponse,
-    GenerateQRCodeResponse
+    GenerateQRCodeResponse,
+    BulkQRCodeRequest,
+    BulkQRJobResponse,
+    KioskQRCodeResponse
 )
 
 router = APIRouter(tags=["QR Code Generation"])
 
+# Cache-Control for binary images. QR tokens grant check-in, so never shared caches.
+# Versioned URLs (?v=<etag>) can never change content; bare URLs revalidate with ETag.
+IMMUTABLE_IMAGE_CACHE = "private, max-age=31536000, immutable"
+REVALIDATE_IMAGE_CACHE = "private, no-cache"
+
 # Create a new QR code for a new office
 @router.post("", response_model=GenerateQRCodeResponse, status_code=status.HTTP_201_CREATED)
-def create_qr(request: GenerateQRCodeRequest, db: Session = Depends(get_db)):
-    return QRCodeService.generate_qr_code(db, request)
+async def create_qr(request: GenerateQRCodeRequest, db: Session = Depends(get_db)):
+    return await QRCodeService.generate_qr_code(db, request)
+
+# Bulk generate / rotate for many offices (declared before the /{qr_code_id} routes)
+@router.post("/bulk", response_model=BulkQRJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def bulk_qr(request: BulkQRCodeRequest, background_tasks: BackgroundTasks):
+    """Returns a job handle; poll GET /bulk/{job_id} for progress"""
+    return await QRCodeService.start_bulk_job(request, background_tasks)
+
+# Poll a bulk job
+@router.get("/bulk/{job_id}", response_model=BulkQRJobResponse)
+async def get_bulk_job(job_id: str):
+    return await QRCodeService.get_bulk_job(job_id)
+
+# Export many QR codes as one streamed download (zip of PNG/SVG, or printable PDF sheet)
+@router.get("/export")
+def export_qr(
+    export_format: str = Query("zip", alias="format", pattern="^(zip|pdf)$"),
+    image_format: str = Query("png", pattern="^(png|svg)$", description="Images inside the zip"),
+    size: int = Query(10, ge=1, le=40, description="Pixels per QR module (PNG)"),
+    office_ids: Optional[List[int]] = Query(None),
+    name: Optional[str] = Query(None, description="Office name contains"),
+    is_active: Optional[bool] = True
+):
+    filters = ExportFilters(office_ids=office_ids, name=name, is_active=is_active)
+    return QRCodeService.export_qr_codes(filters, export_format, image_format, size)
+
+# Kiosk screen: signed code for the current window (poll again after refresh_in seconds)
+@router.get("/kiosk/{office_id}", response_model=KioskQRCodeResponse)
+async def get_kiosk_qr(office_id: int, response: Response, db: Session = Depends(get_db)):
+    response.headers["Cache-Control"] = "no-store"
+    return await QRCodeService.get_kiosk_qr_code(db, office_id)
 
 # Regenerate the QR token for an existing QR code
 @router.post("/{qr_code_id}/regenerate", response_model=GenerateQRCodeResponse)
-def refresh_qr(qr_code_id: int, db: Session = Depends(get_db)):
+async def refresh_qr(qr_code_id: int, db: Session = Depends(get_db)):
     """Type B: Update existing record with a brand new token/image"""
-    return QRCodeService.regenerate_qr_token(db, qr_code_id)
+    return await QRCodeService.regenerate_qr_token(db, qr_code_id)
 
 # Get all QR codes
-@router.get("", response_model=List[QRCodeResponse])
+@router.get("", response_model=List[QRCodeResponse], responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}})
 def list_qr(
-    skip: int = 0, limit: int = 100, 
+    request: Request,
+    response: Response,
+    skip: int = 0, limit: int = Query(100, ge=1, le=500), 
     is_active: Optional[bool] = None, 
     office_id: Optional[int] = None, 
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    db: Session = Depends(get_read_db)
 ):
-    return QRCodeService.get_all_qr_codes(db, skip, limit, is_active, office_id)
+    """
+    Keyset paginated; next page cursor in X-Next-Cursor.
+    With `Accept: application/x-ndjson` every match is streamed, one per line (skip/limit/cursor ignored)
+    """
+    if wants_ndjson(request):
+        return QRCodeService.stream_qr_codes(is_active, office_id)
+    qr_codes, next_cursor = QRCodeService.get_all_qr_codes(db, skip, limit, is_active, office_id, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return qr_codes
 
 # Get a QR code by ID
 @router.get("/{qr_code_id}", response_model=QRCodeResponse)
@@ -46,10 +99,36 @@ def get_qr_by_token(qr_token: str, db: Session = Depends(get_db)):
 
 # Get a QR code image by ID
 @router.get("/{qr_code_id}/image")
-def get_qr_image(qr_code_id: int, db: Session = Depends(get_db)):
-    """Get QR code image by ID"""
-    image_data = QRCodeService.get_qr_code_image(db, qr_code_id)
-    return {"qr_code_image": image_data}
+async def get_qr_image(qr_code_id: int, db: Session = Depends(get_db)):
+    """Get QR code image by ID (legacy base64 JSON; prefer image.png)"""
+    rendered = await QRCodeService.get_qr_code_image(db, qr_code_id)
+    return {
+        "qr_code_image": f"data:image/png;base64,{rendered.to_base64()}",
+        "image_version": rendered.key
+    }
+
+# Get a QR code image by ID as binary PNG / SVG (ETag / 304, cacheable)
+@router.get("/{qr_code_id}/image.{fmt}", response_class=Response)
+async def get_qr_file(
+    qr_code_id: int,
+    request: Request,
+    fmt: str = Path(..., pattern="^(png|svg)$"),
+    size: int = Query(10, ge=1, le=40, description="Pixels per QR module"),
+    v: Optional[str] = Query(None, description="image_version from a previous response"),
+    db: Session = Depends(get_db)
+):
+    rendered = await QRCodeService.get_qr_code_image(db, qr_code_id, size, fmt)
+    headers = {
+        "ETag": rendered.etag,
+        "Cache-Control": IMMUTABLE_IMAGE_CACHE if v == rendered.key else REVALIDATE_IMAGE_CACHE,
+    }
+
+    # Weak comparison for If-None-Match (a proxy may have added W/)
+    if_none_match = [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")]
+    if rendered.etag in if_none_match or "*" in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=rendered.data, media_type=rendered.media_type, headers=headers)
 
 # Delete a QR code
 @router.delete("/{qr_code_id}", status_code=status.HTTP_204_NO_CONTENT)
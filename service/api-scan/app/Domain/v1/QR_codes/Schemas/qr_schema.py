@@ -1,6 +1,6 @@
 # service/api-scan/app/Domain/v1/QR_codes/Schemas/qr_schema.py
 from pydantic import BaseModel, Field, ConfigDict, validator
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 # Office info for nested response
@@ -45,6 +45,32 @@ class GenerateQRCodeResponse(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+# Kiosk screen: current signed rotating code for an office
+class KioskQRCodeResponse(BaseModel):
+    office: OfficeInfo
+    qr_token: str = Field(..., description="Signed token, valid for the current window only")
+    qr_code_image: str = Field(..., description="Base64 encoded PNG image")
+    expires_at: datetime
+    refresh_in: int = Field(..., description="Seconds until the kiosk should fetch the next code")
+
+# Bulk generate / rotate request
+class BulkQRCodeRequest(BaseModel):
+    mode: Literal["generate", "rotate"] = Field("rotate", description="generate: offices without an active QR code, rotate: new token for every active QR code")
+    office_ids: Optional[List[int]] = Field(None, description="Limit to these offices (default: all offices)")
+    size: int = Field(10, ge=1, le=40, description="Pixels per QR module for the pre-rendered images")
+
+# Bulk job handle (poll GET /generate-code/bulk/{job_id})
+class BulkQRJobResponse(BaseModel):
+    job_id: str
+    mode: str
+    status: str = Field(..., description="queued | rendering | writing | completed | failed")
+    total: int = 0
+    rendered: int = 0
+    written: int = 0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
 # Update Schema
 class UpdateQRCodeRequest(BaseModel):
     is_active: Optional[bool] = None
\ No newline at end of file
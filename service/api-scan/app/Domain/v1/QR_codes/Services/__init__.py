@@ -1,11 +1,61 @@
 from app.Domain.v1.QR_codes.Services.qr_service import (
     generate_unique_token,
     generate_qr_code_image,
-    generate_qr_code_for_office
+    generate_qr_code_for_office,
+    render_qr_png,
+    render_qr_svg,
+    render_qr_pdf_ops,
+    render_qr,
+    build_qr_payload,
+    MEDIA_TYPES
+)
+from app.Domain.v1.QR_codes.Services.qr_render_cache import (
+    RenderedQR,
+    render_key,
+    qr_render_cache
+)
+from app.Domain.v1.QR_codes.Services.qr_bulk_service import (
+    BULK_MODES,
+    create_job,
+    get_job,
+    run_bulk_job
+)
+from app.Domain.v1.QR_codes.Services.signed_token import (
+    SignedTokenError,
+    signed_tokens_enabled,
+    is_signed_token,
+    issue_signed_token,
+    verify_signed_token
+)
+from app.Domain.v1.QR_codes.Services.qr_export_service import (
+    ExportFilters,
+    stream_zip_export,
+    stream_pdf_export
 )
 
 __all__ = [
     "generate_unique_token",
     "generate_qr_code_image",
     "generate_qr_code_for_office",
-]
\ No newline at end of file
+    "render_qr_png",
+    "render_qr_svg",
+    "render_qr_pdf_ops",
+    "render_qr",
+    "build_qr_payload",
+    "MEDIA_TYPES",
+    "RenderedQR",
+    "render_key",
+    "qr_render_cache",
+    "BULK_MODES",
+    "create_job",
+    "get_job",
+    "run_bulk_job",
+    "SignedTokenError",
+    "signed_tokens_enabled",
+    "is_signed_token",
+    "issue_signed_token",
+    "verify_signed_token",
+    "ExportFilters",
+    "stream_zip_export",
+    "stream_pdf_export",
+]
@@ -0,0 +1,170 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, update
+
+from app.Domain.v1.QR_codes.Models.qr_model import QRCode
+from app.Domain.v1.Offices.Models.office_model import Office
+from app.Domain.v1.QR_codes.Services.qr_service import generate_unique_token, build_qr_payload
+from app.Domain.v1.QR_codes.Services.qr_render_cache import qr_render_cache
+from app.Shared.Infra.database import SessionLocal
+from app.Shared.Infra.redis import get_redis
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+BULK_MODES = ("generate", "rotate")
+
+# Only one bulk job at a time: two rotations racing would leave half the offices on stale tokens
+_LOCK_KEY = "qr:bulk:lock"
+
+def _job_key(job_id: str) -> str:
+    return f"qr:bulk:job:{job_id}"
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+# ==================== Job state (Redis hash, polled by clients) ====================
+
+async def create_job(mode: str) -> Optional[Dict[str, str]]:
+    """Register a queued job; None if another bulk job holds the lock"""
+    client = await get_redis()
+    job_id = uuid.uuid4().hex
+
+    acquired = await client.set(_LOCK_KEY, job_id, nx=True, ex=settings.QR_BULK_LOCK_TTL)
+    if not acquired:
+        return None
+
+    job = {
+        "job_id": job_id,
+        "mode": mode,
+        "status": "queued",
+        "total": 0,
+        "rendered": 0,
+        "written": 0,
+        "created_at": _now(),
+    }
+    pipe = client.pipeline(transaction=True)
+    pipe.hset(_job_key(job_id), mapping=job)
+    pipe.expire(_job_key(job_id), settings.QR_BULK_JOB_TTL)
+    await pipe.execute()
+    return await get_job(job_id)
+
+async def get_job(job_id: str) -> Optional[Dict[str, str]]:
+    client = await get_redis()
+    job = await client.hgetall(_job_key(job_id))
+    return job or None
+
+async def _update_job(job_id: str, **fields) -> None:
+    try:
+        client = await get_redis()
+        await client.hset(_job_key(job_id), mapping=fields)
+    except Exception as e:
+        logger.warning("qr_bulk_job_update_failed", job_id=job_id, error=str(e))
+
+async def _release_lock(job_id: str) -> None:
+    try:
+        client = await get_redis()
+        if await client.get(_LOCK_KEY) == job_id:
+            await client.delete(_LOCK_KEY)
+    except Exception as e:
+        logger.warning("qr_bulk_lock_release_failed", job_id=job_id, error=str(e))
+
+# ==================== DB phases (threadpool, own session) ====================
+
+def _plan_bulk(mode: str, office_ids: Optional[List[int]]) -> List[Dict]:
+    """
+        New token + QR payload per target.
+        generate: offices without an active QR code. rotate: every active QR code.
+    """
+    db = SessionLocal()
+    try:
+        office_query = db.query(Office)
+        if office_ids:
+            office_query = office_query.filter(Office.id.in_(office_ids))
+        offices = {office.id: office for office in office_query.order_by(Office.id).all()}
+
+        active_codes = db.query(QRCode).filter(
+            QRCode.is_active.is_(True),
+            QRCode.office_id.in_(list(offices))
+        ).order_by(QRCode.id).all() if offices else []
+
+        items = []
+        if mode == "rotate":
+            for qr_code in active_codes:
+                office = offices[qr_code.office_id]
+                items.append({"qr_code_id": qr_code.id, "office_id": office.id, "office": office})
+        else:
+            covered = {qr_code.office_id for qr_code in active_codes}
+            for office in offices.values():
+                if office.id not in covered:
+                    items.append({"qr_code_id": None, "office_id": office.id, "office": office})
+
+        for item in items:
+            office = item.pop("office")
+            item["qr_token"] = generate_unique_token()
+            item["payload"] = build_qr_payload(office.id, office.name, office.public_ip, item["qr_token"])
+        return items
+    finally:
+        db.close()
+
+def _write_bulk(items: List[Dict]) -> int:
+    """All token updates / inserts in one transaction - every office switches together or none does"""
+    now = datetime.now(timezone.utc)
+    updates = [
+        {"id": item["qr_code_id"], "qr_token": item["qr_token"], "updated_at": now}
+        for item in items if item["qr_code_id"] is not None
+    ]
+    inserts = [
+        {"office_id": item["office_id"], "qr_token": item["qr_token"], "is_active": True,
+         "created_at": now, "updated_at": now}
+        for item in items if item["qr_code_id"] is None
+    ]
+
+    db = SessionLocal()
+    try:
+        if updates:
+            # ORM bulk UPDATE by primary key (executemany)
+            db.execute(update(QRCode), updates)
+        if inserts:
+            db.execute(insert(QRCode), inserts)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return len(updates) + len(inserts)
+
+# ==================== Orchestration ====================
+
+async def run_bulk_job(job_id: str, mode: str, office_ids: Optional[List[int]] = None, size: int = 10) -> None:
+    """
+        plan (DB) -> render all images in the process pool (pre-populates the cache)
+        -> write every token in one transaction. Progress is kept in the job hash.
+    """
+    try:
+        items = await run_in_threadpool(_plan_bulk, mode, office_ids)
+        await _update_job(job_id, status="rendering", total=len(items))
+
+        # Render before the write: new tokens go live with their images already cached
+        batch_size = max(1, settings.QR_RENDER_WORKERS * 4)
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            await asyncio.gather(*(qr_render_cache.render_png(item["payload"], size) for item in batch))
+            await _update_job(job_id, rendered=start + len(batch))
+
+        await _update_job(job_id, status="writing")
+        written = await run_in_threadpool(_write_bulk, items)
+
+        await _update_job(job_id, status="completed", written=written, finished_at=_now())
+        logger.info("qr_bulk_job_completed", job_id=job_id, mode=mode, written=written)
+    except Exception as e:
+        await _update_job(job_id, status="failed", error=str(e), finished_at=_now())
+        logger.error("qr_bulk_job_failed", job_id=job_id, mode=mode, error=str(e))
+    finally:
+        await _release_lock(job_id)
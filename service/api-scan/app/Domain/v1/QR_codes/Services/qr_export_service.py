@@ -0,0 +1,115 @@
+import asyncio
+import re
+import zipfile
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.Domain.v1.QR_codes.Models.qr_model import QRCode
+from app.Domain.v1.Offices.Models.office_model import Office
+from app.Domain.v1.QR_codes.Services.qr_service import build_qr_payload
+from app.Domain.v1.QR_codes.Services.qr_render_cache import RenderedQR, qr_render_cache
+from app.Shared.Infra.database import ReadSessionLocal
+from app.Shared.Infra.streaming_zip import ZipStream
+from app.Shared.Infra.streaming_pdf import PdfStream, pdf_text, A4_WIDTH, A4_HEIGHT
+
+# QR codes fetched (and rendered concurrently) per round trip
+EXPORT_BATCH_SIZE = 200
+
+# Printed QR side length on a sheet page, in points (~14 cm)
+SHEET_QR_SIZE = 400
+
+@dataclass(frozen=True)
+class ExportFilters:
+    office_ids: Optional[List[int]] = None
+    name: Optional[str] = None
+    is_active: Optional[bool] = True
+
+@dataclass(frozen=True)
+class ExportItem:
+    qr_code_id: int
+    office_id: int
+    office_name: str
+    public_ip: Optional[str]
+    payload: str
+
+def _fetch_export_batch(filters: ExportFilters, after_id: int) -> List[ExportItem]:
+    """Keyset page on qr_codes.id; short-lived session so the stream never pins a connection"""
+    db = ReadSessionLocal()
+    try:
+        query = db.query(
+            QRCode.id, QRCode.qr_token, Office.id.label("office_id"), Office.name, Office.public_ip
+        ).join(
+            Office, Office.id == QRCode.office_id
+        ).filter(
+            QRCode.id > after_id
+        )
+        if filters.is_active is not None:
+            query = query.filter(QRCode.is_active == filters.is_active)
+        if filters.office_ids:
+            query = query.filter(QRCode.office_id.in_(filters.office_ids))
+        if filters.name:
+            query = query.filter(Office.name.ilike(f"%{filters.name}%"))
+
+        rows = query.order_by(QRCode.id).limit(EXPORT_BATCH_SIZE).all()
+    finally:
+        db.close()
+
+    return [
+        ExportItem(
+            qr_code_id=row.id,
+            office_id=row.office_id,
+            office_name=row.name,
+            public_ip=row.public_ip,
+            payload=build_qr_payload(row.office_id, row.name, row.public_ip, row.qr_token)
+        )
+        for row in rows
+    ]
+
+async def iter_export_assets(
+    filters: ExportFilters, fmt: str, size: int
+) -> AsyncIterator[Tuple[ExportItem, RenderedQR]]:
+    """Batches of QR codes with their cached (or freshly pooled) renders"""
+    after_id = 0
+    while True:
+        batch = await run_in_threadpool(_fetch_export_batch, filters, after_id)
+        if not batch:
+            return
+        assets = await asyncio.gather(*(qr_render_cache.render(item.payload, size, fmt=fmt, persist=False) for item in batch))
+        for item, asset in zip(batch, assets):
+            yield item, asset
+        after_id = batch[-1].qr_code_id
+
+def _entry_name(item: ExportItem, fmt: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", item.office_name).strip("-").lower() or "office"
+    return f"{item.office_id:04d}-{slug}-qr{item.qr_code_id}.{fmt}"
+
+async def stream_zip_export(filters: ExportFilters, fmt: str, size: int) -> AsyncIterator[bytes]:
+    """One image per QR code; PNGs are stored as-is (already compressed)"""
+    archive = ZipStream(zipfile.ZIP_STORED if fmt == "png" else zipfile.ZIP_DEFLATED)
+    async for item, asset in iter_export_assets(filters, fmt, size):
+        yield archive.add_file(_entry_name(item, fmt), asset.data)
+    yield archive.close()
+
+def _sheet_page(item: ExportItem, qr_ops: bytes) -> bytes:
+    """A4 page: office heading, vector QR centred, reference footer"""
+    dimension = int(qr_ops.split(b"\n", 1)[0].rsplit(b" ", 1)[1])
+    scale = SHEET_QR_SIZE / dimension
+    x = (A4_WIDTH - SHEET_QR_SIZE) / 2
+    y = (A4_HEIGHT - SHEET_QR_SIZE) / 2 - 40
+
+    content = pdf_text(item.office_name, 72, A4_HEIGHT - 96, 24)
+    if item.public_ip:
+        content += pdf_text(f"Office IP: {item.public_ip}", 72, A4_HEIGHT - 120, 12)
+    content += b"q %.4f 0 0 %.4f %.2f %.2f cm\n" % (scale, scale, x, y) + qr_ops + b"Q\n"
+    content += pdf_text(f"Office #{item.office_id} - QR #{item.qr_code_id}", 72, 72, 10)
+    return content
+
+async def stream_pdf_export(filters: ExportFilters) -> AsyncIterator[bytes]:
+    """Printable sheet: one A4 page per QR code, vector modules (1 unit per module, scaled on the page)"""
+    document = PdfStream()
+    yield document.begin()
+    async for item, asset in iter_export_assets(filters, "pdf", 1):
+        yield document.add_page(_sheet_page(item, asset.data))
+    yield document.close()
@@ -0,0 +1,227 @@
+import asyncio
+import base64
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app.Domain.v1.QR_codes.Services.qr_service import render_qr, MEDIA_TYPES
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when render output changes (qrcode/Pillow upgrade, colors, error correction)
+RENDER_VERSION = "v1"
+
+def render_key(payload: str, size: int = 10, border: int = 4, fmt: str = "png") -> str:
+    """Content key of one rendered image: payload (token + office data) and render options"""
+    digest = hashlib.sha256()
+    digest.update(f"{RENDER_VERSION}|{fmt}|{size}|{border}|".encode())
+    digest.update(payload.encode())
+    return digest.hexdigest()
+
+@dataclass(frozen=True)
+class RenderedQR:
+    key: str
+    data: bytes
+    fmt: str = "png"
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.fmt]
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag - same key means byte-identical asset"""
+        return f'"{self.key}"'
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.data).decode()
+
+class QRRenderCache:
+    """
+        Rendered QR assets (PNG / SVG / PDF fragment): in-memory LRU -> disk -> process pool.
+        Rendering never runs on the event loop or in a request thread.
+        Short-lived payloads (rotating kiosk tokens) and one-off bulk exports pass persist=False
+        and stay in memory only, so they do not leave a file behind.
+        The disk tier is capped at max_disk_bytes: every prune_every writes, least recently used
+        files (reads refresh mtime) are removed until it is back under 90% of the cap.
+    """
+
+    def __init__(
+        self, max_entries: int, cache_dir: str, workers: int, max_disk_bytes: int, prune_every: int = 100
+    ):
+        self._max_entries = max_entries
+        self._cache_dir = cache_dir
+        self._workers = workers
+        self._max_disk_bytes = max_disk_bytes
+        self._prune_every = prune_every
+        self._writes_since_prune = 0
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    # ==================== Memory ====================
+
+    def _get_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+            return data
+
+    def _put_memory(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_entries:
+                self._memory.popitem(last=False)
+
+    # ==================== Disk ====================
+
+    def _disk_path(self, key: str, fmt: str) -> str:
+        return os.path.join(self._cache_dir, key[:2], f"{key}.{fmt}")
+
+    def _read_disk(self, key: str, fmt: str) -> Optional[bytes]:
+        path = self._disk_path(key, fmt)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Recently used files survive pruning
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("qr_render_cache_read_failed", key=key, error=str(e))
+            return None
+
+    def _write_disk(self, key: str, fmt: str, data: bytes) -> None:
+        """Atomic write (tmp file + rename) so readers never see a partial file"""
+        path = self._disk_path(key, fmt)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("qr_render_cache_write_failed", key=key, error=str(e))
+            return
+
+        with self._lock:
+            self._writes_since_prune += 1
+            due = self._writes_since_prune >= self._prune_every
+            if due:
+                self._writes_since_prune = 0
+        if due:
+            self.prune_disk()
+
+    def prune_disk(self) -> int:
+        """Remove least recently used files while over the cap; returns files removed"""
+        if not self._prune_lock.acquire(blocking=False):
+            return 0 # another thread is pruning
+        try:
+            files = []
+            for root, _, names in os.walk(self._cache_dir):
+                for name in names:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in files)
+            if total <= self._max_disk_bytes:
+                return 0
+
+            target = self._max_disk_bytes * 0.9
+            removed = 0
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning("qr_render_cache_prune_failed", path=path, error=str(e))
+                    continue
+                total -= size
+                removed += 1
+            logger.info("qr_render_cache_pruned", removed=removed, bytes=total)
+            return removed
+        finally:
+            self._prune_lock.release()
+
+    # ==================== Render pool ====================
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: workers must not inherit the DB engine / Redis sockets of this process
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def _render(self, key: str, payload: str, fmt: str, size: int, border: int, persist: bool) -> bytes:
+        loop = asyncio.get_running_loop()
+
+        data = await loop.run_in_executor(None, self._read_disk, key, fmt) if persist else None
+        if data is None:
+            try:
+                data = await loop.run_in_executor(self._get_pool(), render_qr, payload, fmt, size, border)
+            except BrokenProcessPool:
+                # A worker died: next render starts a fresh pool
+                self._pool = None
+                raise
+            if persist:
+                await loop.run_in_executor(None, self._write_disk, key, fmt, data)
+
+        self._put_memory(key, data)
+        return data
+
+    async def render(
+        self, payload: str, size: int = 10, border: int = 4, fmt: str = "png", persist: bool = True
+    ) -> RenderedQR:
+        """Cached asset for a payload; concurrent misses on the same key share one render"""
+        key = render_key(payload, size, border, fmt)
+
+        data = self._get_memory(key)
+        if data is not None:
+            return RenderedQR(key, data, fmt)
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._render(key, payload, fmt, size, border, persist))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return RenderedQR(key, await asyncio.shield(pending), fmt)
+
+    async def render_png(self, payload: str, size: int = 10, border: int = 4, persist: bool = True) -> RenderedQR:
+        return await self.render(payload, size, border, "png", persist)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+# Singleton instance
+qr_render_cache = QRRenderCache(
+    max_entries=settings.QR_RENDER_CACHE_ENTRIES,
+    cache_dir=settings.QR_RENDER_CACHE_DIR,
+    workers=settings.QR_RENDER_WORKERS,
+    max_disk_bytes=settings.QR_RENDER_CACHE_MAX_MB * 1024 * 1024
+)
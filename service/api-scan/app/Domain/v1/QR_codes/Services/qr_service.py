@@ -1,4 +1,5 @@
 import qrcode
+from qrcode.image.svg import SvgPathImage
 import io
 import base64
 import secrets
@@ -11,21 +12,91 @@ def generate_unique_token(length: int = 32) -> str:
     characters = string.ascii_letters + string.digits
     return ''.join(secrets.choice(characters) for _ in range(length))
 
-def generate_qr_code_image(data: str, size: int = 10, border: int = 4) -> str:
-    """Generates the actual PNG bytes and encodes to Base64"""
+# Output formats: media type of each rendered asset ("pdf" is a page content stream fragment)
+MEDIA_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+}
+
+def _make_qr(data: str, size: int, border: int, image_factory=None) -> qrcode.QRCode:
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
         box_size=size,
         border=border,
+        image_factory=image_factory
     )
     qr.add_data(data)
     qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
+    return qr
+
+def render_qr_png(data: str, size: int = 10, border: int = 4) -> bytes:
+    """Generates the actual PNG bytes (CPU bound - run it in the render pool)"""
+    img = _make_qr(data, size, border).make_image(fill_color="black", back_color="white")
     buffer = io.BytesIO()
     img.save(buffer, format='PNG')
-    return base64.b64encode(buffer.getvalue()).decode()
+    return buffer.getvalue()
+
+def render_qr_svg(data: str, size: int = 10, border: int = 4) -> bytes:
+    """Vector output: a single <path>, scales to any print size"""
+    img = _make_qr(data, size, border, image_factory=SvgPathImage).make_image()
+    buffer = io.BytesIO()
+    img.save(buffer)
+    return buffer.getvalue()
+
+def render_qr_pdf_ops(data: str, size: int = 1, border: int = 4) -> bytes:
+    """
+        PDF content-stream fragment drawing the modules as filled rectangles
+        (origin bottom-left, `size` points per module). Callers position it with `cm`.
+        First line is a comment carrying the side length in modules: "% qr-dimension N".
+    """
+    matrix = _make_qr(data, size, border).get_matrix()
+    dimension = len(matrix)
+    ops = [f"% qr-dimension {dimension}".encode(), b"0 g"]
+    for row_index, row in enumerate(matrix):
+        y = (dimension - row_index - 1) * size
+        column = 0
+        while column < dimension:
+            if not row[column]:
+                column += 1
+                continue
+            # Merge horizontal runs of dark modules into one rectangle
+            run_start = column
+            while column < dimension and row[column]:
+                column += 1
+            ops.append(f"{run_start * size} {y} {(column - run_start) * size} {size} re".encode())
+    ops.append(b"f")
+    return b"\n".join(ops) + b"\n"
+
+RENDERERS = {
+    "png": render_qr_png,
+    "svg": render_qr_svg,
+    "pdf": render_qr_pdf_ops,
+}
+
+def render_qr(data: str, fmt: str = "png", size: int = 10, border: int = 4) -> bytes:
+    """Render in one of RENDERERS' formats (picklable entry point for the render pool)"""
+    return RENDERERS[fmt](data, size, border)
+
+def generate_qr_code_image(data: str, size: int = 10, border: int = 4) -> str:
+    """Generates the actual PNG bytes and encodes to Base64"""
+    return base64.b64encode(render_qr_png(data, size, border)).decode()
+
+def build_qr_payload(
+    office_id: int,
+    office_name: str,
+    office_public_ip: str = None,
+    qr_token: str = None
+) -> str:
+    """JSON payload encoded in the QR image"""
+    qr_data = {
+        "token": qr_token,
+        "office_id": office_id,
+        "office_name": office_name,
+        "public_ip": office_public_ip
+    }
+    return json.dumps(qr_data)
 
 def generate_qr_code_for_office(
     office_id: int, 
@@ -38,14 +109,7 @@ def generate_qr_code_for_office(
     if qr_token is None:
         qr_token = generate_unique_token()
     
-    qr_data = {
-        "token": qr_token,
-        "office_id": office_id,
-        "office_name": office_name,
-        "public_ip": office_public_ip
-    }
-    
-    qr_data_json = json.dumps(qr_data)
+    qr_data_json = build_qr_payload(office_id, office_name, office_public_ip, qr_token)
     qr_image = generate_qr_code_image(qr_data_json)
     
     return qr_token, qr_data_json, qr_image
\ No newline at end of file
@@ -0,0 +1,79 @@
+import base64
+import hashlib
+import hmac
+import time
+from typing import Dict, Optional, Tuple
+
+from app.Shared.Core.config import settings
+
+# v1.{kid}.{office_id}.{window}.{signature}
+TOKEN_VERSION = "v1"
+
+# Truncated HMAC-SHA256 (128 bits) keeps the QR payload small
+_SIGNATURE_BYTES = 16
+
+class SignedTokenError(ValueError):
+    """Signed QR token is malformed, forged, expired or signed with an unknown key"""
+
+def parse_key_list(raw: str) -> Dict[str, bytes]:
+    """"kid1:secret1,kid2:secret2" -> {kid: secret} (QR_SIGNING_KEYS, KIOSK_SYNC_KEYS)"""
+    keys = {}
+    for entry in raw.split(","):
+        kid, _, secret = entry.strip().partition(":")
+        if kid and secret:
+            keys[kid] = secret.encode()
+    return keys
+
+# Key material lives in memory only; loaded once per process
+_KEYS: Dict[str, bytes] = parse_key_list(settings.QR_SIGNING_KEYS)
+
+def signed_tokens_enabled() -> bool:
+    return settings.QR_SIGNED_TOKENS_ENABLED and settings.QR_SIGNING_ACTIVE_KID in _KEYS
+
+def is_signed_token(token: str) -> bool:
+    return token.startswith(f"{TOKEN_VERSION}.")
+
+def current_window(now: Optional[float] = None) -> int:
+    return int((time.time() if now is None else now) // settings.QR_TOKEN_WINDOW_SECONDS)
+
+def _sign(key: bytes, message: str) -> str:
+    digest = hmac.new(key, message.encode(), hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+def issue_signed_token(office_id: int, now: Optional[float] = None) -> Tuple[str, int]:
+    """Token for the current window with the active key; returns (token, expires_at epoch)"""
+    kid = settings.QR_SIGNING_ACTIVE_KID
+    if kid not in _KEYS:
+        raise SignedTokenError(f"Signing key '{kid}' is not configured")
+
+    window = current_window(now)
+    message = f"{TOKEN_VERSION}.{kid}.{office_id}.{window}"
+    expires_at = (window + 1) * settings.QR_TOKEN_WINDOW_SECONDS
+    return f"{message}.{_sign(_KEYS[kid], message)}", expires_at
+
+def verify_signed_token(token: str, now: Optional[float] = None) -> int:
+    """
+        HMAC check against in-memory keys - no DB lookup.
+        Accepts the current window plus QR_TOKEN_WINDOW_SKEW previous ones (scan latency).
+        Returns the office id.
+    """
+    parts = token.split(".")
+    if len(parts) != 5 or parts[0] != TOKEN_VERSION:
+        raise SignedTokenError("Malformed QR token")
+
+    _, kid, office_id, window, signature = parts
+    key = _KEYS.get(kid)
+    if key is None:
+        raise SignedTokenError("QR token signed with an unknown key")
+    if not office_id.isdigit() or not window.isdigit():
+        raise SignedTokenError("Malformed QR token")
+
+    expected = _sign(key, f"{TOKEN_VERSION}.{kid}.{office_id}.{window}")
+    if not hmac.compare_digest(expected, signature):
+        raise SignedTokenError("Invalid QR token signature")
+
+    now_window = current_window(now)
+    if not now_window - settings.QR_TOKEN_WINDOW_SKEW <= int(window) <= now_window:
+        raise SignedTokenError("QR code has expired, scan the current code")
+
+    return int(office_id)
@@ -1,3 +1,4 @@
 from app.Domain.v1.Users.Models.user_model import User
+from app.Domain.v1.Users.Models.staff_info_model import StaffInfo
 
-__all__ = ["User"]
\ No newline at end of file
+__all__ = ["User", "StaffInfo"]
\ No newline at end of file
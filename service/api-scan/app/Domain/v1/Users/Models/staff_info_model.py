@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.Shared.Infra.database import Base
+
+class StaffInfo(Base):
+    """Staff profile matching Laravel api-staff-management service (staff_info table)
+    Note: Staff management is handled by api-staff-management service.
+    Only the columns api-scan reads (names for history / exports, roster for auto-absent) are mapped.
+    """
+
+    __tablename__ = "staff_info"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Has index: staff_info_user_id_index
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    office_id = Column(Integer, ForeignKey('offices.id', ondelete='CASCADE'), nullable=False, index=True)
+    # Has index: staff_info_full_name_index
+    full_name = Column(String, nullable=False, index=True)
+    join_date = Column(Date, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,3 +1,3 @@
-from app.Domain.v1.Users.Models import User
+from app.Domain.v1.Users.Models import User, StaffInfo
 
-__all__ = ["User"]
\ No newline at end of file
+__all__ = ["User", "StaffInfo"]
\ No newline at end of file
@@ -1,8 +1,18 @@
 from .config import settings
 from .logging import setup_logging, get_logger
+from .responses import ORJSONResponse, model_response
+from .pagination import NEXT_CURSOR_HEADER, encode_key, decode_key, encode_cursor, decode_cursor, paginate_keyset
 
 __all__ = [
     "settings",
     "setup_logging",
-    "get_logger"
+    "get_logger",
+    "NEXT_CURSOR_HEADER",
+    "encode_key",
+    "decode_key",
+    "encode_cursor",
+    "decode_cursor",
+    "paginate_keyset",
+    "ORJSONResponse",
+    "model_response"
 ]
\ No newline at end of file
@@ -13,6 +13,31 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "attendance_db"
     POSTGRES_USER: str = "useradmin"
     POSTGRES_PASSWORD: str = "useradminpassword"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+
+    # Optional streaming read replica (same db / credentials); unset = every session on the primary
+    POSTGRES_REPLICA_HOST: Optional[str] = None
+    POSTGRES_REPLICA_PORT: int = 5432
+    POSTGRES_REPLICA_CONNECT_TIMEOUT: int = 2 # seconds, a dead replica must not stall reads
+    REPLICA_MAX_LAG_SECONDS: float = 5.0 # above this, read sessions fall back to the primary
+    REPLICA_LAG_CHECK_INTERVAL: float = 2.0 # seconds between lag probes per worker
+
+    # SQL instrumentation (Shared/Infra/db_metrics.py); X-DB-* response headers only with DEBUG
+    DB_SLOW_QUERY_MS: int = 200 # statements at least this slow are logged (parameters redacted)
+    DB_N_PLUS_ONE_THRESHOLD: int = 10 # one statement repeated more often per request is flagged
+    DB_PREPARE_THRESHOLD: Optional[int] = 5 # executions before psycopg prepares server-side (None = never)
+
+    # Worker threads for sync routes and admission control (Shared/Infra/admission.py)
+    API_WORKER_THREADS: Optional[int] = None # default and cap: DB_POOL_SIZE + DB_MAX_OVERFLOW
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_CAPACITY: Optional[int] = None # requests running at once (default: worker threads)
+    ADMISSION_RESERVE_CRITICAL: int = 8 # slots only check-in / check-out may use (kept below capacity)
+    ADMISSION_QUEUE_CRITICAL: int = 200 # waiting check-in / check-out requests
+    ADMISSION_QUEUE_STANDARD: int = 50
+    ADMISSION_QUEUE_BACKGROUND: int = 20 # dashboard, reports, exports
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0 # seconds queued before 503 (below the gateway timeout)
+    ADMISSION_RETRY_AFTER: int = 2 # seconds, Retry-After on 503
 
     # Redis information
     REDIS_HOST: str = "redis"
@@ -20,6 +45,68 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_CACHE_EXPIRE: int = 300 # 5 minutes
 
+    # Dashboard live counters (Redis hashes per day / per office)
+    DASHBOARD_COUNTERS_TTL: int = 172800 # 2 days
+    DASHBOARD_COUNTERS_REBUILD_LOCK_TTL: int = 30 # seconds; one reader rebuilds a cold day, the others read SQL
+    DASHBOARD_TREND_CACHE_TTL: int = 86400 # closed-month trends, per rollup watermark
+
+    # Dashboard real-time stream (Redis pub/sub fan-out)
+    DASHBOARD_STREAM_CHANNEL: str = "dashboard:events"
+    DASHBOARD_STREAM_FLUSH_INTERVAL: float = 1.0 # seconds, bursts are coalesced into one frame
+    DASHBOARD_STREAM_QUEUE_SIZE: int = 16 # frames buffered per connection before dropping oldest
+    DASHBOARD_STREAM_HEARTBEAT: int = 15 # seconds between keep-alive frames
+
+    # QR image rendering (memory LRU -> disk cache -> process pool)
+    QR_RENDER_CACHE_DIR: str = "/tmp/qr-render-cache"
+    QR_RENDER_CACHE_ENTRIES: int = 512
+    QR_RENDER_CACHE_MAX_MB: int = 256 # disk tier cap, least recently used files pruned
+    QR_RENDER_WORKERS: int = 2
+
+    # Bulk QR generate / rotate jobs
+    QR_BULK_JOB_TTL: int = 86400 # job status kept for polling (1 day)
+    QR_BULK_LOCK_TTL: int = 900 # one bulk job at a time; lock self-expires if a worker dies
+
+    # Signed rotating QR tokens (kiosk mode): HMAC over office id + time window.
+    # Rotate keys by adding the new kid to QR_SIGNING_KEYS, switching QR_SIGNING_ACTIVE_KID,
+    # then removing the old kid once its last window has passed.
+    QR_SIGNED_TOKENS_ENABLED: bool = False
+    QR_SIGNING_KEYS: str = "" # "kid1:secret1,kid2:secret2"
+    QR_SIGNING_ACTIVE_KID: str = ""
+    QR_TOKEN_WINDOW_SECONDS: int = 30
+    QR_TOKEN_WINDOW_SKEW: int = 1 # previous windows still accepted (scan/submit latency)
+
+    # Bulk absence requests (POST /scan/permission-request/bulk)
+    PERMISSION_MAX_DAYS: int = 31 # days one request may cover
+
+    # Offline kiosk batch sync (Attendances/Services/kiosk_sync.py): batches are signed per device
+    KIOSK_SYNC_KEYS: str = "" # "device1:secret1,device2:secret2"
+    KIOSK_SYNC_MAX_SCANS: int = 500 # scans per batch
+    KIOSK_SYNC_MAX_AGE_HOURS: int = 72 # older queued scans are rejected
+    KIOSK_SYNC_MAX_CLOCK_SKEW: int = 300 # seconds a device clock may run ahead
+
+    # Scheduled jobs (Celery worker + beat, Shared/Infra/celery_app.py); broker on its own Redis db
+    CELERY_REDIS_DB: int = 3
+    JOB_LOCK_TTL: int = 1800 # seconds; a job's lock self-expires if its worker dies
+    ATTENDANCE_CLOSE_DAY_HOUR: int = 0 # Bangkok time the previous day is closed (auto-checkout, auto-absent)
+    ATTENDANCE_CLOSE_DAY_MINUTE: int = 30
+    AUTO_ABSENT_WEEKDAYS: str = "0,1,2,3,4" # working days (Monday = 0); no auto-absent on the others
+    KIOSK_SCAN_RETENTION_DAYS: int = 30 # kiosk_scans ledger rows kept for duplicate detection
+
+    # attendances monthly range partitions (see Shared/Infra/partitioning.py)
+    ATTENDANCE_PARTITION_MONTHS_AHEAD: int = 3 # future months pre-created
+    ATTENDANCE_RETENTION_MONTHS: int = 0 # months kept attached (0 = keep forever)
+    ATTENDANCE_RETENTION_MODE: str = "archive" # archive: move to ATTENDANCE_ARCHIVE_SCHEMA, detach: leave standalone, drop
+    ATTENDANCE_ARCHIVE_SCHEMA: str = "archive"
+
+    # Columnar archive of closed attendance months (Attendance_Records/Services/columnar_archive.py)
+    ATTENDANCE_ARCHIVE_DIR: str = "/var/lib/api-scan/attendance-archive"
+    ATTENDANCE_ARCHIVE_CLOSED_AFTER_DAYS: int = 7 # a month is archivable this long after its last day
+
+    # Analytics user x day cubes (Analytics/Services/attendance_cube.py)
+    ANALYTICS_CUBE_CACHE_MONTHS: int = 36 # month cubes kept in memory per worker
+    ANALYTICS_OPEN_MONTH_TTL: int = 300 # seconds before a month that can still change is rebuilt
+    ANALYTICS_MAX_DAYS: int = 731 # widest range one request may load
+
     # External APIs
     # STAFF_API_URL: str = "http://nginx-laravel:8002/api"
     STAFF_API_URL: str = "http://localhost:8002/api" 
@@ -0,0 +1,84 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+# Response header carrying the opaque cursor of the next page (list bodies stay plain arrays)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_key(values: List[Any]) -> str:
+    """Opaque cursor: urlsafe base64 of the last row's sort key (JSON-serialisable values)"""
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+def decode_key(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    return encode_key([created_at.isoformat() if created_at else None, row_id])
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    created_at, row_id = decode_key(cursor, 2)
+    try:
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def paginate_keyset(
+    query: Query,
+    created_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True
+) -> Tuple[List[Any], Optional[str]]:
+    """
+        Keyset page ordered by (created_at, id); rows with NULL created_at come last.
+        Rows with a created_at are paged by one row-value comparison, a range seek on the
+        (created_at, id) index in the list's own order; the NULL tail is paged separately by id
+        once they run out. Unlike OFFSET, skipped rows are never scanned.
+        Returns (rows, next_cursor or None).
+    """
+    in_tail = False
+    rows: List[Any] = []
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        in_tail = created_at is None
+
+    if not in_tail:
+        head = query.filter(created_column.is_not(None))
+        if cursor:
+            key = tuple_(created_column, id_column)
+            head = head.filter(key < (created_at, row_id) if descending else key > (created_at, row_id))
+        if descending:
+            head = head.order_by(created_column.desc().nulls_last(), id_column.desc())
+        else:
+            head = head.order_by(created_column.asc().nulls_last(), id_column.asc())
+        rows = head.limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        # Head exhausted: continue into the NULL tail, ordered by id alone
+        tail = query.filter(created_column.is_(None))
+        if in_tail:
+            tail = tail.filter(id_column < row_id if descending else id_column > row_id)
+        tail = tail.order_by(id_column.desc() if descending else id_column.asc())
+        rows += tail.limit(limit + 1 - len(rows)).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
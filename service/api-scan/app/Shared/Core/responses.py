@@ -0,0 +1,38 @@
+from decimal import Decimal
+from typing import Any, Mapping, Optional
+
+import orjson
+from fastapi.responses import ORJSONResponse as _BaseORJSONResponse
+from pydantic import BaseModel
+
+def _orjson_default(value: Any) -> Any:
+    """Types orjson does not encode natively"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """
+        orjson encode with pydantic models / Decimal support (also used for SSE frames).
+        UTC datetimes end in "Z" like pydantic's own JSON, so payloads keep their previous format.
+    """
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+class ORJSONResponse(_BaseORJSONResponse):
+    """Default response class of the app: orjson instead of the stdlib json encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def model_response(
+    content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None
+) -> ORJSONResponse:
+    """
+        Send an already-built response model as-is.
+        FastAPI does not re-validate a returned Response against `response_model`
+        (the decorator's response_model still documents the route), so trusted payloads
+        built from DB rows are encoded once, straight by orjson.
+    """
+    return ORJSONResponse(content=content, status_code=status_code, headers=headers)
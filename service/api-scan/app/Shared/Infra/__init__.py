@@ -1,11 +1,33 @@
-from .database import get_db, Base
-from .redis import get_redis, close_redis
+from .database import get_db, get_read_db, Base
+from .redis import get_redis, get_sync_redis, close_redis
+from .streaming_zip import ZipStream, stream_zip
+from .streaming_pdf import PdfStream, pdf_text
+from .streaming_xlsx import XLSX_MEDIA_TYPE, stream_xlsx
+from .ndjson import NDJSON_MEDIA_TYPE, wants_ndjson, ndjson_response
+from .partitioning import ensure_partitions, apply_retention, list_partitions
+from .db_metrics import QueryStatsMiddleware, current_query_stats
 # from .external.staff_api_client import staff_api_client
 
 __all__ = [
     "get_db",
+    "get_read_db",
     "Base",
     "get_redis",
+    "get_sync_redis",
     "close_redis",
+    "ZipStream",
+    "stream_zip",
+    "PdfStream",
+    "pdf_text",
+    "XLSX_MEDIA_TYPE",
+    "stream_xlsx",
+    "NDJSON_MEDIA_TYPE",
+    "wants_ndjson",
+    "ndjson_response",
+    "ensure_partitions",
+    "apply_retention",
+    "list_partitions",
+    "QueryStatsMiddleware",
+    "current_query_stats",
     # "staff_api_client"
 ]
\ No newline at end of file
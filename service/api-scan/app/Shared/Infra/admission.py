@@ -0,0 +1,209 @@
+"""
+    Admission control for api-scan.
+
+    Sync routes run on AnyIO's worker threads; the thread limiter is sized from the DB pool
+    (a thread beyond pool_size + max_overflow would only wait for a connection). In front of it,
+    at most ADMISSION_CAPACITY requests run at once, and ADMISSION_RESERVE_CRITICAL of those slots
+    are only ever given to CRITICAL requests, so streamed exports and reports can not take every
+    thread from check-ins. The rest wait in a bounded queue per priority class and are admitted
+    highest class first (FIFO within a class). A full queue or
+    a wait longer than ADMISSION_QUEUE_TIMEOUT answers 503 with Retry-After right away instead
+    of timing out at the gateway.
+
+    One controller per worker process; all state is touched from the event loop only.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import anyio.to_thread
+import orjson
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Highest priority first
+CRITICAL = "critical"
+STANDARD = "standard"
+BACKGROUND = "background"
+PRIORITY_ORDER = (CRITICAL, STANDARD, BACKGROUND)
+
+# (path prefix, class); first match wins, everything else is STANDARD
+ROUTE_CLASSES: Tuple[Tuple[str, str], ...] = (
+    ("/scan/check-in", CRITICAL),
+    ("/scan/check-out", CRITICAL),
+    ("/scan/validate-qr", CRITICAL),
+    ("/scan/today-attendance", CRITICAL),
+    ("/scan/dashboard", BACKGROUND),
+    ("/scan/analytics", BACKGROUND),
+    ("/scan/attendance-records", BACKGROUND),
+    ("/generate-code/export", BACKGROUND),
+    ("/generate-code/bulk", BACKGROUND),
+)
+
+# Never queued: probes, scrapes and long-lived streams that hold no worker thread
+EXEMPT_PATHS = ("/", "/health", "/metrics", "/scan/dashboard/stream")
+
+ADMISSION_IN_FLIGHT = Gauge("api_scan_admission_in_flight", "Requests currently admitted")
+ADMISSION_QUEUE_DEPTH = Gauge("api_scan_admission_queue_depth", "Requests waiting for admission", ["priority"])
+ADMISSION_WAIT = Histogram(
+    "api_scan_admission_wait_seconds", "Time spent waiting for admission", ["priority"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+ADMISSION_REJECTED = Counter(
+    "api_scan_admission_rejected_total", "Requests answered 503 by admission control", ["priority", "reason"]
+)
+
+def db_pool_capacity() -> int:
+    return settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+def worker_thread_capacity() -> int:
+    """API_WORKER_THREADS, capped by the DB pool (default: exactly the pool)"""
+    if settings.API_WORKER_THREADS:
+        return min(settings.API_WORKER_THREADS, db_pool_capacity())
+    return db_pool_capacity()
+
+def configure_worker_threads() -> int:
+    """Resize AnyIO's default limiter (call from the running event loop, e.g. lifespan startup)"""
+    capacity = worker_thread_capacity()
+    anyio.to_thread.current_default_thread_limiter().total_tokens = capacity
+    return capacity
+
+def classify(path: str) -> str:
+    for prefix, priority in ROUTE_CLASSES:
+        if path.startswith(prefix):
+            return priority
+    return STANDARD
+
+class AdmissionController:
+    """
+    A class may only start a request while in-flight < capacity - the reserves of the classes
+    above it (the gateway's LoadGovernor applies the same rule to its route classes).
+    """
+    def __init__(self, capacity: int, reserves: Dict[str, int], queue_limits: Dict[str, int], queue_timeout: float):
+        self.capacity = capacity
+        self.queue_limits = queue_limits
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiters: Dict[str, Deque[asyncio.Future]] = {priority: deque() for priority in PRIORITY_ORDER}
+        # Slots a class may not touch: the reserves of every class above it
+        self.limits: Dict[str, int] = {}
+        reserved_above = 0
+        for priority in PRIORITY_ORDER:
+            self.limits[priority] = max(0, capacity - reserved_above)
+            reserved_above += reserves.get(priority, 0)
+
+    def _queued_ahead(self, priority: str) -> int:
+        """Waiters of this class and the classes above it"""
+        return sum(len(self.waiters[p]) for p in PRIORITY_ORDER[:PRIORITY_ORDER.index(priority) + 1])
+
+    def _update_depth(self, priority: str) -> None:
+        ADMISSION_QUEUE_DEPTH.labels(priority).set(len(self.waiters[priority]))
+
+    async def acquire(self, priority: str) -> Optional[str]:
+        """None once admitted (caller must release), else the rejection reason"""
+        # Waiters only exist while every slot their class may use is taken: releases hand slots
+        # over directly
+        if self.in_flight < self.limits[priority] and not self._queued_ahead(priority):
+            self.in_flight += 1
+            ADMISSION_IN_FLIGHT.set(self.in_flight)
+            ADMISSION_WAIT.labels(priority).observe(0)
+            return None
+
+        queue = self.waiters[priority]
+        if len(queue) >= self.queue_limits[priority]:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        self._update_depth(priority)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            return None
+        except asyncio.TimeoutError:
+            # The slot may have been handed over just as the timeout fired
+            return None if waiter.done() and not waiter.cancelled() else "timeout"
+        except asyncio.CancelledError:
+            # Client went away while queued; give back a slot handed over in the meantime
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+            if waiter in queue:
+                queue.remove(waiter)
+            self._update_depth(priority)
+            ADMISSION_WAIT.labels(priority).observe(time.monotonic() - started)
+
+    def release(self) -> None:
+        """Hand the slot to the oldest waiter of the highest class allowed to use it, or free it"""
+        for priority in PRIORITY_ORDER:
+            # Handing over keeps in_flight as is: the waiter's class must be allowed one more
+            if self.in_flight > self.limits[priority]:
+                break
+            queue = self.waiters[priority]
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    waiter.set_result(True)
+                    self._update_depth(priority)
+                    return
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+
+def admission_controller() -> AdmissionController:
+    capacity = settings.ADMISSION_CAPACITY or worker_thread_capacity()
+    return AdmissionController(
+        capacity=capacity,
+        reserves={CRITICAL: min(settings.ADMISSION_RESERVE_CRITICAL, capacity - 1)},
+        queue_limits={
+            CRITICAL: settings.ADMISSION_QUEUE_CRITICAL,
+            STANDARD: settings.ADMISSION_QUEUE_STANDARD,
+            BACKGROUND: settings.ADMISSION_QUEUE_BACKGROUND,
+        },
+        queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT
+    )
+
+class AdmissionMiddleware:
+    """Pure ASGI: the slot is held until the last body chunk is sent (streamed exports included)"""
+    def __init__(self, app):
+        self.app = app
+        self.controller = admission_controller()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        priority = classify(scope["path"])
+        rejection = await self.controller.acquire(priority)
+        if rejection:
+            ADMISSION_REJECTED.labels(priority, rejection).inc()
+            logger.warning("admission_rejected", path=scope["path"], priority=priority, reason=rejection)
+            await self._reject(send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+    @staticmethod
+    async def _reject(send) -> None:
+        body = orjson.dumps({"detail": "Service is busy, retry shortly"})
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,51 @@
+"""
+    Celery worker + beat for api-scan scheduled jobs (broker: Redis db CELERY_REDIS_DB).
+
+    Run one or more:
+        celery -A app.Shared.Infra.celery_app worker --beat --loglevel=info
+    Every replica may run beat: each job takes a Redis lock (Shared/Infra/distributed_lock.py),
+    so a schedule firing on several replicas still runs once.
+"""
+from celery import Celery
+from celery.schedules import crontab
+
+from app.Shared.Core.config import settings
+
+_BROKER_URL = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.CELERY_REDIS_DB}"
+
+celery_app = Celery(
+    "api_scan",
+    broker=_BROKER_URL,
+    backend=_BROKER_URL,
+    include=["app.Domain.v1.Attendances.Tasks.attendance_tasks"]
+)
+
+celery_app.conf.update(
+    timezone="Asia/Bangkok", # attendance times are Bangkok wall-clock
+    enable_utc=True,
+    task_acks_late=True, # a job killed mid-run is redelivered; every job is idempotent
+    worker_prefetch_multiplier=1,
+    result_expires=86400,
+    beat_schedule={
+        "attendances-auto-checkout": {
+            "task": "attendances.auto_checkout",
+            "schedule": crontab(hour=settings.ATTENDANCE_CLOSE_DAY_HOUR, minute=settings.ATTENDANCE_CLOSE_DAY_MINUTE),
+        },
+        "attendances-auto-absent": {
+            "task": "attendances.auto_absent",
+            "schedule": crontab(hour=settings.ATTENDANCE_CLOSE_DAY_HOUR, minute=settings.ATTENDANCE_CLOSE_DAY_MINUTE),
+        },
+        "attendances-maintain-partitions": {
+            "task": "attendances.maintain_partitions",
+            "schedule": crontab(hour=1, minute=0),
+        },
+        "attendances-purge-kiosk-scans": {
+            "task": "attendances.purge_kiosk_scans",
+            "schedule": crontab(hour=1, minute=30),
+        },
+        "attendances-archive-closed-months": {
+            "task": "attendances.archive_closed_months",
+            "schedule": crontab(hour=2, minute=0),
+        },
+    }
+)
@@ -1,18 +1,32 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+from app.Shared.Infra.db_metrics import instrumented_pool, watch_pool
 
-DATABASE_URL = f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+logger = get_logger(__name__)
+
+DATABASE_URL = f"postgresql+psycopg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+
+# psycopg 3 prepares a statement server-side once the same SQL ran DB_PREPARE_THRESHOLD times on a
+# connection; prepared statements live as long as the pooled connection (see hot_queries.py)
+_CONNECT_ARGS = {"prepare_threshold": settings.DB_PREPARE_THRESHOLD}
 
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    connect_args=_CONNECT_ARGS,
+    poolclass=instrumented_pool("primary"),
     echo=settings.DEBUG
 )
+watch_pool(engine, "primary")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -26,6 +40,94 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+# ==================== Read replica ====================
+# Listings, exports, reports and analytics read from the replica so a heavy report never
+# competes with the check-in burst for primary connections. Writes always use get_db, and so do
+# reads that fill a long-lived cache (dashboard trends): it should not be filled from a lagging copy.
+
+REPLICA_URL = (
+    f"postgresql+psycopg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_REPLICA_HOST}:{settings.POSTGRES_REPLICA_PORT}/{settings.POSTGRES_DB}"
+    if settings.POSTGRES_REPLICA_HOST else None
+)
+
+replica_engine = create_engine(
+    REPLICA_URL,
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    connect_args={**_CONNECT_ARGS, "connect_timeout": settings.POSTGRES_REPLICA_CONNECT_TIMEOUT},
+    poolclass=instrumented_pool("replica"),
+    echo=settings.DEBUG
+) if REPLICA_URL else None
+if replica_engine is not None:
+    watch_pool(replica_engine, "replica")
+
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine else None
+
+# Seconds behind the primary; NULL before the first replay. A server that is not in recovery
+# (standalone copy) is treated as current. "Nothing left to replay" only means current while the
+# WAL receiver is connected: once it is gone the received LSN stops moving too, so the replica is
+# judged by the age of its last replayed transaction and drops out after REPLICA_MAX_LAG_SECONDS.
+# (Without pg_read_all_stats the receiver's status column reads NULL: its presence is used then.)
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() AND EXISTS ("
+    "SELECT 1 FROM pg_stat_wal_receiver WHERE status IS NULL OR status = 'streaming'"
+    ") THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+_replica_state = {"checked_at": float("-inf"), "fresh": False}
+_replica_state_lock = threading.Lock()
+
+def replica_is_fresh() -> bool:
+    """
+        Lag guard, probed at most once per REPLICA_LAG_CHECK_INTERVAL per worker
+        (other callers reuse the last verdict while one thread probes)
+    """
+    if replica_engine is None:
+        return False
+
+    now = time.monotonic()
+    with _replica_state_lock:
+        if now - _replica_state["checked_at"] < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return _replica_state["fresh"]
+        _replica_state["checked_at"] = now
+        was_fresh = _replica_state["fresh"]
+
+    lag = None
+    try:
+        with replica_engine.connect() as conn:
+            lag = conn.execute(_REPLICA_LAG_SQL).scalar()
+    except SQLAlchemyError as e:
+        logger.warning("replica_probe_failed", error=str(e))
+    fresh = lag is not None and float(lag) <= settings.REPLICA_MAX_LAG_SECONDS
+
+    with _replica_state_lock:
+        _replica_state["fresh"] = fresh
+    if fresh != was_fresh:
+        logger.warning(
+            "replica_in_use" if fresh else "replica_fallback_to_primary",
+            lag_seconds=float(lag) if lag is not None else None,
+            max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS
+        )
+    return fresh
+
+def ReadSessionLocal() -> Session:
+    """Session for read-only work: the replica when configured and fresh, the primary otherwise"""
+    if replica_is_fresh():
+        return ReplicaSessionLocal()
+    return SessionLocal()
+
+def get_read_db() -> Generator[Session, None, None]:
+    """Read-only session dependency (never write through it: it may be a replica)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 # def init_db():
 #     """Initialize database tables"""
 #     # Import all models here
@@ -34,4 +136,4 @@ def get_db() -> Generator[Session, None, None]:
 #     from app.Domain.v1.Offices.models import Office
 #     from app.Domain.v1.Attendence_reasons.models import AttendanceReason
     
-#     Base.metadata.create_all(bind=engine)
\ No newline at end of file
+#     Base.metadata.create_all(bind=engine)
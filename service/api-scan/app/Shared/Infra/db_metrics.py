@@ -0,0 +1,193 @@
+"""
+    SQLAlchemy instrumentation: per-request query count, SQL time and pool checkout wait,
+    slow-statement log (parameters redacted) and an N+1 detector.
+
+    A request opens a QueryStats scope (QueryStatsMiddleware at the bottom, added in main.py);
+    cursor events and the pool add to whatever scope is current. contextvars follow sync routes
+    into the threadpool, so statements issued from `def` routes and streamed bodies land in
+    their request's scope.
+    Outside a request (commands, workers) only the slow-statement log applies.
+"""
+import time
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.Shared.Core.config import settings
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# ==================== Metrics ====================
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "api_scan_db_queries_per_request", "SQL statements issued by one request",
+    ["route"], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "api_scan_db_seconds_per_request", "Time spent in SQL statements by one request",
+    ["route"], buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+DB_POOL_WAIT = Histogram(
+    "api_scan_db_pool_wait_seconds", "Time waiting for a pooled connection",
+    ["engine"], buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "api_scan_db_pool_checked_out", "Connections currently checked out", ["engine"]
+)
+DB_POOL_SIZE = Gauge(
+    "api_scan_db_pool_size", "Configured pool size (overflow excluded)", ["engine"]
+)
+DB_SLOW_STATEMENTS = Counter(
+    "api_scan_db_slow_statements_total", "Statements slower than DB_SLOW_QUERY_MS", ["engine"]
+)
+DB_N_PLUS_ONE = Counter(
+    "api_scan_db_n_plus_one_total", "Requests repeating one statement more than DB_N_PLUS_ONE_THRESHOLD times", ["route"]
+)
+
+# ==================== Per-request scope ====================
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    sql_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+    statements: StatementCounter = field(default_factory=StatementCounter)
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+def start_query_stats() -> QueryStats:
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+def finish_query_stats(stats: QueryStats, route: str) -> None:
+    """Record the request's totals and warn about statements repeated N+1 style"""
+    DB_QUERIES_PER_REQUEST.labels(route).observe(stats.queries)
+    DB_TIME_PER_REQUEST.labels(route).observe(stats.sql_seconds)
+    if not stats.statements:
+        return
+    statement, count = stats.statements.most_common(1)[0]
+    if count > settings.DB_N_PLUS_ONE_THRESHOLD:
+        DB_N_PLUS_ONE.labels(route).inc()
+        logger.warning(
+            "db_n_plus_one_suspected",
+            route=route,
+            repeated=count,
+            total_queries=stats.queries,
+            statement=_truncate(statement)
+        )
+
+# ==================== Statement events ====================
+
+def _truncate(statement: str) -> str:
+    return statement if len(statement) <= 1000 else statement[:1000] + "..."
+
+def _redact(parameters: Any) -> Any:
+    """Keep the shape (names, types, row count), never the values"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return {"executemany_rows": len(parameters)}
+        return [type(value).__name__ for value in parameters]
+    return None
+
+def _engine_name(conn) -> str:
+    return getattr(conn.engine.pool, "metrics_name", "primary")
+
+# The start time lives on the execution context (one per statement), not on the connection:
+# a statement that raises never reaches after_cursor_execute and leaves nothing behind
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.sql_seconds += elapsed
+        stats.statements[statement] += 1
+
+    if elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        engine_name = _engine_name(conn)
+        DB_SLOW_STATEMENTS.labels(engine_name).inc()
+        logger.warning(
+            "db_slow_statement",
+            engine=engine_name,
+            duration_ms=round(elapsed * 1000, 1),
+            statement=_truncate(statement),
+            parameters=_redact(parameters)
+        )
+
+# ==================== Pool ====================
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long a checkout waited for a free connection"""
+    metrics_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            DB_POOL_WAIT.labels(self.metrics_name).observe(waited)
+            stats = _current_stats.get()
+            if stats is not None:
+                stats.pool_wait_seconds += waited
+
+def instrumented_pool(name: str) -> type:
+    """poolclass for create_engine; a subclass per engine so the label survives pool.recreate()"""
+    return type(f"InstrumentedQueuePool_{name}", (InstrumentedQueuePool,), {"metrics_name": name})
+
+def watch_pool(engine: Engine, name: str) -> None:
+    """Pool occupancy gauges, read at scrape time (engine.pool is looked up again after dispose)"""
+    DB_POOL_CHECKED_OUT.labels(name).set_function(lambda: engine.pool.checkedout())
+    DB_POOL_SIZE.labels(name).set_function(lambda: engine.pool.size())
+
+# ==================== Request middleware ====================
+
+class QueryStatsMiddleware:
+    """
+        Opens the per-request scope, records it when the response is done.
+        Pure ASGI (not BaseHTTPMiddleware) so streamed bodies still run inside the scope.
+        In DEBUG, the totals at the moment headers are sent go out as X-DB-* headers.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_query_stats()
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                message = {**message, "headers": [
+                    *message.get("headers", []),
+                    (b"x-db-query-count", str(stats.queries).encode()),
+                    (b"x-db-query-time-ms", f"{stats.sql_seconds * 1000:.1f}".encode()),
+                    (b"x-db-pool-wait-ms", f"{stats.pool_wait_seconds * 1000:.1f}".encode()),
+                ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            route = scope.get("route")
+            finish_query_stats(stats, getattr(route, "path", "unmatched"))
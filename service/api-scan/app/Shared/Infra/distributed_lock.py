@@ -0,0 +1,43 @@
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+
+import redis
+
+from app.Shared.Infra.redis import get_sync_redis
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Delete only if the lock still holds our token (it may have expired and been taken by another holder)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+@contextmanager
+def redis_lock(name: str, ttl: int) -> Iterator[bool]:
+    """
+        Mutex across replicas: SET NX EX with a random token, released by its owner only.
+        Yields False when another holder has it or Redis is unreachable - the caller skips its work.
+        ttl must outlast the guarded work; it only matters if the holder dies.
+    """
+    client = get_sync_redis()
+    key = f"lock:{name}"
+    token = uuid.uuid4().hex
+    try:
+        acquired = bool(client.set(key, token, nx=True, ex=ttl))
+    except redis.RedisError as e:
+        logger.warning("lock_unavailable", name=name, error=str(e))
+        acquired = False
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                client.eval(_RELEASE_SCRIPT, 1, key, token)
+            except redis.RedisError as e:
+                logger.warning("lock_release_failed", name=name, error=str(e))
@@ -0,0 +1,54 @@
+from typing import Any, Callable, Dict, Iterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, Query
+
+from app.Shared.Core.responses import dumps
+from app.Shared.Infra.database import ReadSessionLocal
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rows fetched per server-side cursor round trip
+NDJSON_FETCH_SIZE = 1000
+
+# Encoded rows joined into one chunk (fewer, larger writes)
+_ROWS_PER_CHUNK = 200
+
+def wants_ndjson(request: Request) -> bool:
+    """Opt-in streaming mode: Accept: application/x-ndjson"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "").lower()
+
+def iter_ndjson(
+    build_query: Callable[[Session], Query],
+    serialize: Callable[[Any], Dict[str, Any]],
+    fetch_size: int = NDJSON_FETCH_SIZE
+) -> Iterator[bytes]:
+    """
+        One JSON document per line, straight off a server-side cursor (yield_per).
+        Own session: the request's get_db session is closed before a streamed body runs.
+    """
+    db = ReadSessionLocal()
+    try:
+        lines = []
+        for row in build_query(db).yield_per(fetch_size):
+            # Same encoder as the JSON responses (UTC as Z, Decimal)
+            lines.append(dumps(serialize(row)))
+            if len(lines) >= _ROWS_PER_CHUNK:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+    finally:
+        db.close()
+
+def ndjson_response(
+    build_query: Callable[[Session], Query],
+    serialize: Callable[[Any], Dict[str, Any]]
+) -> StreamingResponse:
+    return StreamingResponse(
+        iter_ndjson(build_query, serialize),
+        media_type=NDJSON_MEDIA_TYPE,
+        # Reverse proxies must relay rows as they come
+        headers={"X-Accel-Buffering": "no", "Cache-Control": "no-cache"}
+    )
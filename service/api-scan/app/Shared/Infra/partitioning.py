@@ -0,0 +1,182 @@
+"""
+    Monthly RANGE partitions (on a date column) for append-mostly tables, attendances first.
+
+    Partitions are named {table}_yYYYYmMM and cover [first day of month, first day of next month).
+    A DEFAULT partition catches dates nobody pre-created (e.g. far-future absence requests);
+    future months are created ahead of time by ensure_partitions(), which moves the rows the
+    DEFAULT partition holds for a month into that month's partition when it is created.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.Shared.Core.logging import get_logger
+
+logger = get_logger(__name__)
+
+RETENTION_MODES = ("archive", "detach", "drop")
+
+_BOUNDS = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: Optional[date] # None for the DEFAULT partition
+    end: Optional[date]
+
+    @property
+    def is_default(self) -> bool:
+        return self.start is None
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month `months` after day's month"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+def list_partitions(conn: Connection, table: str) -> List[Partition]:
+    """Attached partitions, oldest first (DEFAULT last)"""
+    rows = conn.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) AS bound "
+        "FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :table AND p.relnamespace = 'public'::regnamespace"
+    ), {"table": table}).all()
+
+    partitions = []
+    for name, bound in rows:
+        match = _BOUNDS.search(bound or "")
+        if match:
+            partitions.append(Partition(name, date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))))
+        else:
+            partitions.append(Partition(name, None, None))
+    return sorted(partitions, key=lambda p: (p.is_default, p.start or date.max))
+
+def create_month_partition(conn: Connection, table: str, month: date) -> str:
+    """CREATE ... PARTITION OF for one month (no-op when it already exists)"""
+    start = month_start(month)
+    name = partition_name(table, start)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+    ))
+    return name
+
+def _partition_column(conn: Connection, table: str) -> str:
+    """Key column of a single-column RANGE partitioned table"""
+    keydef = conn.execute(text("SELECT pg_get_partkeydef(CAST(:table AS regclass))"), {"table": table}).scalar()
+    return re.match(r"RANGE \((\w+)\)", keydef).group(1)
+
+def _columns(conn: Connection, table: str) -> str:
+    return ", ".join(conn.execute(text(
+        "SELECT quote_ident(attname) FROM pg_attribute "
+        "WHERE attrelid = CAST(:table AS regclass) AND attnum > 0 AND NOT attisdropped ORDER BY attnum"
+    ), {"table": table}).scalars())
+
+def _create_month_partition_from_default(conn: Connection, table: str, month: date, default: str) -> int:
+    """
+        Postgres refuses a new partition whose range has rows in the DEFAULT partition, so the
+        DEFAULT partition is detached, the month created, its rows moved over and the DEFAULT
+        partition attached again - all in the caller's transaction. Returns the rows moved.
+    """
+    start, end = month_start(month), add_months(month_start(month), 1)
+    column = _partition_column(conn, table)
+    columns = _columns(conn, table)
+    conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    name = create_month_partition(conn, table, start)
+    moved = conn.execute(text(
+        f"WITH moved AS (DELETE FROM {default} WHERE {column} >= :start AND {column} < :end RETURNING {columns}) "
+        f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved"
+    ), {"start": start, "end": end}).rowcount
+    conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+    return moved
+
+def ensure_partitions(engine: Engine, table: str, months_ahead: int, today: Optional[date] = None) -> List[str]:
+    """Current month + `months_ahead` future months; returns the partitions that had to be created"""
+    today = today or date.today()
+    created = []
+    with engine.begin() as conn:
+        partitions = list_partitions(conn, table)
+        existing = {p.name for p in partitions}
+        default = next((p.name for p in partitions if p.is_default), None)
+        column = _partition_column(conn, table) if default else None
+        for offset in range(months_ahead + 1):
+            month = add_months(month_start(today), offset)
+            name = partition_name(table, month)
+            if name in existing:
+                continue
+            stranded = default and conn.execute(text(
+                f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {column} >= :start AND {column} < :end)"
+            ), {"start": month, "end": add_months(month, 1)}).scalar()
+            if stranded:
+                moved = _create_month_partition_from_default(conn, table, month, default)
+                logger.info("partition_rows_moved_from_default", table=table, partition=name, rows=moved)
+            else:
+                create_month_partition(conn, table, month)
+            created.append(name)
+    if created:
+        logger.info("partitions_created", table=table, partitions=created)
+    return created
+
+def expired_partitions(conn: Connection, table: str, keep_months: int, today: Optional[date] = None) -> List[Partition]:
+    """Month partitions that end before the retention cut-off (current month counts as one)"""
+    cutoff = add_months(month_start(today or date.today()), -(keep_months - 1))
+    return [p for p in list_partitions(conn, table) if not p.is_default and p.end <= cutoff]
+
+def apply_retention(
+    engine: Engine,
+    table: str,
+    keep_months: int,
+    mode: str = "archive",
+    archive_schema: str = "archive",
+    today: Optional[date] = None,
+    before_detach: Optional[Callable[[Connection, Partition, str], None]] = None,
+    lock_timeout_ms: int = 5000
+) -> List[str]:
+    """
+        Detach partitions older than `keep_months` months.
+        - archive: detach and move to `archive_schema` (still queryable, out of every plan)
+        - detach: detach, leave the table next to the parent
+        - drop: detach and drop
+        `before_detach(conn, partition, mode)` lets the caller deal with dependent rows first.
+
+        Each partition is retired in one transaction - dependent rows, DETACH, then SET SCHEMA or
+        DROP - so a DETACH that fails (lock timeout) leaves everything as it was. That rules out
+        DETACH ... CONCURRENTLY (not allowed in a transaction block, and refused anyway while a
+        DEFAULT partition exists): the plain DETACH is a short catalog-only lock on the parent,
+        given up after lock_timeout_ms rather than queueing check-ins behind it. Run off-hours.
+    """
+    if keep_months <= 0:
+        return []
+    if mode not in RETENTION_MODES:
+        raise ValueError(f"retention mode must be one of {', '.join(RETENTION_MODES)}")
+
+    with engine.begin() as conn:
+        expired = expired_partitions(conn, table, keep_months, today)
+
+    handled = []
+    for partition in expired:
+        with engine.begin() as conn:
+            conn.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+            if mode == "archive":
+                conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+            if before_detach:
+                before_detach(conn, partition, mode)
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition.name}"))
+            if mode == "archive":
+                conn.execute(text(f"ALTER TABLE {partition.name} SET SCHEMA {archive_schema}"))
+            elif mode == "drop":
+                conn.execute(text(f"DROP TABLE {partition.name}"))
+        handled.append(partition.name)
+        logger.info("partition_retired", table=table, partition=partition.name, mode=mode)
+    return handled
@@ -1,4 +1,5 @@
 import redis.asyncio as redis
+import redis as sync_redis
 from typing import Optional
 from app.Shared.Core.config import settings
 from app.Shared.Core.logging import get_logger
@@ -6,6 +7,7 @@ from app.Shared.Core.logging import get_logger
 logger = get_logger(__name__)
 
 _redis_client: Optional[redis.Redis] = None
+_sync_redis_client: Optional[sync_redis.Redis] = None
 
 async def get_redis() -> redis.Redis:
     """Get or create Redis client (singleton)"""
@@ -25,8 +27,29 @@ async def get_redis() -> redis.Redis:
 
 async def close_redis():
     """Close Redis connection"""
-    global _redis_client
+    global _redis_client, _sync_redis_client
     if _redis_client:
         await _redis_client.close()
         _redis_client = None
-        logger.info("redis_disconnected")
\ No newline at end of file
+        logger.info("redis_disconnected")
+    if _sync_redis_client:
+        _sync_redis_client.close()
+        _sync_redis_client = None
+
+def get_sync_redis() -> sync_redis.Redis:
+    """Get or create blocking Redis client (singleton) for sync routes/services"""
+    global _sync_redis_client
+
+    if _sync_redis_client is None:
+        _sync_redis_client = sync_redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True,
+            encoding="utf-8",
+            socket_timeout=1.0,
+            socket_connect_timeout=1.0
+        )
+        logger.info("redis_sync_connected", host=settings.REDIS_HOST)
+
+    return _sync_redis_client
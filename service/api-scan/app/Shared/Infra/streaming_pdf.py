@@ -0,0 +1,76 @@
+from typing import Dict, List
+
+# A4 portrait in points
+A4_WIDTH = 595
+A4_HEIGHT = 842
+
+def pdf_text(text: str, x: float, y: float, size: int = 12) -> bytes:
+    """
+        Content-stream ops for one line of Helvetica text.
+        Base-14 fonts only cover WinAnsi; other characters are replaced with '?'.
+    """
+    encoded = text.encode("cp1252", errors="replace")
+    escaped = encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return b"BT /F1 %d Tf %.2f %.2f Td (" % (size, x, y) + escaped + b") Tj ET\n"
+
+class PdfStream:
+    """
+        Incremental PDF 1.4 writer: pages are emitted as they are added, only object
+        offsets are kept until the xref table is written by close().
+        Object 1 = catalog, 2 = page tree (written last), 3 = Helvetica as /F1.
+    """
+
+    _CATALOG = 1
+    _PAGES = 2
+    _FONT = 3
+
+    def __init__(self):
+        self._offset = 0
+        self._offsets: Dict[int, int] = {}
+        self._page_objects: List[int] = []
+        self._next_object = 4
+
+    def _emit(self, data: bytes) -> bytes:
+        self._offset += len(data)
+        return data
+
+    def _object(self, number: int, body: bytes) -> bytes:
+        self._offsets[number] = self._offset
+        return self._emit(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    def begin(self) -> bytes:
+        """Header + shared font object"""
+        return self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n") + self._object(
+            self._FONT,
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+        )
+
+    def add_page(self, content: bytes, width: int = A4_WIDTH, height: int = A4_HEIGHT) -> bytes:
+        """One page from a content stream; returns the bytes to send"""
+        content_number, page_number = self._next_object, self._next_object + 1
+        self._next_object += 2
+        self._page_objects.append(page_number)
+
+        return self._object(
+            content_number,
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        ) + self._object(
+            page_number,
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (self._PAGES, width, height, self._FONT, content_number)
+        )
+
+    def close(self) -> bytes:
+        """Page tree, catalog, xref table and trailer"""
+        kids = b" ".join(b"%d 0 R" % number for number in self._page_objects)
+        out = self._object(self._PAGES, b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(self._page_objects))
+        out += self._object(self._CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % self._PAGES)
+
+        xref_offset = self._offset
+        size = self._next_object
+        xref = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        xref.extend(b"%010d 00000 n \n" % self._offsets[number] for number in range(1, size))
+        out += self._emit(b"".join(xref))
+        out += self._emit(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, self._CATALOG, xref_offset))
+        return out
@@ -0,0 +1,69 @@
+import io
+import zipfile
+from datetime import datetime
+from typing import Iterable, Iterator, List, Tuple
+
+class _DrainableSink(io.RawIOBase):
+    """Non-seekable write target; bytes written so far are taken with drain()"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+class ZipStream:
+    """
+        Incremental ZIP writer: each entry is emitted as soon as it is written,
+        so memory holds one entry (or one chunk of a large entry), never the archive.
+        Non-seekable target -> zipfile writes data descriptors and ZIP64 as needed.
+    """
+
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED):
+        self._sink = _DrainableSink()
+        self._archive = zipfile.ZipFile(self._sink, mode="w", compression=compression)
+        self._compression = compression
+
+    def _info(self, name: str, compression: int) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, date_time=datetime.now().timetuple()[:6])
+        info.compress_type = compression
+        return info
+
+    def add_file(self, name: str, data: bytes, compression: int = None) -> bytes:
+        """Write a whole entry; returns the bytes to send"""
+        info = self._info(name, self._compression if compression is None else compression)
+        self._archive.writestr(info, data)
+        return self._sink.drain()
+
+    def add_chunks(self, name: str, chunks: Iterable[bytes], compression: int = None) -> Iterator[bytes]:
+        """Write one large entry from a chunk iterator (e.g. a generated XML sheet)"""
+        info = self._info(name, self._compression if compression is None else compression)
+        with self._archive.open(info, mode="w", force_zip64=True) as entry:
+            for chunk in chunks:
+                entry.write(chunk)
+                data = self._sink.drain()
+                if data:
+                    yield data
+        yield self._sink.drain()
+
+    def close(self) -> bytes:
+        """Central directory; last bytes of the archive"""
+        self._archive.close()
+        return self._sink.drain()
+
+def stream_zip(entries: Iterable[Tuple[str, bytes]], compression: int = zipfile.ZIP_DEFLATED) -> Iterator[bytes]:
+    """Sync generator over (name, data) pairs, for StreamingResponse"""
+    archive = ZipStream(compression)
+    for name, data in entries:
+        chunk = archive.add_file(name, data)
+        if chunk:
+            yield chunk
+    yield archive.close()
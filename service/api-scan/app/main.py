@@ -2,21 +2,52 @@
 from fastapi import FastAPI, Depends
 from sqlalchemy.orm import Session
 from typing import Optional
+from contextlib import asynccontextmanager
 from app.Shared.Infra.database import get_db  # ✅ Fixed
+from app.Shared.Infra.redis import close_redis
+from app.Shared.Infra.db_metrics import QueryStatsMiddleware
+from app.Shared.Infra.admission import AdmissionMiddleware, configure_worker_threads
+from prometheus_fastapi_instrumentator import Instrumentator
+from app.Shared.Core.responses import ORJSONResponse
 from app.Domain.v1.Offices.Routes.route_office import router as office_router
 from app.Domain.v1.QR_codes.Routes.route_qr import router as qr_router
 from app.Domain.v1.Attendances.Routes.route_attendance import router as attendance_router
 from app.Domain.v1.Dashboard.Routes.route_dashboard import router as dashboard_router  # ✅ Added
+from app.Domain.v1.Attendance_Records.Routes.route_attendance_record import router as attendance_record_router
+from app.Domain.v1.Analytics.Routes.route_analytics import router as analytics_router
 # Import models so SQLAlchemy registers them in metadata for foreign key resolution
 from app.Domain.v1.Users.Models.user_model import User
 from app.Domain.v1.Attendances.Models.attendance_reason_model import AttendanceReason
+from app.Domain.v1.Dashboard.Services.event_service import dashboard_event_hub
+from app.Domain.v1.QR_codes.Services.qr_render_cache import qr_render_cache
+
+# Lifespan: background tasks and connections owned by this worker
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: worker threads sized to the DB pool, fan-out of dashboard events from Redis pub/sub
+    configure_worker_threads()
+    await dashboard_event_hub.start()
+    yield
+    # Shutdown
+    await dashboard_event_hub.stop()
+    qr_render_cache.shutdown()
+    await close_redis()
 
 app = FastAPI(
     title="API Scan Service",
     description="Backend service for QR Management and Scanning",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # Every route encodes with orjson (routes returning model_response also skip re-validation)
+    default_response_class=ORJSONResponse
 )
 
+# Per-request SQL count / time / pool wait (X-DB-* headers in DEBUG); Prometheus scrape at /metrics
+app.add_middleware(QueryStatsMiddleware)
+# Bounded priority queue in front of the worker threads: 503 + Retry-After instead of piling up
+app.add_middleware(AdmissionMiddleware)
+Instrumentator().instrument(app).expose(app, include_in_schema=False)
+
 # Root Endpoint
 @app.get("/")
 async def root():
@@ -31,3 +62,5 @@ app.include_router(office_router, prefix="/offices")
 app.include_router(qr_router, prefix="/generate-code")
 app.include_router(attendance_router, prefix="/scan")
 app.include_router(dashboard_router, prefix="/scan")  # ✅ Added - dashboard under /scan prefix
+app.include_router(attendance_record_router, prefix="/scan")  # history + streamed exports
+app.include_router(analytics_router, prefix="/scan")  # user x day heatmaps / per-user analytics
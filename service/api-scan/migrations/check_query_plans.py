@@ -0,0 +1,156 @@
+"""
+    EXPLAIN every api-scan hot query and fail on a sequential scan of a large table.
+    Run after `alembic upgrade head` (CI: against a throwaway Postgres with the Laravel schema).
+
+    Usage:
+        python -m migrations.check_query_plans --seed           # seed synthetic rows, check, roll back
+        python -m migrations.check_query_plans                  # check against the data already there
+
+    Exit code 1 when any plan contains a Seq Scan on attendances / qr_codes.
+"""
+import argparse
+import json
+import sys
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, NamedTuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+from app.Shared.Infra.database import DATABASE_URL
+
+# Tables that grow with usage: a seq scan there is a regression, not a planner choice
+LARGE_TABLES = {"attendances", "qr_codes"}
+
+class HotQuery(NamedTuple):
+    name: str
+    sql: str
+
+# Same shapes as the ORM queries in the attendance, QR and dashboard services
+HOT_QUERIES: List[HotQuery] = [
+    HotQuery(
+        "today_attendance",
+        "SELECT * FROM attendances WHERE user_id = :user_id AND log_date = :day LIMIT 1"
+    ),
+    HotQuery(
+        "active_qr_token",
+        "SELECT office_id FROM qr_codes WHERE qr_token = :token AND is_active"
+    ),
+    HotQuery(
+        "daily_status_counts",
+        "SELECT status, count(*) FROM attendances WHERE log_date = :day GROUP BY status"
+    ),
+    HotQuery(
+        "office_day_range",
+        "SELECT log_date, status, count(*) FROM attendances "
+        "WHERE office_id = :office_id AND log_date BETWEEN :month_start AND :day "
+        "GROUP BY log_date, status"
+    ),
+    HotQuery(
+        "history_first_page",
+        "SELECT id, user_id, log_date, status FROM attendances "
+        "ORDER BY log_date DESC, id DESC LIMIT 16"
+    ),
+]
+
+def seed(conn: Connection, offices: int, users: int, days: int) -> None:
+    """Synthetic rows inside the caller's transaction (rolled back afterwards)"""
+    conn.execute(text(
+        "INSERT INTO offices (name, public_ip, shift_start, shift_end, created_at, updated_at) "
+        "SELECT 'Seed office ' || g, NULL, '08:00', '17:00', now(), now() FROM generate_series(1, :n) g"
+    ), {"n": offices})
+    conn.execute(text(
+        "INSERT INTO users (username, email, password, created_at, updated_at) "
+        "SELECT 'seed_user_' || g, 'seed_user_' || g || '@example.test', 'x', now(), now() "
+        "FROM generate_series(1, :n) g"
+    ), {"n": users})
+    # One active + four rotated-out codes per office
+    conn.execute(text(
+        "INSERT INTO qr_codes (office_id, qr_token, is_active, created_at, updated_at) "
+        "SELECT o.id, md5(o.id || '-' || v || '-' || random()), v = 0, now(), now() "
+        "FROM offices o CROSS JOIN generate_series(0, 4) v WHERE o.name LIKE 'Seed office %'"
+    ))
+    conn.execute(text(
+        "INSERT INTO attendances (user_id, office_id, log_date, check_in, check_out, status, minutes_late, "
+        "  work_hours, created_at, updated_at) "
+        "SELECT u.id, o.ids[1 + u.id % array_length(o.ids, 1)], d::date, '08:00', '17:00', "
+        "  (ARRAY['present', 'present', 'present', 'late', 'absent'])[1 + (u.id + d::date - DATE '2000-01-01') % 5], "
+        "  0, 8.5, now(), now() "
+        "FROM users u "
+        "CROSS JOIN generate_series(CURRENT_DATE - :days, CURRENT_DATE - 1, INTERVAL '1 day') d "
+        "CROSS JOIN (SELECT array_agg(id) AS ids FROM offices WHERE name LIKE 'Seed office %') o "
+        "WHERE u.email LIKE 'seed_user_%@example.test'"
+    ), {"days": days})
+    for table in ("offices", "users", "qr_codes", "attendances"):
+        conn.execute(text(f"ANALYZE {table}"))
+
+def sample_params(conn: Connection) -> Dict[str, object]:
+    """Real values for the bind params (worst case: a recent day)"""
+    row = conn.execute(text(
+        "SELECT user_id, office_id, log_date FROM attendances WHERE office_id IS NOT NULL "
+        "ORDER BY log_date DESC LIMIT 1"
+    )).first()
+    token = conn.execute(text("SELECT qr_token FROM qr_codes WHERE is_active LIMIT 1")).scalar()
+    day = row.log_date if row else date.today() - timedelta(days=1)
+    return {
+        "user_id": row.user_id if row else 1,
+        "office_id": row.office_id if row else 1,
+        "day": day,
+        "month_start": day.replace(day=1),
+        "token": token or "missing-token",
+    }
+
+def is_large_table(relation: str) -> bool:
+    """attendances and its monthly partitions; the DEFAULT partition is meant to stay empty"""
+    if relation.endswith("_default"):
+        return False
+    return any(relation == table or relation.startswith(f"{table}_") for table in LARGE_TABLES)
+
+def iter_plan_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+def check(conn: Connection, params: Dict[str, object]) -> List[str]:
+    failures: List[str] = []
+    for query in HOT_QUERIES:
+        raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {query.sql}"), params).scalar()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+        seq_scans = [
+            node["Relation Name"] for node in iter_plan_nodes(plan)
+            if node["Node Type"] == "Seq Scan" and is_large_table(node.get("Relation Name", ""))
+        ]
+        scans = ", ".join(
+            f"{node['Node Type']}" + (f" using {node['Index Name']}" if "Index Name" in node else "")
+            for node in iter_plan_nodes(plan) if "Relation Name" in node
+        )
+        print(f"{'FAIL' if seq_scans else 'ok  '} {query.name}: {scans}")
+        if seq_scans:
+            failures.append(f"{query.name}: Seq Scan on {', '.join(seq_scans)}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail on sequential scans in api-scan hot queries")
+    parser.add_argument("--seed", action="store_true", help="Seed synthetic rows first (rolled back)")
+    parser.add_argument("--offices", type=int, default=50)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+
+    engine = create_engine(DATABASE_URL)
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            if args.seed:
+                seed(conn, args.offices, args.users, args.days)
+            failures = check(conn, sample_params(conn))
+        finally:
+            transaction.rollback()
+    engine.dispose()
+
+    if failures:
+        print("\nSequential scans on large tables:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
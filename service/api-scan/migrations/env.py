@@ -0,0 +1,48 @@
+"""
+    Alembic environment for api-scan.
+
+    Laravel (api-staff-management) owns the schema and its `migrations` table; api-scan only adds
+    performance objects on top, versioned in `api_scan_alembic_version` so the two never collide.
+    No target_metadata: autogenerate would try to "fix" Laravel tables.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.Shared.Infra.database import DATABASE_URL
+
+VERSION_TABLE = "api_scan_alembic_version"
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout (alembic upgrade head --sql)"""
+    context.configure(
+        url=DATABASE_URL,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        version_table=VERSION_TABLE
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    engine = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            version_table=VERSION_TABLE,
+            # Never hold a transaction-wide lock on hot tables longer than one revision
+            transaction_per_migration=True
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,76 @@
+"""Indexes for api-scan hot queries on attendances / qr_codes
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+- attendances (user_id, log_date) UNIQUE: "already checked in today?" lookup, and a hard
+  guarantee of one row per user per day (the plain attendances_user_log_date_index is left to
+  Laravel, whose rollback of 2026_01_09_025730 drops it by name)
+- qr_codes (qr_token) WHERE is_active: scan-time token lookup only ever wants active codes
+- attendances (log_date, status) INCLUDE (...): dashboard counts per day / status, index-only
+- attendances (office_id, log_date): per-office day and range queries
+
+Every index is built CONCURRENTLY (no write lock on attendances during check-in hours).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def _drop_invalid(name: str) -> None:
+    """A failed CREATE INDEX CONCURRENTLY leaves an INVALID index that IF NOT EXISTS would keep"""
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": name}).scalar()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+def _create_concurrently(name: str, definition: str, unique: bool = False) -> None:
+    _drop_invalid(name)
+    op.execute(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}"
+    )
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT count(*) FROM ("
+        "  SELECT 1 FROM attendances GROUP BY user_id, log_date HAVING count(*) > 1"
+        ") d"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} (user_id, log_date) pairs have more than one attendance row; "
+            "merge them before adding attendances_user_log_date_unique"
+        )
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        _create_concurrently(
+            "attendances_user_log_date_unique",
+            "attendances (user_id, log_date)",
+            unique=True
+        )
+        _create_concurrently(
+            "qr_codes_active_token_index",
+            "qr_codes (qr_token) INCLUDE (office_id) WHERE is_active"
+        )
+        _create_concurrently(
+            "attendances_log_date_status_covering_index",
+            "attendances (log_date, status) INCLUDE (office_id, minutes_late, check_out, work_hours)"
+        )
+        _create_concurrently(
+            "attendances_office_log_date_index",
+            "attendances (office_id, log_date)"
+        )
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS attendances_office_log_date_index")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS attendances_log_date_status_covering_index")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS qr_codes_active_token_index")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS attendances_user_log_date_unique")
@@ -0,0 +1,127 @@
+"""Convert attendances to monthly RANGE partitions on log_date
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+- the existing heap is renamed to attendances_unpartitioned (kept until verified, then drop it by hand)
+- attendances becomes PARTITION BY RANGE (log_date) with one partition per month from the oldest
+  row to ATTENDANCE_PARTITION_MONTHS_AHEAD months ahead, plus a DEFAULT partition
+- every index of the old table is replayed on the parent (each partition gets its own copy);
+  the primary key becomes (id, log_date), as Postgres requires the partition key in unique keys
+- attendance_reasons.attendance_id loses its database FK (a partitioned parent cannot back a
+  unique key on id alone); api-scan writes both rows in one transaction and retention archives
+  reasons together with their partition
+
+Rows are copied under an exclusive lock on the old table: run it in a maintenance window.
+Later months are created by the maintain_partitions command.
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.Shared.Core.config import settings
+from app.Shared.Infra.partitioning import add_months, create_month_partition, month_start
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+LEGACY = "attendances_unpartitioned"
+
+def _index_definitions(conn, table: str):
+    """CREATE INDEX statements of every non-primary-key index on table"""
+    return [row[0] for row in conn.execute(sa.text(
+        "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i "
+        "WHERE i.indrelid = CAST(:table AS regclass) AND NOT i.indisprimary"
+    ), {"table": table})]
+
+def _rename_indexes(conn, table: str, suffix: str) -> None:
+    """Free index names (schema-wide) so the new table can reuse them"""
+    names = [row[0] for row in conn.execute(sa.text(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE i.indrelid = CAST(:table AS regclass)"
+    ), {"table": table})]
+    for name in names:
+        op.execute(f'ALTER INDEX "{name}" RENAME TO "{name[:63 - len(suffix)]}{suffix}"')
+
+def _drop_reason_fk(conn, referenced: str) -> None:
+    names = [row[0] for row in conn.execute(sa.text(
+        "SELECT conname FROM pg_constraint "
+        "WHERE conrelid = 'attendance_reasons'::regclass AND confrelid = CAST(:table AS regclass) AND contype = 'f'"
+    ), {"table": referenced})]
+    for name in names:
+        op.execute(f'ALTER TABLE attendance_reasons DROP CONSTRAINT "{name}"')
+
+def _own_sequence(conn, from_table: str, to_table: str) -> None:
+    """Keep the id sequence alive when the old table is dropped"""
+    sequence = conn.execute(sa.text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": from_table}).scalar()
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {to_table}.id")
+
+def _add_foreign_keys(table: str) -> None:
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT attendances_user_id_foreign "
+        "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE"
+    )
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT attendances_office_id_foreign "
+        "FOREIGN KEY (office_id) REFERENCES offices (id) ON DELETE CASCADE"
+    )
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    indexes = _index_definitions(conn, "attendances")
+
+    op.execute("LOCK TABLE attendances IN ACCESS EXCLUSIVE MODE")
+    op.execute(f"ALTER TABLE attendances RENAME TO {LEGACY}")
+    _rename_indexes(conn, LEGACY, "_unpartitioned")
+    _drop_reason_fk(conn, LEGACY)
+
+    op.execute(
+        f"CREATE TABLE attendances (LIKE {LEGACY} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS) "
+        "PARTITION BY RANGE (log_date)"
+    )
+    op.execute("ALTER TABLE attendances ADD CONSTRAINT attendances_pkey PRIMARY KEY (id, log_date)")
+    _own_sequence(conn, LEGACY, "attendances")
+    _add_foreign_keys("attendances")
+
+    oldest = conn.execute(sa.text(f"SELECT min(log_date) FROM {LEGACY}")).scalar()
+    current = month_start(date.today())
+    month = month_start(oldest) if oldest and oldest < current else current
+    last = add_months(current, settings.ATTENDANCE_PARTITION_MONTHS_AHEAD)
+    while month <= last:
+        create_month_partition(conn, "attendances", month)
+        month = add_months(month, 1)
+    op.execute("CREATE TABLE IF NOT EXISTS attendances_default PARTITION OF attendances DEFAULT")
+
+    op.execute(f"INSERT INTO attendances SELECT * FROM {LEGACY}")
+    for definition in indexes:
+        op.execute(definition)
+    op.execute("ANALYZE attendances")
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    indexes = _index_definitions(conn, "attendances")
+
+    op.execute("LOCK TABLE attendances IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE attendances RENAME TO attendances_partitioned")
+    _rename_indexes(conn, "attendances_partitioned", "_partitioned")
+
+    op.execute(
+        "CREATE TABLE attendances (LIKE attendances_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS)"
+    )
+    op.execute("INSERT INTO attendances SELECT * FROM attendances_partitioned")
+    op.execute("ALTER TABLE attendances ADD CONSTRAINT attendances_pkey PRIMARY KEY (id)")
+    _own_sequence(conn, "attendances_partitioned", "attendances")
+    _add_foreign_keys("attendances")
+    for definition in indexes:
+        op.execute(definition)
+
+    op.execute("DROP TABLE attendances_partitioned")
+    op.execute(
+        "ALTER TABLE attendance_reasons ADD CONSTRAINT attendance_reasons_attendance_id_foreign "
+        "FOREIGN KEY (attendance_id) REFERENCES attendances (id) ON DELETE CASCADE"
+    )
@@ -0,0 +1,38 @@
+"""Ledger of synced offline kiosk scans
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+- kiosk_scans: one row per (device_id, scan_id) posted to /scan/kiosk/sync, with its outcome;
+  a re-sent scan is answered from here instead of being applied twice
+- created_at index for the retention purge
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "kiosk_scans",
+        sa.Column("device_id", sa.String(64), nullable=False),
+        sa.Column("scan_id", sa.String(64), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("action", sa.String(16), nullable=False),
+        sa.Column("scanned_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("reason", sa.Text(), nullable=True),
+        sa.Column("attendance_id", sa.Integer(), nullable=True),
+        sa.Column("attendance_status", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("device_id", "scan_id", name="kiosk_scans_pkey"),
+    )
+    op.create_index("kiosk_scans_created_at_index", "kiosk_scans", ["created_at"])
+
+def downgrade() -> None:
+    op.drop_index("kiosk_scans_created_at_index", table_name="kiosk_scans")
+    op.drop_table("kiosk_scans")
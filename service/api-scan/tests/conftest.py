@@ -0,0 +1,89 @@
+"""
+    Shared fixtures. Database tests run against a throwaway Postgres: point TEST_DATABASE_URL
+    (postgresql+psycopg://...) at a database whose public schema may be dropped; without it
+    they are skipped.
+
+    The schema is built the way production gets it: the Laravel-owned tables from the ORM
+    models, then every api-scan alembic revision in order (hot-query indexes, monthly
+    partitions of attendances, kiosk ledger).
+"""
+import os
+
+import pytest
+from alembic.config import Config
+from alembic.runtime.environment import EnvironmentContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import MetaData, create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.main  # noqa: F401  (registers every model on Base.metadata)
+from app.Shared.Infra.database import Base
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+VERSION_TABLE = "api_scan_alembic_version"
+
+# Created by alembic revisions, not by the ORM
+MIGRATION_TABLES = {"kiosk_scans"}
+
+# Laravel-owned indexes the api-scan queries rely on (api-staff-management/database/migrations)
+LARAVEL_INDEXES = (
+    # 2026_10_20_000000_add_keyset_indexes_to_offices_and_qr_codes
+    "CREATE INDEX offices_created_at_id_index ON offices (created_at, id)",
+    "CREATE INDEX qr_codes_created_at_id_index ON qr_codes (created_at DESC NULLS LAST, id DESC)",
+)
+
+def _run_migrations(engine) -> None:
+    """alembic upgrade heads on the test connection (migrations/env.py always targets settings)"""
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    script = ScriptDirectory.from_config(config)
+
+    def upgrade(revision, context):
+        return script._upgrade_revs("heads", revision)
+
+    with engine.connect() as conn, EnvironmentContext(config, script, fn=upgrade) as environment:
+        environment.configure(connection=conn, version_table=VERSION_TABLE, transaction_per_migration=True)
+        with environment.begin_transaction():
+            environment.run_migrations()
+
+def _laravel_metadata() -> MetaData:
+    """The ORM tables as Laravel creates them: attendances is still a plain table (0002 partitions it)"""
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        if table.name not in MIGRATION_TABLES:
+            table.to_metadata(metadata)
+    metadata.tables["attendances"].dialect_options["postgresql"]["partition_by"] = None
+    return metadata
+
+def _build_schema(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+        _laravel_metadata().create_all(conn)
+        for statement in LARAVEL_INDEXES:
+            conn.execute(text(statement))
+    _run_migrations(engine)
+
+@pytest.fixture(scope="session")
+def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(TEST_DATABASE_URL)
+    _build_schema(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    """Session on the test database; every table is emptied afterwards"""
+    session: Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        tables = ", ".join(t.name for t in Base.metadata.sorted_tables)
+        with engine.begin() as conn:
+            conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
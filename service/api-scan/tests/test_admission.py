@@ -0,0 +1,69 @@
+"""
+    Admission control (Shared/Infra/admission.py): slots reserved for CRITICAL requests stay
+    free for check-ins while background work fills the rest, and a released slot goes to the
+    highest class allowed to use it.
+"""
+import asyncio
+
+from app.Shared.Infra.admission import BACKGROUND, CRITICAL, STANDARD, AdmissionController
+
+def _controller() -> AdmissionController:
+    return AdmissionController(
+        capacity=4,
+        reserves={CRITICAL: 2},
+        queue_limits={CRITICAL: 10, STANDARD: 10, BACKGROUND: 10},
+        queue_timeout=5.0
+    )
+
+def test_background_requests_cannot_take_reserved_slots():
+    async def scenario():
+        controller = _controller()
+        # Two exports stream away; a third waits instead of taking a reserved slot
+        assert await controller.acquire(BACKGROUND) is None
+        assert await controller.acquire(BACKGROUND) is None
+        export = asyncio.ensure_future(controller.acquire(BACKGROUND))
+        await asyncio.sleep(0)
+        assert not export.done()
+
+        # Check-ins still get in right away
+        assert await controller.acquire(CRITICAL) is None
+        assert await controller.acquire(CRITICAL) is None
+        assert controller.in_flight == 4
+
+        # A freed slot goes to the queued check-in, not to the export queued before it
+        check_in = asyncio.ensure_future(controller.acquire(CRITICAL))
+        await asyncio.sleep(0)
+        controller.release()
+        assert await check_in is None
+        assert not export.done()
+
+        # Only below the background limit (4 - 2 reserved) does the export get its turn
+        for _ in range(2):
+            controller.release()
+            await asyncio.sleep(0)
+            assert not export.done()
+        assert controller.in_flight == 2
+        controller.release()
+        assert await export is None
+        assert controller.in_flight == 2
+
+    asyncio.run(scenario())
+
+def test_released_slot_goes_to_the_higher_queued_class():
+    async def scenario():
+        controller = _controller()
+        for _ in range(2):
+            assert await controller.acquire(STANDARD) is None
+        report = asyncio.ensure_future(controller.acquire(BACKGROUND))
+        listing = asyncio.ensure_future(controller.acquire(STANDARD))
+        await asyncio.sleep(0)
+        assert not report.done() and not listing.done()
+
+        # Higher class first once a slot below the limit frees up
+        controller.release()
+        assert await listing is None
+        assert not report.done()
+        controller.release()
+        assert await report is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,140 @@
+"""
+    Analytics cube (Analytics/Services/attendance_cube.py).
+
+    Benchmark: 5,000 users x 365 days of archived months through the heatmap, per-user and
+    office endpoints' service calls; timings are printed (pytest -s). Database test: a closed
+    month that is not archived is rebuilt once a write moves its rollup watermark.
+"""
+import json
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+
+from app.Domain.v1.Analytics.Controllers.analytics_controller import AnalyticsService
+from app.Domain.v1.Analytics.Services.attendance_cube import LATE, PRESENT, build_cube, get_month_cube
+from app.Domain.v1.Attendance_Records.Services.columnar_archive import (
+    ARCHIVE_VERSION,
+    COLUMNS,
+    STATUS_CODES,
+    day_number,
+    month_bounds,
+    month_key,
+    months_between,
+)
+from app.Domain.v1.Attendances.Services.day_close_service import auto_absent
+from app.Shared.Core.config import settings
+from app.Shared.Infra.partitioning import add_months, month_start
+
+USERS = 5_000
+YEAR_FROM, YEAR_TO = date(2025, 1, 1), date(2025, 12, 31)
+OFFICES = 8
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ATTENDANCE_ARCHIVE_DIR", str(tmp_path))
+    return tmp_path
+
+def _write_archived_month(directory, month: date, rng) -> int:
+    """One month in the export_month layout: every user has a row on every weekday"""
+    first, last = month_bounds(month)
+    days = np.array([
+        day_number(first + timedelta(days=n))
+        for n in range((last - first).days + 1)
+        if (first + timedelta(days=n)).weekday() < 5
+    ], dtype=np.int32)
+    user_ids = np.repeat(np.arange(1, USERS + 1, dtype=np.int32), len(days))
+    rows = user_ids.size
+    status = rng.choice(
+        [STATUS_CODES["present"], STATUS_CODES["late"], STATUS_CODES["absent"]], size=rows, p=[0.8, 0.15, 0.05]
+    ).astype(np.uint8)
+    late = status == STATUS_CODES["late"]
+    columns = {
+        "id": np.arange(rows, dtype=np.int64),
+        "user_id": user_ids,
+        "office_id": (user_ids % OFFICES + 1).astype(np.int32),
+        "day": np.tile(days, USERS),
+        "status": status,
+        "minutes_late": np.where(late, rng.integers(1, 90, size=rows), 0).astype(np.int16),
+        "work_hours": np.where(status == STATUS_CODES["absent"], np.nan, rng.uniform(6, 10, size=rows)).astype(np.float32),
+        "check_in": np.full(rows, 8 * 60, dtype=np.int16),
+        "check_out": np.full(rows, 17 * 60, dtype=np.int16),
+    }
+
+    month_dir = os.path.join(directory, month_key(month))
+    os.makedirs(month_dir)
+    for name, dtype in COLUMNS.items():
+        np.save(os.path.join(month_dir, f"{name}.npy"), columns[name].astype(dtype))
+    with open(os.path.join(month_dir, "meta.json"), "w") as f:
+        json.dump({
+            "version": ARCHIVE_VERSION,
+            "month": month_key(month),
+            "rows": rows,
+            "status_codes": STATUS_CODES,
+            "built_at": datetime.now(timezone.utc).isoformat(),
+        }, f)
+    return int(np.count_nonzero(status == STATUS_CODES["present"]))
+
+def _timed(label, timings, call):
+    started = time.perf_counter()
+    result = call()
+    timings.append(f"{label} {(time.perf_counter() - started) * 1000:.0f} ms")
+    return result
+
+def test_year_cube_for_5000_users(archive_dir):
+    rng = np.random.default_rng(41)
+    present = sum(_write_archived_month(str(archive_dir), month, rng) for month in months_between(YEAR_FROM, YEAR_TO))
+    timings = []
+
+    # Archived months never touch the database
+    cube = _timed("build (cold)", timings, lambda: build_cube(None, YEAR_FROM, YEAR_TO))
+    _timed("build (cached months)", timings, lambda: build_cube(None, YEAR_FROM, YEAR_TO))
+    assert cube.status.shape == (USERS, 365)
+    assert int(np.count_nonzero(cube.status == PRESENT)) == present
+
+    heatmap = _timed("heatmap page", timings, lambda: AnalyticsService.get_heatmap(None, YEAR_FROM, YEAR_TO, None, 100, 0))
+    assert heatmap.total_users == USERS and len(heatmap.rows) == 100 and len(heatmap.day_totals) == 365
+    assert sum(day.present for day in heatmap.day_totals) == present
+
+    users = _timed("per-user, all users", timings, lambda: AnalyticsService.get_user_analytics(None, YEAR_FROM, YEAR_TO, None, USERS, 0))
+    assert len(users.users) == USERS
+    assert all(user.longest_on_time_streak >= user.current_on_time_streak for user in users.users)
+    assert all(user.minutes_late_percentiles["p50"] <= user.minutes_late_percentiles["p95"] for user in users.users if user.late)
+
+    offices = _timed("office comparison", timings, lambda: AnalyticsService.get_office_comparison(None, YEAR_FROM, YEAR_TO))
+    assert len(offices.offices) == OFFICES
+    assert sum(office.users for office in offices.offices) == USERS
+
+    print(f"\n{USERS} users x 365 days: " + ", ".join(timings))
+
+# ==================== Closed months served from Postgres ====================
+
+MONTH = add_months(month_start(date.today()), -3)
+FIRST, LAST = month_bounds(MONTH)
+MONDAY = FIRST + timedelta(days=(7 - FIRST.weekday()) % 7)
+
+def test_closed_database_month_follows_its_rollup(archive_dir, db, monkeypatch):
+    monkeypatch.setattr(settings, "AUTO_ABSENT_WEEKDAYS", "0,1,2,3,4")
+    db.execute(text("INSERT INTO users (id, username, email, password) VALUES (1, 'a', 'a@example.com', 'x'), (2, 'b', 'b@example.com', 'x')"))
+    db.execute(text("INSERT INTO offices (id, name, shift_start, shift_end) VALUES (1, 'Head office', '08:00', '17:00')"))
+    db.execute(text("INSERT INTO staff_info (user_id, office_id, full_name) VALUES (1, 1, 'A'), (2, 1, 'B')"))
+    db.execute(text(
+        "INSERT INTO attendances (user_id, office_id, log_date, check_in, status, minutes_late) "
+        "VALUES (1, 1, :day, '08:20', 'late', 20)"
+    ), {"day": MONDAY})
+    db.commit()
+
+    cube = get_month_cube(db, MONTH)
+    assert cube.user_ids.tolist() == [1]
+    assert cube.status[0, (MONDAY - FIRST).days] == LATE
+    # Nothing written since: the cached cube is reused
+    assert get_month_cube(db, MONTH) is cube
+
+    # A late write (goes through the rollup) moves the watermark: the month is rebuilt
+    assert auto_absent(db, MONDAY) == 1
+    rebuilt = get_month_cube(db, MONTH)
+    assert rebuilt is not cube
+    assert rebuilt.user_ids.tolist() == [1, 2]
@@ -0,0 +1,92 @@
+"""
+    Columnar archive invalidation: a committed write into an archived month sends readers back
+    to Postgres until the month is exported again.
+"""
+import os
+import time
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.Domain.v1.Attendance_Records.Services.columnar_archive import (
+    archive_closed_months,
+    export_month,
+    is_archived,
+    month_bounds,
+    month_key,
+)
+from app.Domain.v1.Attendance_Records.Services.record_statistics import compute_statistics
+from app.Domain.v1.Attendances.Services.day_close_service import auto_absent
+from app.Shared.Core.config import settings
+from app.Shared.Infra.partitioning import add_months, month_start
+
+# Three months back: closed and archivable whatever today is
+MONTH = add_months(month_start(date.today()), -3)
+FIRST, LAST = month_bounds(MONTH)
+# First Monday of the month (a working day for auto_absent)
+MONDAY = FIRST + timedelta(days=(7 - FIRST.weekday()) % 7)
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ATTENDANCE_ARCHIVE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "AUTO_ABSENT_WEEKDAYS", "0,1,2,3,4")
+    return tmp_path
+
+@pytest.fixture
+def seeded(db):
+    db.execute(text(
+        "INSERT INTO users (id, username, email, password) "
+        "SELECT n, 'user' || n, 'user' || n || '@example.com', 'x' FROM generate_series(1, 3) n"
+    ))
+    db.execute(text("INSERT INTO offices (id, name, shift_start, shift_end) VALUES (1, 'Head office', '08:00', '17:00')"))
+    db.execute(text(
+        "INSERT INTO staff_info (user_id, office_id, full_name) SELECT n, 1, 'Staff ' || n FROM generate_series(1, 3) n"
+    ))
+    # Users 1 and 2 checked in every day of the month; user 3 never did
+    db.execute(text(
+        "INSERT INTO attendances (user_id, office_id, log_date, check_in, check_out, status, minutes_late) "
+        "SELECT u, 1, d::date, '08:00', '17:00', 'present', 0 "
+        "FROM generate_series(1, 2) u, generate_series(CAST(:first AS date), CAST(:last AS date), interval '1 day') d"
+    ), {"first": FIRST, "last": LAST})
+    db.commit()
+    return db
+
+def _month_stats(db):
+    stats = compute_statistics(db, FIRST, LAST)
+    return stats.months[0].source, stats.totals.total
+
+def test_backdated_write_invalidates_archived_month(archive_dir, seeded):
+    db = seeded
+    days = (LAST - FIRST).days + 1
+
+    export_month(db, MONTH)
+    assert _month_stats(db) == ("archive", 2 * days)
+
+    # Closing an old day by hand (close_attendance_day --date) writes into the archived month
+    assert auto_absent(db, MONDAY) == 1
+    assert not is_archived(MONTH)
+    assert _month_stats(db) == ("database", 2 * days + 1)
+
+    # The next archive run picks the dirty month up again
+    assert month_key(MONTH) in archive_closed_months(db)
+    assert _month_stats(db) == ("archive", 2 * days + 1)
+    assert not os.path.exists(archive_dir / f"{month_key(MONTH)}.dirty")
+
+def test_write_during_export_keeps_month_dirty(archive_dir, seeded):
+    db = seeded
+    export_month(db, MONTH)
+    auto_absent(db, MONDAY)
+
+    # The marker is newer than the export's read: the rebuilt month may already be stale
+    marker = archive_dir / f"{month_key(MONTH)}.dirty"
+    later = time.time() + 60
+    os.utime(marker, (later, later))
+    export_month(db, MONTH)
+
+    assert marker.exists()
+    assert not is_archived(MONTH)
+
+def test_writes_to_months_never_archived_leave_no_marker(archive_dir, seeded):
+    auto_absent(seeded, MONDAY)
+    assert list(archive_dir.iterdir()) == []
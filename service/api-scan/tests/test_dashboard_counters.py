@@ -0,0 +1,89 @@
+"""
+    Live dashboard counters (Dashboard/Services/counter_service.py) on a fake Redis: a check-in
+    counted while a rebuild runs survives it, and a cold day is rebuilt by one reader at a time.
+"""
+from datetime import date
+
+import fakeredis
+import pytest
+from sqlalchemy import text
+
+from app.Domain.v1.Dashboard.Services import counter_service
+from app.Domain.v1.Dashboard.Services.counter_service import (
+    BUILT_FIELD,
+    get_counters,
+    rebuild_counters,
+    record_check_in,
+)
+from app.Shared.Infra import redis as redis_module
+from app.Shared.Infra.distributed_lock import redis_lock
+
+DAY = date(2026, 10, 19)
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_module, "_sync_redis_client", client)
+    return client
+
+@pytest.fixture
+def checked_in(db):
+    db.execute(text(
+        "INSERT INTO users (id, username, email, password) "
+        "SELECT n, 'user' || n, 'user' || n || '@example.com', 'x' FROM generate_series(1, 3) n"
+    ))
+    db.execute(text("INSERT INTO offices (id, name, shift_start, shift_end) VALUES (1, 'Head office', '08:00', '17:00')"))
+    db.execute(text(
+        "INSERT INTO attendances (user_id, office_id, log_date, check_in, status, minutes_late) "
+        "VALUES (1, 1, :day, '08:00', 'present', 0), (2, 1, :day, '08:20', 'late', 20)"
+    ), {"day": DAY})
+    db.commit()
+    return db
+
+def _check_in(db, user_id: int) -> None:
+    """What AttendanceService.check_in does: commit the row, then count it"""
+    db.execute(text(
+        "INSERT INTO attendances (user_id, office_id, log_date, check_in, status, minutes_late) "
+        "VALUES (:user_id, 1, :day, '08:30', 'late', 30)"
+    ), {"user_id": user_id, "day": DAY})
+    db.commit()
+    record_check_in(DAY, 1, "late")
+
+def test_check_in_during_rebuild_is_not_erased(fake_redis, checked_in, monkeypatch):
+    db = checked_in
+    aggregate = counter_service._aggregate_from_sql
+    calls = []
+
+    def aggregate_then_check_in(session, day):
+        result = aggregate(session, day)
+        calls.append(day)
+        if len(calls) == 1:
+            # Commits and increments after the rebuild's SQL read, before its write
+            _check_in(db, 3)
+        return result
+
+    monkeypatch.setattr(counter_service, "_aggregate_from_sql", aggregate_then_check_in)
+    totals = rebuild_counters(db, DAY)
+
+    assert len(calls) == 2
+    assert totals["total"] == 3 and totals["late"] == 2
+    assert get_counters(db, DAY)["total"] == 3
+    assert get_counters(db, DAY, 1)["late"] == 2
+
+def test_cold_day_is_rebuilt_by_one_reader(fake_redis, checked_in, monkeypatch):
+    db = checked_in
+    rebuilds = []
+    monkeypatch.setattr(counter_service, "rebuild_counters", lambda *args: rebuilds.append(args) or {})
+
+    # Another reader holds the rebuild: this one answers from SQL and leaves Redis alone
+    with redis_lock(f"dashboard:counters:{DAY.isoformat()}", 30) as acquired:
+        assert acquired
+        assert get_counters(db, DAY)["total"] == 2
+        assert get_counters(db, DAY, 1)["present"] == 1
+    assert rebuilds == []
+    assert not fake_redis.hexists(f"dashboard:counters:{DAY.isoformat()}", BUILT_FIELD)
+
+    monkeypatch.undo()
+    monkeypatch.setattr(redis_module, "_sync_redis_client", fake_redis)
+    assert get_counters(db, DAY)["total"] == 2
+    assert fake_redis.hexists(f"dashboard:counters:{DAY.isoformat()}", BUILT_FIELD)
@@ -0,0 +1,114 @@
+"""
+    Dashboard rollup (Dashboard/Services/summary_service.py): a trend built before a write into
+    its closed month is never served after it, and a backfill survives a rollup row inserted
+    while it runs.
+"""
+import threading
+import time
+from datetime import date, timedelta
+
+import fakeredis
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.Domain.v1.Attendances.Services.day_close_service import auto_absent
+from app.Domain.v1.Dashboard.Controllers.dashboard_controller import DashboardService
+from app.Domain.v1.Dashboard.Services.summary_service import (
+    apply_summary_delta,
+    rebuild_summary,
+    rollup_watermarks,
+    store_cached_trend,
+)
+from app.Shared.Core.config import settings
+from app.Shared.Infra import redis as redis_module
+from app.Shared.Infra.partitioning import add_months, month_start
+
+# Two months back: closed whatever today is
+MONTH = add_months(month_start(date.today()), -2)
+MONDAY = MONTH + timedelta(days=(7 - MONTH.weekday()) % 7)
+
+@pytest.fixture
+def fake_redis(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "ATTENDANCE_ARCHIVE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "AUTO_ABSENT_WEEKDAYS", "0,1,2,3,4")
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_module, "_sync_redis_client", client)
+    return client
+
+@pytest.fixture
+def staff(db):
+    db.execute(text(
+        "INSERT INTO users (id, username, email, password) "
+        "SELECT n, 'user' || n, 'user' || n || '@example.com', 'x' FROM generate_series(1, 2) n"
+    ))
+    db.execute(text("INSERT INTO offices (id, name, shift_start, shift_end) VALUES (1, 'Head office', '08:00', '17:00')"))
+    db.execute(text("INSERT INTO staff_info (user_id, office_id, full_name) VALUES (1, 1, 'Staff 1'), (2, 1, 'Staff 2')"))
+    db.execute(text(
+        "INSERT INTO attendances (user_id, office_id, log_date, check_in, status, minutes_late) "
+        "VALUES (1, 1, :day, '08:00', 'present', 0)"
+    ), {"day": MONDAY})
+    db.commit()
+    rebuild_summary(db, MONTH, MONDAY)
+    return db
+
+def _staff_on(trend, day: date) -> int:
+    return next(point.total_staff for point in trend.data_points if point.date == day.isoformat())
+
+def test_trend_built_before_a_write_is_not_served_after_it(fake_redis, staff):
+    db = staff
+    year, month = MONTH.year, MONTH.month
+
+    # A reader misses and builds from the current rollup...
+    versions = rollup_watermarks(db, [(year, month)])
+    stale = DashboardService._build_monthly_trend(db, year, month)
+    assert _staff_on(stale, MONDAY) == 1
+
+    # ...a backdated write commits...
+    assert auto_absent(db, MONDAY) == 1
+    # ...and the reader stores what it built, after the write
+    store_cached_trend(year, month, versions[(year, month)], stale.model_dump_json())
+
+    assert _staff_on(DashboardService._get_monthly_trend(db, year, month), MONDAY) == 2
+    # The fresh trend is cached under the new watermark and served from there
+    assert len(fake_redis.keys("dashboard:trend:*")) == 2
+    assert _staff_on(DashboardService._get_trend_range(db, 3)[0], MONDAY) == 2
+
+def test_rebuild_overwrites_rollup_row_inserted_while_it_runs(staff, engine):
+    db = staff
+    day = MONDAY + timedelta(days=1)
+    db.execute(text(
+        "INSERT INTO attendances (user_id, office_id, log_date, check_in, status, minutes_late) "
+        "VALUES (2, 1, :day, '08:10', 'late', 10)"
+    ), {"day": day})
+    db.commit()
+
+    # A check-in's rollup upsert for that day, not committed yet: the rebuild's DELETE misses it
+    # and its INSERT waits on the unique key
+    writer = sessionmaker(bind=engine)()
+    apply_summary_delta(writer, day, 1, total_count=1, late_count=1)
+
+    errors = []
+    backfill = sessionmaker(bind=engine)()
+
+    def run():
+        try:
+            rebuild_summary(backfill, MONTH, day)
+        except Exception as e:
+            errors.append(e)
+
+    job = threading.Thread(target=run)
+    try:
+        job.start()
+        time.sleep(0.5)
+        assert job.is_alive()
+        writer.commit()
+        job.join(10)
+    finally:
+        writer.close()
+        backfill.close()
+
+    assert errors == []
+    assert db.execute(text(
+        "SELECT total_count, late_count FROM daily_attendance_summary WHERE summary_date = :day AND office_id = 1"
+    ), {"day": day}).one() == (1, 1)
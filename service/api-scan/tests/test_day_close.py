@@ -0,0 +1,151 @@
+"""
+    Day close (Attendances/Services/day_close_service.py) auto-absent: idempotent re-runs, a late
+    check-in racing the job, the join_date cutoff, non-working days, and permission requests
+    replacing the rows it wrote.
+"""
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.Domain.v1.Attendances.Controllers.attendance_controller import AttendanceService
+from app.Domain.v1.Attendances.Schemas.attendance_schema import BulkPermissionRequest, PermissionRequest
+from app.Domain.v1.Attendances.Services.day_close_service import AUTO_ABSENT_REASON_TYPE, auto_absent
+from app.Shared.Core.config import settings
+
+# Next Monday from today: permission requests may not be in the past, and the job does close
+# days the validators still accept (it closes the Bangkok day that just ended while date.today()
+# runs on server time; close_attendance_day --date closes any day)
+MONDAY = date.today() + timedelta(days=-date.today().weekday() % 7)
+SUNDAY = MONDAY - timedelta(days=1)
+REASON = "Family emergency, could not come in"
+
+@pytest.fixture
+def staff(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ATTENDANCE_ARCHIVE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "AUTO_ABSENT_WEEKDAYS", "0,1,2,3,4")
+    db.execute(text(
+        "INSERT INTO users (id, username, email, password) "
+        "SELECT n, 'user' || n, 'user' || n || '@example.com', 'x' FROM generate_series(1, 4) n"
+    ))
+    db.execute(text("INSERT INTO offices (id, name, shift_start, shift_end) VALUES (1, 'Head office', '08:00', '17:00')"))
+    # 1: no join date, 2: joined that day, 3: joins the day after, 4: checked in
+    db.execute(text(
+        "INSERT INTO staff_info (user_id, office_id, full_name, join_date) VALUES "
+        "(1, 1, 'Staff 1', NULL), (2, 1, 'Staff 2', :day), (3, 1, 'Staff 3', :after), (4, 1, 'Staff 4', NULL)"
+    ), {"day": MONDAY, "after": MONDAY + timedelta(days=1)})
+    db.execute(text(
+        "INSERT INTO attendances (user_id, office_id, log_date, check_in, status, minutes_late) "
+        "VALUES (4, 1, :day, '08:00', 'present', 0)"
+    ), {"day": MONDAY})
+    db.commit()
+    return db
+
+def _rows(db, day=MONDAY):
+    return db.execute(text(
+        "SELECT a.user_id, a.status, array_remove(array_agg(r.reason_type ORDER BY r.id), NULL) AS reasons "
+        "FROM attendances a LEFT JOIN attendance_reasons r ON r.attendance_id = a.id "
+        "WHERE a.log_date = :day GROUP BY a.user_id, a.status ORDER BY a.user_id"
+    ), {"day": day}).all()
+
+def _summary(db, day=MONDAY):
+    return db.execute(text(
+        "SELECT coalesce(sum(total_count), 0), coalesce(sum(absent_count), 0) "
+        "FROM daily_attendance_summary WHERE summary_date = :day"
+    ), {"day": day}).one()
+
+def test_auto_absent_respects_join_date_and_is_idempotent(staff):
+    db = staff
+    assert auto_absent(db, MONDAY) == 2
+    assert [(row.user_id, row.status, row.reasons) for row in _rows(db)] == [
+        (1, "absent", [AUTO_ABSENT_REASON_TYPE]),
+        (2, "absent", [AUTO_ABSENT_REASON_TYPE]),
+        (4, "present", []),
+    ]
+    assert tuple(_summary(db)) == (2, 2)
+
+    # Re-running finds nothing left to do
+    assert auto_absent(db, MONDAY) == 0
+    assert len(_rows(db)) == 3
+    assert tuple(_summary(db)) == (2, 2)
+
+def test_auto_absent_skips_non_working_days(staff):
+    assert auto_absent(staff, SUNDAY) == 0
+    assert _rows(staff, SUNDAY) == []
+    assert tuple(_summary(staff, SUNDAY)) == (0, 0)
+
+def test_late_check_in_racing_the_job_keeps_its_row(staff, engine):
+    db = staff
+    check_in = engine.connect()
+    transaction = check_in.begin()
+    # Not committed yet: the job's NOT EXISTS does not see it, its INSERT waits on the unique key
+    check_in.execute(text(
+        "INSERT INTO attendances (user_id, office_id, log_date, check_in, status, minutes_late) "
+        "VALUES (1, 1, :day, '09:30', 'late', 90)"
+    ), {"day": MONDAY})
+
+    result = {}
+    job_session = sessionmaker(bind=engine)()
+    job = threading.Thread(target=lambda: result.setdefault("inserted", auto_absent(job_session, MONDAY)))
+    try:
+        job.start()
+        time.sleep(0.5)
+        assert job.is_alive()
+        transaction.commit()
+        job.join(10)
+    finally:
+        check_in.close()
+        job_session.close()
+
+    assert result["inserted"] == 1
+    assert [(row.user_id, row.status, row.reasons) for row in _rows(db)] == [
+        (1, "late", []),
+        (2, "absent", [AUTO_ABSENT_REASON_TYPE]),
+        (4, "present", []),
+    ]
+    assert tuple(_summary(db)) == (1, 1)
+
+def test_permission_request_replaces_auto_absent_row(staff):
+    db = staff
+    auto_absent(db, MONDAY)
+
+    response = AttendanceService.create_permission_request(
+        db, 1, PermissionRequest(date=MONDAY.isoformat(), reason_type="absent", reason=REASON)
+    )
+    assert response.attendance.office_id == 1
+    assert [reason.reason_type for reason in response.attendance.attendance_reasons] == ["absent"]
+    assert _rows(db)[0].reasons == ["absent"]
+    # Still one absent row for the day
+    assert tuple(_summary(db)) == (2, 2)
+
+    # A real attendance is still refused
+    with pytest.raises(HTTPException) as refused:
+        AttendanceService.create_permission_request(
+            db, 4, PermissionRequest(date=MONDAY.isoformat(), reason_type="absent", reason=REASON)
+        )
+    assert refused.value.status_code == 400
+
+def test_bulk_permission_request_replaces_auto_absent_rows(staff):
+    db = staff
+    auto_absent(db, MONDAY)
+
+    response = AttendanceService.create_bulk_permission_request(
+        db, 2, BulkPermissionRequest(
+            start_date=MONDAY, end_date=MONDAY + timedelta(days=1), reason_type="absent", reason=REASON
+        )
+    )
+    assert [attendance.log_date for attendance in response.attendances] == [MONDAY, MONDAY + timedelta(days=1)]
+    assert response.skipped_dates == []
+    assert _rows(db)[1].reasons == ["absent"]
+    assert tuple(_summary(db)) == (2, 2)
+    assert tuple(_summary(db, MONDAY + timedelta(days=1))) == (1, 1)
+
+    # User 4 checked in that Monday: skipped, not replaced
+    response = AttendanceService.create_bulk_permission_request(
+        db, 4, BulkPermissionRequest(dates=[MONDAY], reason_type="absent", reason=REASON)
+    )
+    assert response.attendances == [] and response.skipped_dates == [MONDAY]
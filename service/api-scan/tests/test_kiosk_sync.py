@@ -0,0 +1,172 @@
+"""
+    Offline kiosk sync (Attendances/Services/kiosk_sync.py, POST /scan/kiosk/sync): a re-sent
+    batch gets its stored outcomes back, a check-in and check-out of one user in one batch make
+    one row, a live check-in committing first wins the day, and a badly signed batch is refused.
+"""
+import hashlib
+import hmac
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.Domain.v1.Attendances.Schemas.attendance_schema import KioskScanItem
+from app.Domain.v1.Attendances.Services import kiosk_sync
+from app.Domain.v1.Attendances.Services.kiosk_sync import APPLIED, REJECTED, sync_scans
+from app.Shared.Infra import redis as redis_module
+from app.Shared.Infra.database import get_db
+from app.main import app
+
+DEVICE_ID = "kiosk-1"
+SECRET = b"kiosk-1-secret"
+TOKEN = "office-1-token"
+
+LOCAL_TZ = ZoneInfo("Asia/Bangkok")
+# Yesterday in Bangkok: inside KIOSK_SYNC_MAX_AGE_HOURS whatever the time of day
+DAY = datetime.now(LOCAL_TZ).date() - timedelta(days=1)
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_module, "_sync_redis_client", client)
+    monkeypatch.setattr(kiosk_sync, "_DEVICE_KEYS", {DEVICE_ID: SECRET})
+    return client
+
+@pytest.fixture
+def office(db, fake_redis):
+    db.execute(text(
+        "INSERT INTO users (id, username, email, password) "
+        "SELECT n, 'user' || n, 'user' || n || '@example.com', 'x' FROM generate_series(1, 3) n"
+    ))
+    db.execute(text("INSERT INTO offices (id, name, shift_start, shift_end) VALUES (1, 'Head office', '08:00', '17:00')"))
+    db.execute(text("INSERT INTO qr_codes (id, office_id, qr_token, is_active) VALUES (1, 1, :token, true)"), {"token": TOKEN})
+    db.commit()
+    return db
+
+@pytest.fixture
+def client(office):
+    def test_db():
+        yield office
+
+    app.dependency_overrides[get_db] = test_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+def _scan(scan_id: str, user_id: int, clock: str, action: str = "check_in", token: str = TOKEN) -> dict:
+    scanned_at = datetime.combine(DAY, datetime.strptime(clock, "%H:%M").time(), LOCAL_TZ)
+    return {"scan_id": scan_id, "user_id": user_id, "qr_token": token, "scanned_at": scanned_at.isoformat(), "action": action}
+
+def _post(client, scans, secret: bytes = SECRET):
+    body = json.dumps({"scans": scans}).encode()
+    signature = hmac.new(secret, body, hashlib.sha256).hexdigest()
+    return client.post(
+        "/scan/kiosk/sync",
+        content=body,
+        headers={"Content-Type": "application/json", "X-Kiosk-Id": DEVICE_ID, "X-Kiosk-Signature": signature}
+    )
+
+def _attendances(db):
+    return db.execute(text(
+        "SELECT user_id, check_in::text, check_out::text, status, minutes_late, work_hours::float "
+        "FROM attendances ORDER BY user_id"
+    )).all()
+
+def _summary(db):
+    return db.execute(text(
+        "SELECT total_count, late_count, checked_out_count FROM daily_attendance_summary "
+        "WHERE summary_date = :day AND office_id = 1"
+    ), {"day": DAY}).one_or_none()
+
+def test_check_in_and_out_in_one_batch(client, office):
+    # Sent out of order: the batch is replayed in scanned_at order
+    response = _post(client, [_scan("s2", 1, "17:30", "check_out"), _scan("s1", 1, "08:10")])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["applied"] == 2 and body["rejected"] == 0
+    assert {result["status"] for result in body["results"]} == {APPLIED}
+    assert _attendances(office) == [(1, "08:10:00", "17:30:00", "late", 10, 9.33)]
+    assert _summary(office) == (1, 1, 1)
+
+def test_resent_batch_returns_stored_outcomes(client, office):
+    scans = [_scan("s1", 1, "07:55"), _scan("s2", 2, "08:05"), _scan("s3", 3, "08:00", token="unknown")]
+    first = _post(client, scans).json()
+    assert [result["status"] for result in first["results"]] == [APPLIED, APPLIED, REJECTED]
+
+    # The kiosk never saw the response and sends the same batch again
+    second = _post(client, scans).json()
+    assert second["applied"] == 0 and second["duplicates"] == 3
+    for before, after in zip(first["results"], second["results"]):
+        assert after["duplicate"]
+        assert {**before, "duplicate": True} == after
+    assert len(_attendances(office)) == 2
+    assert _summary(office) == (2, 1, 0)
+
+def test_live_check_in_committing_first_wins(office, engine):
+    # A live check-in for the same user and day, not committed yet
+    live = sessionmaker(bind=engine)()
+    live.execute(text(
+        "INSERT INTO attendances (user_id, office_id, log_date, check_in, status, minutes_late) "
+        "VALUES (1, 1, :day, '08:00', 'present', 0)"
+    ), {"day": DAY})
+
+    scans = [KioskScanItem(**_scan("s1", 1, "08:20")), KioskScanItem(**_scan("s2", 1, "17:00", "check_out"))]
+    outcomes = []
+    errors = []
+    kiosk = sessionmaker(bind=engine)()
+
+    def run():
+        try:
+            outcomes.extend(sync_scans(kiosk, DEVICE_ID, scans))
+        except Exception as e:
+            errors.append(e)
+
+    job = threading.Thread(target=run)
+    try:
+        job.start()
+        # The batch INSERT waits on the (user_id, log_date) key
+        time.sleep(0.5)
+        assert job.is_alive()
+        live.commit()
+        job.join(10)
+    finally:
+        live.close()
+        kiosk.close()
+
+    assert errors == []
+    assert [outcome.status for outcome in outcomes] == [REJECTED, REJECTED]
+    assert outcomes[0].reason == f"Already checked in on {DAY.isoformat()}"
+    assert _attendances(office) == [(1, "08:00:00", None, "present", 0, None)]
+    assert _summary(office) is None
+    assert office.execute(text("SELECT array_agg(status ORDER BY scan_id) FROM kiosk_scans")).scalar() == [REJECTED, REJECTED]
+
+@pytest.mark.parametrize("headers", [
+    {"X-Kiosk-Signature": "00" * 32},
+    {"X-Kiosk-Id": "kiosk-2"},
+    {"X-Kiosk-Signature": ""},
+])
+def test_badly_signed_batch_is_refused(client, office, headers):
+    body = json.dumps({"scans": [_scan("s1", 1, "08:00")]}).encode()
+    signed = {
+        "Content-Type": "application/json",
+        "X-Kiosk-Id": DEVICE_ID,
+        "X-Kiosk-Signature": hmac.new(SECRET, body, hashlib.sha256).hexdigest(),
+    }
+    response = client.post("/scan/kiosk/sync", content=body, headers={**signed, **headers})
+
+    assert response.status_code == 401
+    assert office.execute(text("SELECT count(*) FROM kiosk_scans")).scalar() == 0
+    assert _attendances(office) == []
+
+    # A body changed after signing
+    tampered = body.replace(b'"user_id": 1', b'"user_id": 2')
+    assert client.post("/scan/kiosk/sync", content=tampered, headers=signed).status_code == 401
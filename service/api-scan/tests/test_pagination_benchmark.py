@@ -0,0 +1,126 @@
+"""
+    Keyset pagination (Shared/Core/pagination.py) over 10k offices and 50k QR codes.
+
+    Walks every page through the services and checks each row comes back exactly once in list
+    order (ties on created_at and a NULL tail included), then checks on the real plan that a
+    deep page is one index range seek reading only limit + 1 rows, where OFFSET reads every
+    skipped row. Timings are printed for comparison (pytest -s).
+"""
+import json
+import time
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, text
+
+from app.Domain.v1.Offices.Controllers.office_controller import OfficeService
+from app.Domain.v1.QR_codes.Controllers.qr_controller import QRCodeService
+
+OFFICES = 10_000
+QR_CODES = 50_000
+PAGE = 500
+
+@pytest.fixture
+def seeded(db):
+    # Every 7th row shares its neighbour's created_at (id breaks the tie), every 97th has none
+    db.execute(text(
+        "INSERT INTO offices (name, shift_start, shift_end, created_at) "
+        "SELECT 'Office ' || n, '08:00', '17:00', "
+        "CASE WHEN n % 97 = 0 THEN NULL ELSE timestamptz '2026-01-01' + (n - n % 7) * interval '1 minute' END "
+        "FROM generate_series(1, :count) n"
+    ), {"count": OFFICES})
+    db.execute(text(
+        "INSERT INTO qr_codes (office_id, qr_token, is_active, created_at) "
+        "SELECT 1 + n % :offices, 'token-' || n, n % 3 <> 0, "
+        "CASE WHEN n % 97 = 0 THEN NULL ELSE timestamptz '2026-01-01' + (n - n % 7) * interval '1 second' END "
+        "FROM generate_series(1, :count) n"
+    ), {"offices": OFFICES, "count": QR_CODES})
+    db.commit()
+    db.execute(text("ANALYZE offices"))
+    db.execute(text("ANALYZE qr_codes"))
+    return db
+
+@contextmanager
+def captured_statements(db):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+def _walk(fetch_page):
+    ids, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = fetch_page(cursor)
+        ids.extend(row.id for row in rows)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+def _explain(db, statement, parameters):
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters).scalar()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return list(_plan_nodes(plan[0]["Plan"]))
+
+def test_offices_pages_cover_every_row_once(seeded):
+    db = seeded
+    expected = db.execute(text("SELECT id FROM offices ORDER BY created_at ASC NULLS LAST, id ASC")).scalars().all()
+
+    started = time.perf_counter()
+    ids, pages = _walk(lambda cursor: OfficeService.get_all_offices(db, limit=PAGE, cursor=cursor))
+    elapsed = time.perf_counter() - started
+
+    assert ids == expected
+    assert pages == -(-OFFICES // PAGE)
+    print(f"\noffices: {OFFICES} rows in {pages} pages, {elapsed * 1000:.0f} ms")
+
+def test_qr_codes_pages_cover_every_row_once(seeded):
+    db = seeded
+    expected = db.execute(text("SELECT id FROM qr_codes ORDER BY created_at DESC NULLS LAST, id DESC")).scalars().all()
+
+    started = time.perf_counter()
+    ids, pages = _walk(lambda cursor: QRCodeService.get_all_qr_codes(db, 0, PAGE, None, None, cursor))
+    elapsed = time.perf_counter() - started
+
+    assert ids == expected
+    print(f"\nqr_codes: {QR_CODES} rows in {pages} pages, {elapsed * 1000:.0f} ms")
+
+def test_deep_qr_page_is_one_index_seek(seeded):
+    db = seeded
+    # Cursor of the row half-way down the list
+    skip = QR_CODES // 2
+    _, cursor = QRCodeService.get_all_qr_codes(db, 0, skip, None, None)
+
+    with captured_statements(db) as statements:
+        rows, _ = QRCodeService.get_all_qr_codes(db, 0, PAGE, None, None, cursor)
+    assert len(rows) == PAGE
+
+    keyset_nodes = _explain(db, *statements[0])
+    scans = [node for node in keyset_nodes if node.get("Index Name") == "qr_codes_created_at_id_index"]
+    assert scans, "keyset page did not use the (created_at DESC NULLS LAST, id DESC) index"
+    assert "ROW(created_at, id) <" in scans[0]["Index Cond"]
+    assert not any(node["Node Type"] in ("Sort", "Incremental Sort") for node in keyset_nodes)
+    # A range seek: only the rows of the page (+1 look-ahead) are read, none filtered away
+    assert scans[0]["Actual Rows"] <= PAGE + 1
+    assert scans[0].get("Rows Removed by Filter", 0) == 0
+
+    with captured_statements(db) as statements:
+        QRCodeService.get_all_qr_codes(db, skip, PAGE, None, None)
+    offset_nodes = _explain(db, *statements[0])
+    offset_rows = max(node["Actual Rows"] for node in offset_nodes if node["Node Type"] in ("Index Scan", "Seq Scan"))
+    assert offset_rows >= skip
+
+    keyset_ms = keyset_nodes[0]["Actual Total Time"]
+    offset_ms = offset_nodes[0]["Actual Total Time"]
+    print(f"\ndeep page at row {skip}: keyset {keyset_ms:.2f} ms, offset {offset_ms:.2f} ms ({offset_rows} rows read)")
@@ -0,0 +1,112 @@
+"""
+    Monthly partitions of attendances (Shared/Infra/partitioning.py, partition_service.py):
+    a far-future absence parked in the DEFAULT partition moves into its month when that month
+    is created, and a retention run whose DETACH fails leaves the reasons where they were.
+"""
+from datetime import date
+
+import fakeredis
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.Domain.v1.Attendances.Controllers.attendance_controller import AttendanceService
+from app.Domain.v1.Attendances.Schemas.attendance_schema import PermissionRequest
+from app.Domain.v1.Attendances.Services.partition_service import _retire_reasons
+from app.Shared.Core.config import settings
+from app.Shared.Infra import redis as redis_module
+from app.Shared.Infra.partitioning import (
+    add_months,
+    apply_retention,
+    create_month_partition,
+    ensure_partitions,
+    month_start,
+    partition_name,
+)
+
+CURRENT = month_start(date.today())
+FAR_AHEAD = add_months(CURRENT, 5)
+LONG_AGO = add_months(CURRENT, -24)
+
+@pytest.fixture
+def user(db, monkeypatch):
+    monkeypatch.setattr(redis_module, "_sync_redis_client", fakeredis.FakeRedis(decode_responses=True))
+    db.execute(text("INSERT INTO users (id, username, email, password) VALUES (1, 'user1', 'user1@example.com', 'x')"))
+    db.commit()
+    return db
+
+def _partition_of(db, log_date: date) -> str:
+    partition = db.execute(text(
+        "SELECT tableoid::regclass::text FROM attendances WHERE log_date = :day"
+    ), {"day": log_date}).scalar()
+    # Release the read's lock before the DDL under test
+    db.rollback()
+    return partition
+
+def test_far_future_absence_moves_out_of_default_partition(user, engine):
+    db = user
+    day = FAR_AHEAD.replace(day=10)
+    AttendanceService.create_permission_request(
+        db, 1, PermissionRequest(date=day.isoformat(), reason_type="absent", reason="Planned surgery and recovery")
+    )
+    assert _partition_of(db, day) == "attendances_default"
+
+    # The nightly job reaches that month
+    created = ensure_partitions(engine, "attendances", 6)
+    assert partition_name("attendances", FAR_AHEAD) in created
+    assert _partition_of(db, day) == partition_name("attendances", FAR_AHEAD)
+    assert db.execute(text("SELECT count(*) FROM attendances_default")).scalar() == 0
+    assert db.execute(text(
+        "SELECT r.reason_type FROM attendances a JOIN attendance_reasons r ON r.attendance_id = a.id "
+        "WHERE a.log_date = :day"
+    ), {"day": day}).scalar() == "absent"
+
+    # The DEFAULT partition is attached again
+    assert db.execute(text(
+        "SELECT count(*) FROM pg_inherits WHERE inhrelid = 'attendances_default'::regclass"
+    )).scalar() == 1
+    assert ensure_partitions(engine, "attendances", 6) == []
+
+def test_failed_detach_keeps_reasons(user, engine):
+    db = user
+    schema = settings.ATTENDANCE_ARCHIVE_SCHEMA
+    name = partition_name("attendances", LONG_AGO)
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        create_month_partition(conn, "attendances", LONG_AGO)
+    db.execute(text(
+        "WITH a AS (INSERT INTO attendances (user_id, log_date, status, minutes_late) "
+        "VALUES (1, :day, 'absent', 0) RETURNING id) "
+        "INSERT INTO attendance_reasons (attendance_id, reason_type, reason) SELECT id, 'absent', 'Sick' FROM a"
+    ), {"day": LONG_AGO})
+    db.commit()
+
+    def retire():
+        return apply_retention(
+            engine, "attendances", 24, mode="archive", archive_schema=schema,
+            before_detach=_retire_reasons, lock_timeout_ms=200
+        )
+
+    try:
+        # A long read on the partition: the DETACH times out after the reasons were handled
+        reader = engine.connect()
+        reader.begin()
+        reader.execute(text(f"SELECT count(*) FROM {name}"))
+        try:
+            with pytest.raises(OperationalError):
+                retire()
+        finally:
+            reader.close()
+
+        assert db.execute(text("SELECT count(*) FROM attendance_reasons")).scalar() == 1
+        assert _partition_of(db, LONG_AGO) == name
+
+        assert retire() == [name]
+        assert db.execute(text("SELECT count(*) FROM attendance_reasons")).scalar() == 0
+        assert db.execute(text(f"SELECT count(*) FROM {schema}.{name}_reasons")).scalar() == 1
+        assert db.execute(text(f"SELECT count(*) FROM {schema}.{name}")).scalar() == 1
+    finally:
+        db.rollback()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
@@ -0,0 +1,63 @@
+"""
+    Per-query cost of server-side prepared statements (psycopg prepare_threshold, DB_PREPARE_THRESHOLD).
+
+    Each threshold gets a fresh connection that runs the check-in hot statements (hot_queries.py)
+    until steady state, then a mix of one-off listing statements that each repeat a few times, as
+    filtered listings do. Timings and the number of statements left prepared on the connection
+    are printed (pytest -s).
+"""
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, func, select
+
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Domain.v1.Attendances.Services.hot_queries import ATTENDANCE_FOR_DAY, OFFICE_BY_ID, QR_TOKEN_LOOKUP
+from app.Shared.Core.config import settings
+
+ROUNDS = 3000
+ONE_OFF_STATEMENTS = 40
+ONE_OFF_REPEATS = 3
+
+def _check_in_lookups(conn, n: int) -> None:
+    conn.execute(QR_TOKEN_LOOKUP, {"qr_token": f"token-{n % 50}"}).first()
+    conn.execute(OFFICE_BY_ID, {"office_id": n % 5 + 1}).first()
+    conn.execute(ATTENDANCE_FOR_DAY, {"user_id": n % 100 + 1, "log_date": date(2026, 10, 19)}).first()
+
+def _measure(url, threshold):
+    engine = create_engine(url, pool_size=1, connect_args={"prepare_threshold": threshold})
+    try:
+        with engine.connect() as conn:
+            for n in range(10):
+                _check_in_lookups(conn, n)
+            started = time.perf_counter()
+            for n in range(ROUNDS):
+                _check_in_lookups(conn, n)
+            per_query = (time.perf_counter() - started) / (ROUNDS * 3)
+
+            for k in range(ONE_OFF_STATEMENTS):
+                # A different IN-list length is a different SQL text
+                statement = select(func.count()).select_from(Attendance).where(
+                    Attendance.user_id.in_(list(range(k + 1)))
+                )
+                for _ in range(ONE_OFF_REPEATS):
+                    conn.execute(statement).scalar()
+            prepared = conn.exec_driver_sql("SELECT count(*) FROM pg_prepared_statements").scalar()
+    finally:
+        engine.dispose()
+    return per_query, prepared
+
+def test_prepare_threshold(engine):
+    url = engine.url.render_as_string(hide_password=False)
+    unprepared, _ = _measure(url, None)
+    results = {threshold: _measure(url, threshold) for threshold in (2, 5)}
+
+    print(f"\nunprepared: {unprepared * 1e6:.0f} us/query")
+    for threshold, (per_query, prepared) in results.items():
+        print(f"prepare_threshold={threshold}: {per_query * 1e6:.0f} us/query, {prepared} statements prepared")
+
+    # The hot statements run far more than 5 times per pooled connection: preparing pays off...
+    assert results[settings.DB_PREPARE_THRESHOLD][0] < unprepared
+    # ...and the default threshold prepares only them, not every listing that happens to repeat
+    assert results[5][1] == 3
+    assert results[2][1] == 3 + ONE_OFF_STATEMENTS
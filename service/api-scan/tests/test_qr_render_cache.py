@@ -0,0 +1,38 @@
+"""
+    Disk tier of the QR render cache (QR_codes/Services/qr_render_cache.py) stays under its cap,
+    least recently used files first.
+"""
+import os
+
+from app.Domain.v1.QR_codes.Services.qr_render_cache import QRRenderCache, render_key
+
+def _cache(tmp_path, max_disk_bytes: int, prune_every: int = 1000) -> QRRenderCache:
+    return QRRenderCache(
+        max_entries=8, cache_dir=str(tmp_path), workers=1, max_disk_bytes=max_disk_bytes, prune_every=prune_every
+    )
+
+def _files(tmp_path):
+    return sorted(name for _, _, names in os.walk(tmp_path) for name in names)
+
+def test_prune_removes_least_recently_used_files(tmp_path):
+    cache = _cache(tmp_path, max_disk_bytes=10_000)
+    keys = [render_key(f"token-{n}") for n in range(6)]
+    for n, key in enumerate(keys):
+        cache._write_disk(key, "png", b"x" * 2_000)
+        os.utime(cache._disk_path(key, "png"), (1_000 + n, 1_000 + n))
+
+    # A read makes the oldest file the most recently used
+    assert cache._read_disk(keys[0], "png") == b"x" * 2_000
+
+    assert cache.prune_disk() == 2
+    assert _files(tmp_path) == sorted(f"{key}.png" for key in (keys[0], *keys[3:]))
+    assert cache.prune_disk() == 0
+
+def test_writes_prune_every_n(tmp_path):
+    cache = _cache(tmp_path, max_disk_bytes=5_000, prune_every=4)
+    for n in range(3):
+        cache._write_disk(render_key(f"token-{n}"), "svg", b"x" * 2_000)
+    assert len(_files(tmp_path)) == 3
+
+    cache._write_disk(render_key("token-3"), "svg", b"x" * 2_000)
+    assert sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(tmp_path) for name in names) <= 4_500
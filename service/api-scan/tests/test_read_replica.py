@@ -0,0 +1,109 @@
+"""
+    Read sessions against two local Postgres servers: TEST_DATABASE_URL (primary) and
+    TEST_REPLICA_DATABASE_URL, a streaming standby of it connected as a superuser, e.g.
+
+        pg_basebackup -h <primary> -D replica -R -X stream && pg_ctl -D replica -o "-p 5433" start
+
+    Without both the tests are skipped.
+"""
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.Shared.Core.config import settings
+from app.Shared.Infra import database
+
+TEST_REPLICA_DATABASE_URL = os.getenv("TEST_REPLICA_DATABASE_URL")
+
+def _wait_for(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+def _use_replica(monkeypatch, engine, replica_engine):
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    monkeypatch.setattr(database, "replica_engine", replica_engine)
+    monkeypatch.setattr(
+        database, "ReplicaSessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    )
+    monkeypatch.setattr(database, "_replica_state", {"checked_at": float("-inf"), "fresh": False})
+    # Probe on every call
+    monkeypatch.setattr(settings, "REPLICA_LAG_CHECK_INTERVAL", 0.0)
+    monkeypatch.setattr(settings, "REPLICA_MAX_LAG_SECONDS", 1.0)
+
+def _read_bind(session_factory):
+    session = session_factory()
+    try:
+        return session.get_bind()
+    finally:
+        session.close()
+
+@pytest.fixture
+def replica_engine(engine):
+    if not TEST_REPLICA_DATABASE_URL:
+        pytest.skip("TEST_REPLICA_DATABASE_URL is not set")
+    replica = create_engine(TEST_REPLICA_DATABASE_URL, connect_args={"connect_timeout": 2})
+    with replica.connect() as conn:
+        if not conn.execute(text("SELECT pg_is_in_recovery()")).scalar():
+            pytest.skip("TEST_REPLICA_DATABASE_URL is not a standby")
+    yield replica
+    replica.dispose()
+
+def test_reads_go_to_a_streaming_replica(engine, replica_engine, monkeypatch):
+    _use_replica(monkeypatch, engine, replica_engine)
+
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO offices (name, shift_start, shift_end) VALUES ('Replicated', '08:00', '17:00')"))
+    with replica_engine.connect() as conn:
+        assert _wait_for(lambda: conn.execute(text("SELECT count(*) FROM offices WHERE name = 'Replicated'")).scalar() == 1)
+
+    assert database.replica_is_fresh()
+    assert _read_bind(database.ReadSessionLocal) is replica_engine
+    # Writes never see the replica
+    assert _read_bind(database.SessionLocal) is engine
+
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE offices CASCADE"))
+
+def test_unreachable_replica_falls_back_to_primary(engine, replica_engine, monkeypatch):
+    unreachable = create_engine(
+        replica_engine.url.set(query={"host": "/nonexistent"}), connect_args={"connect_timeout": 1}
+    )
+    _use_replica(monkeypatch, engine, unreachable)
+
+    assert not database.replica_is_fresh()
+    assert _read_bind(database.ReadSessionLocal) is engine
+    unreachable.dispose()
+
+def test_disconnected_wal_receiver_falls_back_to_primary(engine, replica_engine, monkeypatch):
+    """Receive LSN == replay LSN also holds once the receiver is gone: that must not read as current"""
+    _use_replica(monkeypatch, engine, replica_engine)
+    assert database.replica_is_fresh()
+
+    with replica_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conninfo = conn.execute(text("SHOW primary_conninfo")).scalar()
+        try:
+            conn.execute(text("ALTER SYSTEM SET primary_conninfo = ''"))
+            conn.execute(text("SELECT pg_reload_conf()"))
+            assert _wait_for(lambda: conn.execute(text("SELECT count(*) FROM pg_stat_wal_receiver")).scalar() == 0)
+
+            # Let the last replayed transaction age past REPLICA_MAX_LAG_SECONDS
+            time.sleep(settings.REPLICA_MAX_LAG_SECONDS + 0.5)
+            assert not database.replica_is_fresh()
+            assert _read_bind(database.ReadSessionLocal) is engine
+        finally:
+            # ALTER SYSTEM takes no bind parameters
+            quoted = conn.execute(text("SELECT quote_literal(:conninfo)"), {"conninfo": conninfo}).scalar()
+            conn.execute(text(f"ALTER SYSTEM SET primary_conninfo = {quoted}"))
+            conn.execute(text("SELECT pg_reload_conf()"))
+            assert _wait_for(lambda: conn.execute(
+                text("SELECT count(*) FROM pg_stat_wal_receiver WHERE status = 'streaming'")
+            ).scalar() == 1)
+
+    assert database.replica_is_fresh()
@@ -0,0 +1,141 @@
+"""
+    Per-request serialization cost of the check-in, today-attendance and dashboard payloads.
+
+    "fastapi" is the path before Shared/Core/responses.py: pydantic models built with validation,
+    re-validated against response_model by FastAPI, run through jsonable_encoder and the stdlib
+    json encoder. "orjson" is the current path: model_construct from the ORM rows, sent with
+    model_response. Both must produce the same JSON; timings are printed (pytest -s).
+"""
+import asyncio
+import json
+import time
+from datetime import date, datetime, time as dt_time, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.Domain.v1.Attendances.Controllers.attendance_controller import AttendanceService
+from app.Domain.v1.Attendances.Models.attendance_model import Attendance
+from app.Domain.v1.Attendances.Models.attendance_reason_model import AttendanceReason
+from app.Domain.v1.Attendances.Schemas.attendance_schema import (
+    AttendanceReasonResponse,
+    AttendanceResponse,
+    CheckInResponse,
+    OfficeInfo,
+)
+from app.Domain.v1.Dashboard.Schemas.dashboard_schema import (
+    DailyStats,
+    DashboardResponse,
+    MonthlyTrend,
+    MonthlyTrendPoint,
+)
+from app.Shared.Core.responses import model_response
+
+ROUNDS = 2000
+NOW = datetime(2026, 10, 19, 1, 5, tzinfo=timezone.utc)
+
+def _office():
+    from app.Domain.v1.Offices.Models.office_model import Office
+    return Office(id=3, name="Head office", public_ip="203.0.113.7", shift_start=dt_time(8), shift_end=dt_time(17))
+
+def _attendance():
+    return Attendance(
+        id=1201, user_id=42, office_id=3, log_date=date(2026, 10, 19), check_in=dt_time(8, 5),
+        check_out=dt_time(17, 2), status="late", minutes_late=5, work_hours=Decimal("8.95"),
+        created_at=NOW, updated_at=NOW
+    )
+
+def _reasons():
+    return [
+        AttendanceReason(id=77 + n, attendance_id=1201, reason_type=kind, reason="Traffic on the bridge", created_at=NOW, updated_at=NOW)
+        for n, kind in enumerate(("late", "early_leave"))
+    ]
+
+def _validated_attendance(attendance, office, reasons) -> AttendanceResponse:
+    """How AttendanceService built responses before model_construct"""
+    return AttendanceResponse(
+        id=attendance.id, user_id=attendance.user_id, office_id=attendance.office_id,
+        log_date=attendance.log_date, check_in=attendance.check_in, check_out=attendance.check_out,
+        status=attendance.status, minutes_late=attendance.minutes_late,
+        work_hours=float(attendance.work_hours), created_at=attendance.created_at, updated_at=attendance.updated_at,
+        office=OfficeInfo(id=office.id, name=office.name, public_ip=office.public_ip),
+        attendance_reasons=[
+            AttendanceReasonResponse(
+                id=r.id, attendance_id=r.attendance_id, reason_type=r.reason_type, reason=r.reason,
+                created_at=r.created_at, updated_at=r.updated_at
+            )
+            for r in reasons
+        ]
+    )
+
+def _dashboard() -> DashboardResponse:
+    points = [
+        MonthlyTrendPoint(
+            date=f"2026-10-{day:02d}", on_time_percentage=81.25, late_percentage=12.5,
+            absent_percentage=6.25, total_staff=480
+        )
+        for day in range(1, 32)
+    ]
+    return DashboardResponse(
+        daily_stats=DailyStats(
+            date="2026-10-19", total_staff=480, active_staff=451, absent_staff=29,
+            on_time_count=402, late_count=49, checked_out_count=12
+        ),
+        monthly_trend=MonthlyTrend(month="2026-10", data_points=points)
+    )
+
+def _payloads():
+    attendance, office, reasons = _attendance(), _office(), _reasons()
+    dashboard = _dashboard()
+    return {
+        "check-in": (
+            CheckInResponse,
+            lambda: CheckInResponse(
+                message="Checked in", attendance=_validated_attendance(attendance, office, []),
+                is_late=True, minutes_late=5
+            ),
+            lambda: CheckInResponse.model_construct(
+                message="Checked in", attendance=AttendanceService._attendance_response(attendance, office),
+                is_late=True, minutes_late=5
+            ),
+        ),
+        "today-attendance": (
+            AttendanceResponse,
+            lambda: _validated_attendance(attendance, office, reasons),
+            lambda: AttendanceService._attendance_response(attendance, office, reasons),
+        ),
+        "dashboard": (DashboardResponse, lambda: dashboard, lambda: dashboard),
+    }
+
+async def _fastapi_body(field, build) -> bytes:
+    content = await serialize_response(field=field, response_content=build())
+    return JSONResponse(content).body
+
+def _orjson_body(build) -> bytes:
+    return model_response(build()).body
+
+@pytest.mark.parametrize("name", ["check-in", "today-attendance", "dashboard"])
+def test_orjson_path_matches_and_is_cheaper(name):
+    model, build_validated, build_constructed = _payloads()[name]
+    field = create_model_field(name="Response_" + model.__name__, type_=model, mode="serialization")
+
+    async def run():
+        assert json.loads(await _fastapi_body(field, build_validated)) == json.loads(_orjson_body(build_constructed))
+
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            await _fastapi_body(field, build_validated)
+        fastapi_us = (time.perf_counter() - started) / ROUNDS * 1e6
+
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            _orjson_body(build_constructed)
+        orjson_us = (time.perf_counter() - started) / ROUNDS * 1e6
+        return fastapi_us, orjson_us
+
+    fastapi_us, orjson_us = asyncio.run(run())
+    print(f"\n{name}: fastapi {fastapi_us:.1f} us/request, orjson {orjson_us:.1f} us/request ({fastapi_us / orjson_us:.1f}x)")
+    assert orjson_us < fastapi_us
@@ -0,0 +1,56 @@
+"""
+    Streamed export containers (Shared/Infra/streaming_pdf.py, streaming_zip.py): the
+    concatenated chunks form a valid file.
+"""
+import io
+import re
+import zipfile
+
+from app.Shared.Infra.streaming_pdf import PdfStream, pdf_text
+from app.Shared.Infra.streaming_zip import ZipStream, stream_zip
+
+def test_pdf_xref_offsets_point_at_their_objects():
+    pdf = PdfStream()
+    chunks = [pdf.begin()]
+    for page in range(3):
+        chunks.append(pdf.add_page(pdf_text(f"Office {page} (HQ) \\ café", 72, 770)))
+    chunks.append(pdf.close())
+    data = b"".join(chunks)
+
+    assert data.startswith(b"%PDF-1.4\n") and data.endswith(b"%%EOF\n")
+    xref_offset = int(re.search(rb"startxref\n(\d+)\n", data).group(1))
+    assert data[xref_offset:].startswith(b"xref\n")
+
+    header = re.match(rb"xref\n0 (\d+)\n", data[xref_offset:])
+    size = int(header.group(1))
+    entries = data[xref_offset + header.end():].split(b"\n")[:size]
+    assert entries[0] == b"0000000000 65535 f "
+    for number, entry in enumerate(entries[1:], start=1):
+        offset = int(entry[:10])
+        assert data[offset:].startswith(b"%d 0 obj\n" % number)
+
+    # 3 pages of a content stream + a page object each, after catalog, page tree and font
+    assert size == 4 + 3 * 2
+    assert b"/Count 3" in data
+    assert re.search(rb"trailer\n<< /Size %d /Root 1 0 R >>" % size, data)
+
+def test_zip_stream_output_opens_with_zipfile():
+    archive = ZipStream()
+    chunks = [
+        archive.add_file("qr/head-office.png", b"\x89PNG" + b"\x00" * 500),
+        archive.add_file("qr/branch.svg", b"<svg/>", compression=zipfile.ZIP_STORED),
+    ]
+    chunks.extend(archive.add_chunks("sheet.xml", (b"<row>%d</row>" % n for n in range(5000))))
+    chunks.append(archive.close())
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as opened:
+        assert opened.testzip() is None
+        assert opened.namelist() == ["qr/head-office.png", "qr/branch.svg", "sheet.xml"]
+        assert opened.read("qr/branch.svg") == b"<svg/>"
+        assert opened.read("sheet.xml").endswith(b"<row>4999</row>")
+
+def test_stream_zip_generator():
+    entries = [(f"office-{n}.png", bytes([n]) * 100) for n in range(3)]
+    with zipfile.ZipFile(io.BytesIO(b"".join(stream_zip(entries)))) as opened:
+        assert opened.testzip() is None
+        assert opened.namelist() == [name for name, _ in entries]
@@ -0,0 +1,39 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Daily rollup maintained by api-scan on every attendance write
+        Schema::create('daily_attendance_summary', function (Blueprint $table) {
+            $table->date('summary_date');
+            // 0 = records without office (absence requests)
+            $table->unsignedBigInteger('office_id')->default(0);
+            $table->integer('total_count')->default(0);
+            $table->integer('present_count')->default(0);
+            $table->integer('late_count')->default(0);
+            $table->integer('absent_count')->default(0);
+            $table->integer('checked_out_count')->default(0);
+            $table->integer('late_minutes')->default(0);
+            $table->decimal('work_hours', 12, 2)->default(0);
+            $table->timestamp('updated_at')->nullable();
+
+            $table->primary(['summary_date', 'office_id']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('daily_attendance_summary');
+    }
+};
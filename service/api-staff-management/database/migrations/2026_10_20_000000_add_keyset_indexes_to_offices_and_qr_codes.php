@@ -0,0 +1,40 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        Schema::table('offices', function (Blueprint $table) {
+            // Keyset pagination of GET /api/offices: ORDER BY created_at ASC NULLS LAST, id ASC
+            // (the default ascending order, so a plain index matches it)
+            $table->index(['created_at', 'id'], 'offices_created_at_id_index');
+        });
+
+        Schema::table('qr_codes', function (Blueprint $table) {
+            // Keyset pagination of GET /api/generate-code: ORDER BY created_at DESC NULLS LAST, id DESC,
+            // indexed in that exact order so each page is one forward range seek
+            $table->rawIndex('created_at DESC NULLS LAST, id DESC', 'qr_codes_created_at_id_index');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('offices', function (Blueprint $table) {
+            $table->dropIndex('offices_created_at_id_index');
+        });
+
+        Schema::table('qr_codes', function (Blueprint $table) {
+            $table->dropIndex('qr_codes_created_at_id_index');
+        });
+    }
+};
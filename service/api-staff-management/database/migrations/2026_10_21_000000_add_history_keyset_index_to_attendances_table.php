@@ -0,0 +1,30 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        Schema::table('attendances', function (Blueprint $table) {
+            // Keyset pagination + streamed export of api-scan attendance history:
+            // ORDER BY log_date DESC, id DESC / WHERE (log_date, id) < (?, ?)
+            $table->index(['log_date', 'id'], 'attendances_log_date_id_index');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('attendances', function (Blueprint $table) {
+            $table->dropIndex('attendances_log_date_id_index');
+        });
+    }
+};